@@ -1,5 +1,11 @@
 # backend/app/api.py
+import functools
+from datetime import datetime, timezone
 from typing import Any
+
+import msgpack
+from bson import ObjectId
+from fastapi import Request, Response
 from pydantic import BaseModel
 
 class ApiEnvelope(BaseModel):
@@ -12,3 +18,83 @@ def ok(data: Any = None) -> ApiEnvelope:
 
 def fail(msg: str) -> ApiEnvelope:
     return ApiEnvelope(ok=False, error=msg)
+
+# ---------- MessagePack (Accept: application/msgpack) ----------
+#
+# Same envelope, different wire format: datetimes go out as msgpack
+# timestamps and ObjectIds (including the 24-hex *_id strings our
+# models carry) as ext type 1 holding the 12 raw bytes.
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+OBJECT_ID_EXT = 1
+
+def wants_msgpack(request: Request) -> bool:
+    accept = request.headers.get("accept", "")
+    return MSGPACK_MEDIA_TYPE in accept or "application/x-msgpack" in accept
+
+def _prepare(node: dict) -> dict:
+    """
+    Rewrite a freshly dumped envelope in place for msgpack: *_id strings
+    become ObjectId ext values, naive datetimes are marked UTC. Mutating
+    instead of copying keeps this close to the cost of JSON encoding.
+    """
+    for key, value in node.items():
+        kind = type(value)
+        if kind is str:
+            if len(value) == 24 and (key == "id" or key[-3:] == "_id"):
+                try:
+                    node[key] = msgpack.ExtType(OBJECT_ID_EXT, bytes.fromhex(value))
+                except ValueError:
+                    pass
+        elif kind is datetime:
+            if value.tzinfo is None:
+                node[key] = value.replace(tzinfo=timezone.utc)  # stored values are UTC
+        elif kind is dict:
+            _prepare(value)
+        elif kind is list:
+            _prepare_list(value)
+    return node
+
+def _prepare_list(items: list) -> None:
+    for i, value in enumerate(items):
+        kind = type(value)
+        if kind is dict:
+            _prepare(value)
+        elif kind is list:
+            _prepare_list(value)
+        elif kind is datetime and value.tzinfo is None:
+            items[i] = value.replace(tzinfo=timezone.utc)
+
+def _fallback(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return msgpack.ExtType(OBJECT_ID_EXT, value.binary)
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc)
+    return str(value)
+
+def pack(envelope: ApiEnvelope) -> bytes:
+    return msgpack.packb(_prepare(envelope.model_dump()), default=_fallback, datetime=True)
+
+def msgpack_response(envelope: ApiEnvelope, headers: dict[str, str] | None = None) -> Response:
+    return Response(
+        content=pack(envelope),
+        media_type=MSGPACK_MEDIA_TYPE,
+        headers={**(headers or {}), "Vary": "Accept"},
+    )
+
+def negotiable(endpoint):
+    """
+    Route decorator: answer with MessagePack instead of JSON when the
+    client asks for it. The endpoint needs a `request: Request` parameter;
+    headers set on an injected `response: Response` (e.g. ETag) are kept.
+    """
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        request = kwargs.get("request")
+        if isinstance(result, ApiEnvelope) and request is not None and wants_msgpack(request):
+            extra = kwargs.get("response")
+            headers = {k: v for k, v in extra.headers.items() if k not in ("content-length", "vary")} if extra is not None else None
+            return msgpack_response(result, headers)
+        return result
+    return wrapper
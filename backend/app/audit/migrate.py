@@ -0,0 +1,150 @@
+# backend/app/audit/migrate.py
+"""
+Copy audit_logs into the time-series collection audit_logs_ts
+(AUDIT_LOGS_TIMESERIES, see repos/audit_logs.py), in created_at order,
+one insert_many per batch.
+
+Progress is a created_at watermark kept in app_meta after every batch.
+A run starts OVERLAP before the watermark, because ObjectIds and clocks
+differ between workers and an event can land in audit_logs with a
+created_at a little behind rows already copied. Rows that may already
+be across (the overlap, and anything up to `copying_until` when a run
+died between its insert and its progress write) are checked against
+audit_logs_ts first. That check has no _id index to use, so it is
+bounded by the batch's created_at range, which the time-series buckets
+are organised by. Turn AUDIT_LOGS_TIMESERIES on first, then migrate:
+new events already go to audit_logs_ts, and anything a worker still on
+the old setting logs to audit_logs in between is picked up by running
+this again. The source collection is left alone.
+
+    python -m app.audit.migrate [--batch-size 5000]
+    python -m app.audit.migrate --status
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+
+from ..repos import audit_logs as logs_repo
+from ..seed import META_COLL
+
+MARKER = "migrate:audit_logs_ts"
+
+# how far behind the watermark a run starts reading again
+OVERLAP = timedelta(minutes=10)
+
+
+def _with_time(doc: dict) -> dict:
+    # every time-series row needs a date in the time field; very old rows may not have one
+    if not isinstance(doc.get("created_at"), datetime) and isinstance(doc.get("_id"), ObjectId):
+        doc["created_at"] = doc["_id"].generation_time
+    return doc
+
+
+async def _already_copied(dst: AsyncIOMotorCollection, rows: list[dict]) -> set:
+    times = [r["created_at"] for r in rows]
+    cursor = dst.find(
+        {"created_at": {"$gte": min(times), "$lte": max(times)}, "_id": {"$in": [r["_id"] for r in rows]}},
+        {"_id": 1},
+    )
+    return {d["_id"] async for d in cursor}
+
+
+async def status(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    state = await db[META_COLL].find_one({"_id": MARKER}) or {}
+    return {
+        "copied": state.get("copied", 0),
+        "watermark": state.get("last_created_at"),
+        "updated_at": state.get("updated_at"),
+        "source_rows": await db[logs_repo.PLAIN_COLL].estimated_document_count(),
+        "target_rows": await db[logs_repo.TS_COLL].estimated_document_count(),
+    }
+
+
+async def migrate(db: AsyncIOMotorDatabase, batch_size: int = 5000) -> dict[str, Any]:
+    await logs_repo.ensure_timeseries(db)
+    src, dst = db[logs_repo.PLAIN_COLL], db[logs_repo.TS_COLL]
+    meta = db[META_COLL]
+    state = await meta.find_one({"_id": MARKER}) or {}
+    mark: Optional[datetime] = state.get("last_created_at")
+    if mark is None and state.get("last_id"):
+        # progress saved by the _id-ordered version; stored dates come back naive UTC
+        mark = state["last_id"].generation_time.replace(tzinfo=None)
+    # everything up to here may be in dst already
+    check_until = max(filter(None, [mark, state.get("copying_until")]), default=None)
+    copied = state.get("copied", 0)
+    skipped = this_run = 0
+    t0 = time.perf_counter()
+
+    async def copy(batch: list[dict], check: bool, until: Optional[datetime]) -> None:
+        nonlocal copied, skipped, this_run
+        rows = [_with_time(d) for d in batch]
+        if check:
+            present = await _already_copied(dst, rows)
+            skipped += len(present)
+            rows = [r for r in rows if r["_id"] not in present]
+        if until is not None:
+            await meta.update_one({"_id": MARKER}, {"$max": {"copying_until": until}}, upsert=True)
+        if rows:
+            await dst.insert_many([logs_repo.to_timeseries(r) for r in rows], ordered=False)
+        copied += len(rows)
+        this_run += len(rows)
+        progress: dict[str, Any] = {"copied": copied, "updated_at": datetime.now(timezone.utc)}
+        update: dict[str, Any] = {"$set": progress}
+        if until is not None:
+            update["$max"] = {"last_created_at": until}
+        await meta.update_one({"_id": MARKER}, update, upsert=True)
+        print(f"  {copied:,} rows copied ({this_run / (time.perf_counter() - t0):,.0f}/s)")
+
+    # rows without a created_at (very old ones): few, so always checked, in _id order
+    after_id = None
+    while True:
+        query: dict[str, Any] = {"created_at": None}
+        if after_id is not None:
+            query["_id"] = {"$gt": after_id}
+        batch = await src.find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        await copy(batch, check=True, until=None)
+        after_id = batch[-1]["_id"]
+
+    # the rest by created_at; ties at the page edge are carried over by _id
+    edge = mark - OVERLAP if mark is not None else None
+    edge_ids: list = []
+    while True:
+        query = {"created_at": {"$gte": edge} if edge is not None else {"$type": "date"}}
+        if edge_ids:
+            query["_id"] = {"$nin": edge_ids}
+        batch = await src.find(query).sort("created_at", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        last = batch[-1]["created_at"]
+        await copy(batch, check=check_until is not None and batch[0]["created_at"] <= check_until, until=last)
+        edge_ids = [d["_id"] for d in batch if d["created_at"] == last] + (edge_ids if last == edge else [])
+        edge = last
+
+    return {"copied": this_run, "already_there": skipped, "total_copied": copied, "seconds": round(time.perf_counter() - t0, 1)}
+
+
+async def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.audit.migrate")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--status", action="store_true", help="show progress, copy nothing")
+    args = parser.parse_args(argv)
+
+    from ..db import get_db
+    db = get_db()
+
+    if not args.status:
+        print(await migrate(db, args.batch_size))
+    print(await status(db))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
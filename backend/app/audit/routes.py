@@ -1,19 +1,28 @@
 from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Optional
+import json
+import time
 import jwt
+from bson import ObjectId
 
-from ..db import get_db
+from ..db import get_stream_db
+from ..deps import require_admin
+from .. import reads
 from ..config import settings
-from ..api import ok, fail, ApiEnvelope
+from ..api import ok, fail, ApiEnvelope, negotiable
 from ..auth.jwt import verify_token
 from ..repos import audit_logs as logs_repo
-from ..models import Role
+from ..models import Role, UserDB
 
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo  # Python 3.9+
 
 router = APIRouter()
 
+SSE_PING_SECONDS = 20
+
 MANILA_TZ = ZoneInfo("Asia/Manila")
 
 def format_datetime(dt: datetime | None) -> str:
@@ -30,11 +39,18 @@ def format_datetime(dt: datetime | None) -> str:
     return local_dt.strftime("%Y-%m-%d %H:%M:%S")
 
 @router.get("/", response_model=ApiEnvelope)
+@negotiable
 async def list_audit_logs(
     request: Request,
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    limit: int = 50,
+    before: Optional[str] = None,   # created_at of the last row on the previous page (as shown, Manila time, or ISO)
+    db: AsyncIOMotorDatabase = Depends(reads.using("reports")),
     authorization: str | None = Header(default=None, alias="Authorization"),
 ):
+    """
+    Admin: newest audit events first. The first page comes from the
+    capped recent-activity collection; pass `before` for older pages.
+    """
     try:
         token: str | None = None
 
@@ -54,7 +70,18 @@ async def list_audit_logs(
         if role != Role.ADMIN.value:
             return fail("Access denied — admins only")
 
-        logs = await logs_repo.list_logs(db)
+        if not (1 <= limit <= 500):
+            return fail("limit must be between 1 and 500")
+        before_dt = None
+        if before:
+            try:
+                before_dt = datetime.fromisoformat(before)
+            except ValueError:
+                return fail("Invalid before")
+            if before_dt.tzinfo is None:
+                before_dt = before_dt.replace(tzinfo=MANILA_TZ)
+
+        logs = await logs_repo.list_logs(db, limit, before_dt)
         serialized_logs = []
 
         for log in logs:
@@ -72,3 +99,45 @@ async def list_audit_logs(
         print(f"Error listing logs: {e}")
         return fail("Could not fetch audit logs")
     
+
+
+@router.get("/tail")
+async def tail_audit_logs(
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_stream_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """
+    Admin: live feed of audit events (Server-Sent Events, event name
+    "log"), read with a tailable cursor on the capped recent-activity
+    collection. Starts at the newest event, or after Last-Event-ID on
+    reconnect (from the oldest event kept, if that one has been capped
+    away).
+    """
+    after = ObjectId(last_event_id) if last_event_id and ObjectId.is_valid(last_event_id) else None
+    if after is None:
+        after = await logs_repo.newest_recent_id(db)
+
+    def frame(log) -> str:
+        data = log.model_dump()
+        data["actor_id"] = str(data.get("actor_id", ""))
+        data["resource_id"] = str(data.get("resource_id", ""))
+        data["created_at"] = format_datetime(data.get("created_at"))
+        data["updated_at"] = format_datetime(data.get("updated_at"))
+        return f"id: {log.id}\nevent: log\ndata: {json.dumps(data, default=str)}\n\n"
+
+    async def stream():
+        yield "retry: 5000\n\n"
+        last_ping = time.monotonic()
+        async for log in logs_repo.tail(db, after):
+            if log is not None:
+                yield frame(log)
+            elif time.monotonic() - last_ping >= SSE_PING_SECONDS:
+                last_ping = time.monotonic()
+                yield ": ping\n\n"
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -118,6 +118,7 @@ async def login(body: LoginBody, request: Request, db: AsyncIOMotorDatabase = De
                 "last_use_at": now,
                 "last_use_success": False,
                 "last_use_ip": client_ip,
+                "updated_at": now,
             }
 
             if current_attempts >= LOGIN_MAX_ATTEMPTS:
@@ -150,6 +151,7 @@ async def login(body: LoginBody, request: Request, db: AsyncIOMotorDatabase = De
                 "last_use_at": now,
                 "last_use_success": False,
                 "last_use_ip": client_ip,
+                "updated_at": now,
             }
 
             if current_attempts >= LOGIN_MAX_ATTEMPTS:
@@ -181,6 +183,7 @@ async def login(body: LoginBody, request: Request, db: AsyncIOMotorDatabase = De
             "last_use_at": now,
             "last_use_success": True,
             "last_use_ip": client_ip,
+            "updated_at": now,
         }
 
         await logs_repo.log_event(db, user_doc.get("_id"), "USER_LOGIN", "USER", user_doc.get("_id"), {"role": user_doc.get("role")})
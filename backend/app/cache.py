@@ -0,0 +1,258 @@
+# backend/app/cache.py
+"""
+Cache for values that are expensive to load and fine to serve a few
+seconds stale, shared by every uvicorn worker when CACHE_BACKEND=redis.
+
+    cache.get(key)                      value or None
+    cache.set(key, value, ttl=None)     ttl in seconds (None = until evicted)
+    cache.delete(*keys)                 also drops the keys on other workers
+    cache.incr(key, amount=1, ttl=None) counter; ttl applies when the key is created
+    cache.ttl(key)                      seconds left, None if missing or no expiry
+    cache.get_or_load(key, load, ttl)   read-through helper used by the repos
+
+Backends (CACHE_BACKEND):
+
+  memory  per-process LRU of CACHE_MAX_ENTRIES. Each worker has its own
+          copy and delete() only reaches this process, so use it with one
+          worker (or for data where that is acceptable).
+  redis   values live in Redis (CACHE_REDIS_URL, anything speaking the
+          Redis protocol) so workers share them. Reads go through a small
+          per-worker near cache kept for CACHE_LOCAL_TTL_SECONDS; delete()
+          publishes the keys on CHANNEL and every worker drops them from
+          its near cache. Counters (incr/ttl) always go to Redis.
+
+Values must be JSON-serializable. Callers use cache-aside: write paths
+call invalidate(), read paths get_or_load(). A cache error never fails
+the request; reads fall back to the loader.
+"""
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from .config import settings
+
+PREFIX = "dms:"                 # Redis keys, so the cache can share a Redis with other apps
+CHANNEL = "dms:cache:invalidate"
+
+
+class MemoryCache:
+    name = "memory"
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, tuple[Optional[float], Any]]" = OrderedDict()   # key -> (expires monotonic, value)
+        self.hits = self.misses = self.evictions = 0
+
+    def _live(self, key: str) -> Optional[tuple[Optional[float], Any]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+
+    def get_nowait(self, key: str) -> Any:
+        entry = self._live(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set_nowait(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + ttl if ttl else None, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    async def get(self, key: str) -> Any:
+        return self.get_nowait(key)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.set_nowait(key, value, ttl)
+
+    async def delete(self, *keys: str) -> None:
+        self.discard(*keys)
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        entry = self._live(key)
+        if entry is None:
+            self.set_nowait(key, amount, ttl)
+            return amount
+        value = int(entry[1]) + amount
+        self._data[key] = (entry[0], value)
+        self._data.move_to_end(key)
+        return value
+
+    async def ttl(self, key: str) -> Optional[float]:
+        entry = self._live(key)
+        if entry is None or entry[0] is None:
+            return None
+        return round(entry[0] - time.monotonic(), 3)
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        return await _get_or_load(self, key, load, ttl)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.name,
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class RedisCache:
+    name = "redis"
+
+    def __init__(self, url: str, local_ttl: float, max_local_entries: int):
+        # only needed for this backend, so only imported here
+        import redis.asyncio as aioredis
+
+        self.redis = aioredis.Redis.from_url(url)
+        self.local_ttl = local_ttl
+        self.local = MemoryCache(max_local_entries)
+        self.hits = self.misses = self.invalidations = 0
+        self._listener: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return PREFIX + key
+
+    async def get(self, key: str) -> Any:
+        if self.local_ttl:
+            value = self.local.get_nowait(key)
+            if value is not None:
+                self.hits += 1
+                return value
+        raw = await self.redis.get(self._key(key))
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        value = json.loads(raw)
+        if self.local_ttl:
+            self.local.set_nowait(key, value, self.local_ttl)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self.redis.set(self._key(key), json.dumps(value, default=str), px=int(ttl * 1000) if ttl else None)
+        if self.local_ttl:
+            self.local.set_nowait(key, value, min(self.local_ttl, ttl or self.local_ttl))
+
+    async def delete(self, *keys: str) -> None:
+        if not keys:
+            return
+        self.local.discard(*keys)
+        await self.redis.delete(*(self._key(k) for k in keys))
+        await self.redis.publish(CHANNEL, json.dumps(list(keys)))
+
+    async def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        value = await self.redis.incrby(self._key(key), amount)
+        if ttl and value == amount:
+            # we created it
+            await self.redis.pexpire(self._key(key), int(ttl * 1000))
+        return value
+
+    async def ttl(self, key: str) -> Optional[float]:
+        ms = await self.redis.pttl(self._key(key))
+        return None if ms < 0 else ms / 1000
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                # anything published while we weren't listening is lost; start clean
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.local.discard(*json.loads(message["data"]))
+                        self.invalidations += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print("Cache invalidation listener failed, retrying:", e)
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self) -> None:
+        if self.local_ttl and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen())
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        await self.redis.aclose()
+
+    async def get_or_load(self, key: str, load: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        return await _get_or_load(self, key, load, ttl)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations_received": self.invalidations,
+            "local": self.local.stats() if self.local_ttl else None,
+        }
+
+
+async def _get_or_load(cache, key: str, load: Callable[[], Awaitable[Any]], ttl: Optional[float]) -> Any:
+    try:
+        value = await cache.get(key)
+        if value is not None:
+            return value
+    except Exception as e:
+        print(f"Cache read failed for {key}:", e)
+        return await load()
+    value = await load()
+    try:
+        await cache.set(key, value, ttl)
+    except Exception as e:
+        print(f"Cache write failed for {key}:", e)
+    return value
+
+
+async def invalidate(*keys: str) -> None:
+    """cache.delete() for write paths: never raises, the entry's ttl bounds how stale it can get."""
+    try:
+        await cache.delete(*keys)
+    except Exception as e:
+        print("Cache invalidation failed:", e)
+
+
+def create(backend: Optional[str] = None):
+    backend = (backend or settings.CACHE_BACKEND).lower()
+    if backend == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES)
+    if backend == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL, settings.CACHE_LOCAL_TTL_SECONDS, settings.CACHE_MAX_ENTRIES)
+    raise ValueError(f"unknown CACHE_BACKEND {backend!r} (memory or redis)")
+
+
+cache = create()
@@ -0,0 +1,178 @@
+# backend/app/cleanup.py
+"""
+Background cascade for deleted users and documents.
+
+DELETE /users/{id} and DELETE /documents/{id}/attachments only remove the
+record and leave a tombstone (repos/tombstones.py), so they return
+right away. This collector works through the tombstones, oldest first,
+in batches of CLEANUP_BATCH_SIZE:
+
+  user      their documents (with each document's attachment files and
+            revisions), the manager_id on their employees, and their
+            status counters
+  document  its attachment files and revisions
+
+Every step deletes by query, so re-running a half-finished tombstone
+(after a crash, or when its lease ran out) is safe. Deletes write the
+tombstone before removing the record; if the record is still there, the
+delete failed (or is still on its way), so nothing is cascaded. It runs as the
+"cleanup" job (app/jobs.py) every CLEANUP_INTERVAL_SECONDS, or straight
+away after a delete. GET /maintenance/cleanup shows the backlog and what the last runs did.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .config import settings
+from .scheduler import scheduler
+from .events import publish_doc
+from .typeahead import index as typeahead_index
+from .repos import documents as docs_repo
+from .repos import users as users_repo
+from .repos import revisions as revisions_repo
+from .repos import doc_counters
+from .repos import tombstones
+
+LEASE_SECONDS = 120                 # a tombstone stays with one worker this long without progress
+FILES_COLL, CHUNKS_COLL = "fs.files", "fs.chunks"   # default GridFS bucket (Attachment.file_id)
+
+
+class Collector:
+    def __init__(self):
+        self.running = False
+        self.runs = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_run_ms: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.totals: dict[str, int] = {}
+
+    def _count(self, counts: dict[str, int]) -> None:
+        for k, v in counts.items():
+            self.totals[k] = self.totals.get(k, 0) + v
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "running": self.running,
+            "runs": self.runs,
+            "last_run_at": self.last_run_at,
+            "last_run_ms": self.last_run_ms,
+            "last_error": self.last_error,
+            "totals": dict(self.totals),
+        }
+
+
+collector = Collector()
+
+
+def nudge() -> None:
+    """Called after a delete: run the "cleanup" job now rather than at its next slot."""
+    scheduler.run_soon("cleanup")
+
+
+async def delete_files(db: AsyncIOMotorDatabase, file_ids: list) -> int:
+    """Attachment bytes in the GridFS bucket; ids that were never GridFS ids are skipped."""
+    oids = [ObjectId(f) for f in file_ids if f and ObjectId.is_valid(str(f))]
+    if not oids:
+        return 0
+    await db[CHUNKS_COLL].delete_many({"files_id": {"$in": oids}})
+    res = await db[FILES_COLL].delete_many({"_id": {"$in": oids}})
+    return res.deleted_count
+
+
+async def _collect_document(db: AsyncIOMotorDatabase, t: dict) -> None:
+    payload = t.get("payload") or {}
+    counts = {
+        "attachments": await delete_files(db, payload.get("file_ids") or []),
+        "revisions": (await db[revisions_repo.COLL].delete_many({"doc_id": t["ref_id"]})).deleted_count,
+    }
+    collector._count(counts)
+    await tombstones.record_progress(db, t["_id"], counts, LEASE_SECONDS)
+
+
+async def _collect_user(db: AsyncIOMotorDatabase, t: dict, batch_size: int) -> None:
+    user_id = t["ref_id"]
+    payload = t.get("payload") or {}
+
+    if "counters" not in (t.get("steps_done") or []):
+        await doc_counters.forget_owner(db, user_id, payload.get("manager_id"))
+        await tombstones.record_progress(db, t["_id"], {}, LEASE_SECONDS, step_done="counters")
+
+    # their documents, a batch at a time
+    while True:
+        batch = await db[docs_repo.COLL].find(
+            {"owner_id": user_id},
+            {"owner_id": 1, "status": 1, "title": 1, "attachments.file_id": 1},
+        ).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        ids = [d["_id"] for d in batch]
+        file_ids = [a.get("file_id") for d in batch for a in d.get("attachments") or []]
+        counts = {
+            "attachments": await delete_files(db, file_ids),
+            "revisions": (await db[revisions_repo.COLL].delete_many({"doc_id": {"$in": ids}})).deleted_count,
+            "documents": (await db[docs_repo.COLL].delete_many({"_id": {"$in": ids}})).deleted_count,
+        }
+        for d in batch:
+            typeahead_index.remove("document", str(d["_id"]))
+            publish_doc("deleted", d)
+        collector._count(counts)
+        await tombstones.record_progress(db, t["_id"], counts, LEASE_SECONDS)
+
+    # employees that reported to them
+    while True:
+        batch = await db[users_repo.COLL].find({"manager_id": user_id}, {"_id": 1}).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+        employee_ids = [u["_id"] for u in batch]
+        await db[docs_repo.COLL].update_many({"owner_id": {"$in": employee_ids}}, {"$set": {"manager_id": None}})
+        res = await db[users_repo.COLL].update_many(
+            {"_id": {"$in": employee_ids}, "manager_id": user_id},
+            {"$unset": {"manager_id": ""}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+        )
+        await users_repo.forget_employees(user_id)
+        counts = {"manager_links": res.modified_count}
+        collector._count(counts)
+        await tombstones.record_progress(db, t["_id"], counts, LEASE_SECONDS)
+
+
+async def _still_there(db: AsyncIOMotorDatabase, t: dict) -> bool:
+    coll = users_repo.COLL if t["kind"] == "user" else docs_repo.COLL
+    return await db[coll].find_one({"_id": t["ref_id"]}, {"_id": 1}) is not None
+
+
+async def collect_once(db: AsyncIOMotorDatabase, batch_size: Optional[int] = None) -> dict[str, Any]:
+    """Work through every pending tombstone; returns what this run did."""
+    batch_size = batch_size or settings.CLEANUP_BATCH_SIZE
+    t0 = time.perf_counter()
+    collector.running = True
+    done = {"user": 0, "document": 0}
+    try:
+        while True:
+            t = await tombstones.claim(db, LEASE_SECONDS)
+            if t is None:
+                break
+            if await _still_there(db, t):
+                # a fresh one may be just ahead of its delete: let the lease run out and look again
+                if t["created_at"] < datetime.utcnow() - timedelta(seconds=LEASE_SECONDS):
+                    await tombstones.finish(db, t["_id"])
+                    collector._count({"not_deleted": 1})
+                continue
+            if t["kind"] == "user":
+                await _collect_user(db, t, batch_size)
+            else:
+                await _collect_document(db, t)
+            await tombstones.finish(db, t["_id"])
+            done[t["kind"]] = done.get(t["kind"], 0) + 1
+        collector.last_error = None
+    except Exception as e:
+        collector.last_error = str(e)
+        raise
+    finally:
+        collector.running = False
+        collector.runs += 1
+        collector.last_run_at = datetime.now(timezone.utc)
+        collector.last_run_ms = round((time.perf_counter() - t0) * 1000, 1)
+    return {"tombstones": done, "ms": collector.last_run_ms}
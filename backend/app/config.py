@@ -13,6 +13,52 @@ class Settings(BaseSettings):
         os.getenv("ALLOWED_ORIGINS", "http://localhost:5173").split(",")
     )
 
+    # Seed the demo accounts into an empty database (python -m app.seed does it by hand)
+    SEED_ON_STARTUP: bool = os.getenv("SEED_ON_STARTUP", "true").lower() == "true"
+
+    # Slow-query recorder (0 = off). See app/slow_queries.py
+    SLOW_QUERY_MS: int = int(os.getenv("SLOW_QUERY_MS", "0"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+
+    # How long a claimed review stays with one manager before it returns to the queue
+    REVIEW_LEASE_SECONDS: int = int(os.getenv("REVIEW_LEASE_SECONDS", "300"))
+
+    # Feed GET /documents/events from a Mongo change stream (replica set only) instead of in-process writes
+    DOC_EVENTS_CHANGE_STREAM: bool = os.getenv("DOC_EVENTS_CHANGE_STREAM", "false").lower() == "true"
+
+    # Document history: every Nth revision stores a full copy, the rest only the changed fields
+    REVISION_SNAPSHOT_EVERY: int = int(os.getenv("REVISION_SNAPSHOT_EVERY", "20"))
+
+    # Background cascade after user/document deletes (see app/cleanup.py)
+    CLEANUP_INTERVAL_SECONDS: int = int(os.getenv("CLEANUP_INTERVAL_SECONDS", "30"))
+    CLEANUP_BATCH_SIZE: int = int(os.getenv("CLEANUP_BATCH_SIZE", "500"))
+
+    # Periodic maintenance jobs (see app/jobs.py); audit logs older than AUDIT_RETENTION_DAYS are deleted (0 = keep all)
+    SCHEDULER_ENABLED: bool = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+    AUDIT_RETENTION_DAYS: int = int(os.getenv("AUDIT_RETENTION_DAYS", "0"))
+    # Newest audit events kept in the capped audit_logs_recent collection (GET /logs/, GET /logs/tail)
+    AUDIT_RECENT_MAX: int = int(os.getenv("AUDIT_RECENT_MAX", "1000"))
+    # Keep audit logs in a time-series collection, audit_logs_ts (MongoDB 6.0+; migrate with python -m app.audit.migrate)
+    AUDIT_LOGS_TIMESERIES: bool = os.getenv("AUDIT_LOGS_TIMESERIES", "false").lower() == "true"
+
+    # Lease length for app/locks.py (scheduler leader, startup tasks); a crashed holder is replaced within about this long
+    LOCK_TTL_SECONDS: int = int(os.getenv("LOCK_TTL_SECONDS", "30"))
+
+    # Cache backend (see app/cache.py): "memory" (per worker) or "redis" (shared, CACHE_REDIS_URL)
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    # redis backend: how long each worker keeps its own copy of a value (0 = always ask Redis)
+    CACHE_LOCAL_TTL_SECONDS: float = float(os.getenv("CACHE_LOCAL_TTL_SECONDS", "5"))
+
+    # Replica sets: serve report listings from secondaries, with causal sessions for read-your-writes (see app/reads.py)
+    SECONDARY_READS: bool = os.getenv("SECONDARY_READS", "false").lower() == "true"
+    # skip secondaries lagging more than this (MongoDB's minimum is 90; 0 = no limit)
+    READ_MAX_STALENESS_SECONDS: int = int(os.getenv("READ_MAX_STALENESS_SECONDS", "90"))
+
+    # Per-collection write-concern overrides, e.g. "audit_logs=majority,audit_logs.noise=w1" (profiles in app/db.py)
+    WRITE_CONCERN_OVERRIDES: str = os.getenv("WRITE_CONCERN_OVERRIDES", "")
+
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
 settings = Settings()
\ No newline at end of file
@@ -1,13 +1,134 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+import contextvars
+import functools
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorClientSession, AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo.write_concern import WriteConcern
 from .config import settings
+from . import slow_queries
 
 client: AsyncIOMotorClient | None = None
 
+# Causally consistent session for the current request, set by app/reads.py when SECONDARY_READS is on
+_session: contextvars.ContextVar[AsyncIOMotorClientSession | None] = contextvars.ContextVar("db_session", default=None)
+
+# Write-concern profiles: each write pays only for the durability it needs.
+# "default" leaves it to MONGO_URI / the server (majority since MongoDB 5.0).
+WRITE_CONCERNS: dict[str, WriteConcern | None] = {
+    "default": None,
+    "majority": WriteConcern(w="majority"),
+    "w1": WriteConcern(w=1),
+    "w0": WriteConcern(w=0),            # fire-and-forget: no reply, errors are not seen
+}
+
+# collection -> profile; "<collection>.<operation>" picks a profile for one kind of write
+# (see collection()). Anything not listed uses "default".
+WRITE_CONCERN_PROFILES: dict[str, str] = {
+    "documents": "majority",            # status transitions, edits, attachments
+    "document_revisions": "majority",
+    "users": "majority",                # password changes, lockouts, roles
+    "tombstones": "majority",
+    "locks": "majority",                # a lease must survive a failover
+    "audit_logs": "w1",
+    "audit_logs.noise": "w0",           # input validation failures (repos/audit_logs.NOISE_ACTIONS)
+    "audit_logs_ts": "w1",              # same, with AUDIT_LOGS_TIMESERIES
+    "audit_logs_ts.noise": "w0",
+    "audit_logs_recent": "w1",
+    "audit_logs_recent.noise": "w0",
+    "job_runs": "w1",
+}
+
+
+def _load_overrides(raw: str) -> None:
+    """WRITE_CONCERN_OVERRIDES="audit_logs=majority,audit_logs.noise=w1" """
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        key, _, profile = item.partition("=")
+        if profile.strip() not in WRITE_CONCERNS:
+            raise ValueError(f"WRITE_CONCERN_OVERRIDES: unknown profile {profile!r} for {key!r}")
+        WRITE_CONCERN_PROFILES[key.strip()] = profile.strip()
+
+
+_load_overrides(settings.WRITE_CONCERN_OVERRIDES)
+
+
+def write_concern_for(name: str, operation: str | None = None) -> WriteConcern | None:
+    profile = WRITE_CONCERN_PROFILES.get(f"{name}.{operation}") if operation else None
+    return WRITE_CONCERNS[profile or WRITE_CONCERN_PROFILES.get(name, "default")]
+
+
+def collection(db, name: str, operation: str | None = None):
+    """db[name] with the write concern of one kind of write, e.g. collection(db, "audit_logs", "noise")."""
+    wc = write_concern_for(name, operation)
+    return db.get_collection(name, write_concern=wc) if wc is not None else db[name]
+
+
+# methods that take session=; everything else is passed through untouched
+_COLLECTION_OPS = {
+    "find", "find_one", "find_raw_batches", "aggregate", "aggregate_raw_batches", "count_documents",
+    "estimated_document_count", "distinct", "insert_one", "insert_many", "update_one", "update_many",
+    "replace_one", "delete_one", "delete_many", "find_one_and_update", "find_one_and_delete",
+    "find_one_and_replace", "bulk_write",
+}
+_DATABASE_OPS = {"command", "aggregate", "list_collection_names", "list_collections"}
+
+
+class SessionCollection:
+    """A collection whose operations all run in one session."""
+
+    def __init__(self, coll: AsyncIOMotorCollection, session: AsyncIOMotorClientSession):
+        self._coll = coll
+        self._session = session
+
+    def __getattr__(self, name):
+        attr = getattr(self._coll, name)
+        # explicit sessions can't carry unacknowledged (w: 0) writes
+        if name in _COLLECTION_OPS and self._coll.write_concern.acknowledged:
+            return functools.partial(attr, session=self._session)
+        return attr
+
+    def with_options(self, **kwargs) -> "SessionCollection":
+        return SessionCollection(self._coll.with_options(**kwargs), self._session)
+
+
+class Database:
+    """
+    What get_db hands out in place of AsyncIOMotorDatabase: collections
+    come with their write-concern profile, and with the request's session
+    when there is one, so the repos don't have to pass either themselves.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, session: AsyncIOMotorClientSession | None = None):
+        self._db = db
+        self._session = session
+
+    def __getitem__(self, name: str):
+        return self.get_collection(name)
+
+    def __getattr__(self, name):
+        attr = getattr(self._db, name)
+        if isinstance(attr, AsyncIOMotorCollection):
+            return self.get_collection(name)
+        if self._session is not None and name in _DATABASE_OPS:
+            return functools.partial(attr, session=self._session)
+        return attr
+
+    def get_collection(self, name: str, **kwargs):
+        if kwargs.get("write_concern") is None:
+            kwargs["write_concern"] = write_concern_for(name)
+        coll = self._db.get_collection(name, **kwargs)
+        return SessionCollection(coll, self._session) if self._session is not None else coll
+
+    def with_options(self, **kwargs) -> "Database":
+        return Database(self._db.with_options(**kwargs), self._session)
+
 def get_client() -> AsyncIOMotorClient:
     global client
     if client is None:
-        client = AsyncIOMotorClient(settings.MONGO_URI)
+        client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=slow_queries.listeners())
     return client
 
 def get_db() -> AsyncIOMotorDatabase:
-    return get_client()[settings.MONGO_DB]
\ No newline at end of file
+    return Database(get_client()[settings.MONGO_DB], _session.get())
+
+def get_stream_db() -> AsyncIOMotorDatabase:
+    """For streaming responses, which keep reading after the request's session has ended."""
+    return Database(get_client()[settings.MONGO_DB])
@@ -0,0 +1,143 @@
+# backend/app/documents/importer.py
+"""
+Bulk document import behind POST /documents/import.
+
+NDJSON rows are validated as they stream in and written a chunk at a
+time: one users lookup resolves every owner in the chunk, then one
+unordered insert_many for the documents and one for their DOC_CREATE
+audit events. Progress goes to the import_jobs collection after every
+chunk.
+"""
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..imports import Record, batched
+from ..models import DocStatus, DocumentCreate
+from ..repos import documents as docs_repo
+from ..repos import users as users_repo
+from ..repos import audit_logs as logs_repo
+from ..repos import import_jobs as jobs_repo
+
+CHUNK_SIZE = 1000
+
+MAX_TITLE = 200
+MAX_DESCRIPTION = 5000
+
+IMPORTABLE_STATUSES = {DocStatus.PENDING_REVIEW.value, DocStatus.APPROVED.value, DocStatus.REJECTED.value}
+
+
+def _parse_row(record: dict[str, Any]) -> tuple[Optional[dict[str, Any]], Optional[str]]:
+    """Check one row; returns (clean fields, None) or (None, error)."""
+    owner_id = str(record.get("owner_id") or "").strip()
+    owner_email = str(record.get("owner_email") or "").strip().lower()
+    if not owner_id and not owner_email:
+        return None, "owner_id or owner_email is required"
+    if owner_id and not ObjectId.is_valid(owner_id):
+        return None, "invalid owner_id"
+
+    title = str(record.get("title") or "").strip()
+    if not (1 <= len(title) <= MAX_TITLE):
+        return None, f"title must be 1-{MAX_TITLE} characters"
+    description = record.get("description")
+    if description is not None:
+        description = str(description)
+        if len(description) > MAX_DESCRIPTION:
+            return None, f"description must be at most {MAX_DESCRIPTION} characters"
+
+    status = str(record.get("status") or DocStatus.PENDING_REVIEW.value).upper()
+    if status not in IMPORTABLE_STATUSES:
+        return None, "invalid status"
+
+    created_at = None
+    if record.get("created_at"):
+        try:
+            created_at = datetime.fromisoformat(str(record["created_at"]).replace("Z", "+00:00"))
+        except ValueError:
+            return None, "invalid created_at (use ISO 8601)"
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+
+    return {
+        "owner_id": ObjectId(owner_id) if owner_id else None,
+        "owner_email": owner_email or None,
+        "title": title,
+        "description": description,
+        "status": DocStatus(status),
+        "created_at": created_at,
+    }, None
+
+
+async def _resolve_owners(db: AsyncIOMotorDatabase, rows: list[dict[str, Any]]) -> tuple[dict, dict]:
+    """One users query for every owner referenced by the chunk."""
+    ids = {r["owner_id"] for r in rows if r["owner_id"]}
+    emails = {r["owner_email"] for r in rows if not r["owner_id"]}
+    clauses = []
+    if ids:
+        clauses.append({"_id": {"$in": list(ids)}})
+    if emails:
+        clauses.append({"email": {"$in": list(emails)}})
+    by_id: dict[ObjectId, dict] = {}
+    by_email: dict[str, dict] = {}
+    if clauses:
+        cursor = db[users_repo.COLL].find({"$or": clauses}, {"email": 1, "manager_id": 1})
+        async for u in cursor:
+            by_id[u["_id"]] = u
+            by_email[u["email"]] = u
+    return by_id, by_email
+
+
+async def import_documents(
+    db: AsyncIOMotorDatabase,
+    records: AsyncIterator[Record],
+    actor_id: str,
+    job_id: str,
+    chunk_size: int = CHUNK_SIZE,
+) -> None:
+    """Runs the whole import, recording progress on job_id after every chunk."""
+    async for batch in batched(records, chunk_size):
+        errors: list[dict[str, Any]] = []
+        rows: list[tuple[int, dict[str, Any]]] = []
+        for row, record, error in batch:
+            if not error:
+                fields, error = _parse_row(record)
+            if error:
+                errors.append({"row": row, "error": error})
+            else:
+                rows.append((row, fields))
+
+        by_id, by_email = await _resolve_owners(db, [f for _, f in rows])
+
+        docs: list[dict] = []
+        doc_rows: list[int] = []
+        for row, f in rows:
+            owner = by_id.get(f["owner_id"]) if f["owner_id"] else by_email.get(f["owner_email"])
+            if owner is None:
+                errors.append({"row": row, "error": "owner not found"})
+                continue
+            docs.append(docs_repo.build_document_doc(
+                owner["_id"],
+                DocumentCreate(title=f["title"], description=f["description"]),
+                status=f["status"],
+                now=f["created_at"],
+                manager_id=owner.get("manager_id"),
+            ))
+            doc_rows.append(row)
+
+        failed = await docs_repo.create_documents(db, docs)
+        now = datetime.now(timezone.utc)
+        events = []
+        for i, doc in enumerate(docs):
+            if i in failed:
+                errors.append({"row": doc_rows[i], "error": failed[i]})
+                continue
+            events.append(logs_repo.build_event(
+                actor_id, "DOC_CREATE", "DOCUMENT", str(doc["_id"]),
+                {"title": doc["title"], "import": job_id}, now=now,
+            ))
+        await logs_repo.log_events(db, events)
+
+        errors.sort(key=lambda e: e["row"])
+        await jobs_repo.record_progress(db, job_id, len(events), errors)
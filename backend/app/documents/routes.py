@@ -1,19 +1,36 @@
 # backend/app/documents/routes.py
-from fastapi import APIRouter, Depends, UploadFile, File, Form
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Request, Header, Response
+from fastapi.responses import StreamingResponse
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from typing import Optional
 from uuid import uuid4
 from datetime import datetime
 
 from ..db import get_db
-from ..api import ok, fail, ApiEnvelope
+from ..config import settings
+from ..api import ok, fail, ApiEnvelope, negotiable
 from ..models import DocumentCreate, DocumentOut, DocStatus, Role, Attachment
 from ..repos import documents as docs_repo
 from ..repos import users as users_repo
 from ..repos import audit_logs as logs_repo
+from ..repos import doc_counters
+from ..repos import transitions
+from ..repos import revisions as revisions_repo
+from ..repos import import_jobs as jobs_repo
+from ..imports import detect_format, iter_records
+from .importer import import_documents
+from ..deps import require_admin, get_current_user
+from ..events import bus
+from .. import etags
+from .. import cleanup
+from .. import reads
+from ..models import UserDB
 
 from bson import ObjectId
 from pydantic import BaseModel
+import re
+import asyncio
+import json
 
 router = APIRouter()
 
@@ -28,17 +45,49 @@ class DocUpdateBody(BaseModel):
     user_id: str                    # who is updating
     title: Optional[str] = None
     description: Optional[str] = None
+    version: Optional[int] = None   # version the caller last saw; omit to skip the check
 
 class SubmitBody(BaseModel):
     user_id: str                    # who is submitting
+    version: Optional[int] = None
 
 class ReviewBody(BaseModel):
     reviewer_id: str                # who is approving/rejecting
     comment: Optional[str] = None
+    version: Optional[int] = None
 
 class PendingScopeBody(BaseModel):
     manager_id: str  # ID of the manager whose scope we want to see
 
+class ClaimBody(BaseModel):
+    reviewer_id: str                # manager (own employees) or admin (everyone)
+    count: int = 5                  # how many documents to lease
+
+class LeaseBody(BaseModel):
+    reviewer_id: str
+    doc_ids: list[str]
+
+class BulkReviewItem(BaseModel):
+    doc_id: str
+    decision: DocStatus             # APPROVED or REJECTED
+    comment: Optional[str] = None
+
+class BulkReviewBody(BaseModel):
+    reviewer_id: str
+    items: list[BulkReviewItem]
+
+def _transition_error(result: transitions.TransitionResult, verb: str) -> str:
+    """Turn a failed transition into the message the UI shows."""
+    if result.reason == transitions.NOT_FOUND:
+        return "Document not found"
+    if result.reason == transitions.NOT_OWNER:
+        return "Only the document's owner can do that"
+    if result.reason == transitions.STALE_VERSION:
+        return f"Document has changed since you loaded it (now version {result.version}); reload and try again"
+    if result.reason == transitions.CLAIMED:
+        return "Document is claimed by another reviewer"
+    return f"{result.status} documents cannot be {verb}"
+
 # ---------- CRUD (owner-scoped, but no auth enforced) ----------
 
 @router.post("/", response_model=ApiEnvelope)
@@ -70,96 +119,324 @@ async def create_document(
         print("Error creating document:", e)
         return fail("Could not create document")
 
-@router.patch("/{doc_id}", response_model=ApiEnvelope)
-async def update_document(
-    doc_id: str,
-    body: DocUpdateBody,  # make a schema with optional fields if you like
+@router.get("/mine", response_model=ApiEnvelope)
+@negotiable
+async def list_my_documents(
+    request: Request,
+    response: Response,
+    user_id: str,  # passed as query param ?user_id=...
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
+    """
+    Public: caller passes user_id; returns that user's documents.
+    Supports If-None-Match (304 when nothing changed).
+    """
     try:
+        etag = await etags.list_etag(db[docs_repo.COLL], {"owner_id": ObjectId(user_id)}, "mine", request)
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
 
-        print("here 1")
-        # You can make a payload model or just pass the fields directly
-        update_payload = {
-            "title": body.title,
-            "description": body.description,
-        }
+        items = await docs_repo.list_my_documents(db, user_id)
+        etags.tag(response, etag)
+        return ok(items)
+    except Exception as e:
+        print("Error listing my documents:", e)
+        return fail("Could not list documents")
 
-        doc = await docs_repo.update_document(db, doc_id, update_payload)
-        if not doc:
-            return fail("Document not found")
-        
-        print("edited")
 
-        await logs_repo.log_event(
+@router.get("/search", response_model=ApiEnvelope)
+@negotiable
+async def search_documents(
+    request: Request,
+    q: str,
+    owner_id: Optional[str] = None,     # only this owner's documents
+    manager_id: Optional[str] = None,   # only documents of this manager's employees
+    status: Optional[DocStatus] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,       # next_cursor from the previous page
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: full-text search over title/description, ranked by relevance.
+    """
+    try:
+        if not q.strip():
+            return fail("Search query is required")
+        if not (1 <= limit <= 100):
+            return fail("limit must be between 1 and 100")
+
+        owner_ids: list[str] | None = None
+        if manager_id:
+            owner_ids = await users_repo.employee_ids_for_manager(db, manager_id)
+        if owner_id:
+            owner_ids = [owner_id] if owner_ids is None or owner_id in owner_ids else []
+
+        hits, next_cursor = await docs_repo.search_documents(
             db,
-            body.user_id or "000000000000000000000000",
-            "DOC_UPDATE",
-            "DOCUMENT",
-            doc.id,
-            {"title": doc.title},
+            q,
+            owner_ids=owner_ids,
+            status=status.value if status else None,
+            limit=limit,
+            cursor=cursor,
         )
-        return ok(doc)
+        return ok({"items": hits, "next_cursor": next_cursor})
+    except ValueError:
+        return fail("Invalid cursor")
+    except Exception as e:
+        print("Error searching documents:", e)
+        return fail("Could not search documents")
+
 
+@router.get("/counts", response_model=ApiEnvelope)
+async def get_status_counts(
+    owner_id: Optional[str] = None,     # one employee's documents
+    manager_id: Optional[str] = None,   # all documents of this manager's employees
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: pending/approved/rejected counts from the materialized
+    counters (single lookup, no document scan). Pass exactly one of
+    owner_id or manager_id.
+    """
+    try:
+        if bool(owner_id) == bool(manager_id):
+            return fail("Pass exactly one of owner_id or manager_id")
+        if owner_id:
+            return ok(await doc_counters.get_counts(db, "owner", owner_id))
+        return ok(await doc_counters.get_counts(db, "manager", manager_id))
     except Exception as e:
-        print("Error updating document:", e)
-        return fail("Could not update document")
+        print("Error reading document counts:", e)
+        return fail("Could not load document counts")
 
 
-@router.get("/mine", response_model=ApiEnvelope)
-async def list_my_documents(
-    user_id: str,  # passed as query param ?user_id=...
+@router.post("/counts/reconcile", response_model=ApiEnvelope)
+async def reconcile_status_counts(
     db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
 ):
     """
-    Public: caller passes user_id; returns that user's documents.
+    Admin: rebuild all counters from the documents collection.
     """
     try:
-        items = await docs_repo.list_my_documents(db, user_id)
-        return ok(items)
+        return ok(await doc_counters.reconcile(db))
     except Exception as e:
-        print("Error listing my documents:", e)
-        return fail("Could not list documents")
+        print("Error reconciling document counts:", e)
+        return fail("Could not reconcile document counts")
+
+
+@router.post("/import", response_model=ApiEnvelope)
+async def import_documents_route(
+    request: Request,
+    job_id: Optional[str] = None,   # pick your own id to poll progress while the upload runs
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """
+    Admin: import documents from an NDJSON body, one object per line with
+    title, optional description/status/created_at, and owner_id or
+    owner_email. Progress is readable at GET /documents/import/{job_id}.
+    """
+    if detect_format(request.headers.get("content-type"), "ndjson") != "ndjson":
+        return fail("Unsupported import format (use NDJSON)")
+    job_id = job_id or uuid4().hex
+    if not re.fullmatch(r"[A-Za-z0-9_-]{1,64}", job_id):
+        return fail("job_id may only contain letters, digits, _ and - (max 64)")
+    if not await jobs_repo.start_job(db, job_id, "documents", _admin.id):
+        return fail("An import with this job_id already exists")
+
+    try:
+        await import_documents(db, iter_records(request.stream(), "ndjson"), _admin.id, job_id)
+        job = await jobs_repo.finish_job(db, job_id, "done")
+        print(f"Document import {job_id}: {job['created']} created, {job['failed']} failed")
+        return ok(job)
+    except Exception as e:
+        print("Error importing documents:", e)
+        await jobs_repo.finish_job(db, job_id, "failed", "internal error")
+        return fail("Could not import documents")
+
+
+@router.get("/import/{job_id}", response_model=ApiEnvelope)
+async def get_import_job(
+    job_id: str,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """
+    Admin: progress of a document import (rows/created/failed so far and
+    the first per-row errors).
+    """
+    try:
+        job = await jobs_repo.get_job(db, job_id)
+        if not job:
+            return fail("Import job not found")
+        return ok(job)
+    except Exception as e:
+        print("Error loading import job:", e)
+        return fail("Could not load import job")
+
+
+SSE_PING_SECONDS = 20
+
+
+@router.get("/events")
+async def document_events(
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    user: UserDB = Depends(get_current_user),
+):
+    """
+    Authenticated: Server-Sent Events for document changes in the
+    caller's scope (employees: their own documents, managers: their
+    employees' documents, admins: everything). Event names are created,
+    updated, submitted, approved, rejected, deleted; "resync" means
+    events were dropped and the client should refetch its list.
+    """
+    if user.role == Role.ADMIN:
+        owner_ids = None
+    elif user.role == Role.MANAGER:
+        owner_ids = await users_repo.employee_ids_for_manager(db, user.id)
+    else:
+        owner_ids = [user.id]
+
+    sub = bus.subscribe(owner_ids)
+    backlog = bus.replay(sub, int(last_event_id)) if last_event_id and last_event_id.isdigit() else []
+
+    def frame(seq: int, event: dict) -> str:
+        return f"id: {seq}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+    async def stream():
+        try:
+            yield f"retry: 5000\n: scope {'all' if owner_ids is None else len(owner_ids)} owner(s)\n\n"
+            for seq, event in backlog:
+                yield frame(seq, event)
+            while True:
+                try:
+                    seq, event = await asyncio.wait_for(sub.queue.get(), SSE_PING_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if sub.lagged:
+                    sub.lagged = False
+                    yield "event: resync\ndata: {}\n\n"
+                yield frame(seq, event)
+        finally:
+            bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/events/stats", response_model=ApiEnvelope)
+async def document_event_stats(_admin: UserDB = Depends(require_admin)):
+    """
+    Admin: subscriber counts and bus internals of the document event feed.
+    """
+    return ok({**bus.stats(), "source": bus.source})
 
 
 @router.get("/{doc_id}", response_model=ApiEnvelope)
 async def get_document(
+    request: Request,
+    response: Response,
     doc_id: str,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
     Public: returns document by id. No owner/admin checks.
+    Supports If-None-Match (304 when nothing changed).
     """
     try:
+        if not ObjectId.is_valid(doc_id):
+            return fail("Document not found")
+        etag = await etags.doc_etag(db[docs_repo.COLL], {"_id": ObjectId(doc_id)}, "doc")
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
+
         doc = await docs_repo.get_document(db, doc_id)
         if not doc:
             return fail("Document not found")
+        etags.tag(response, etag)
         return ok(doc)
     except Exception as e:
         print("Error loading document:", e)
         return fail("Could not load document")
 
 
+@router.get("/{doc_id}/history", response_model=ApiEnvelope)
+async def get_document_history(
+    doc_id: str,
+    before_version: Optional[int] = None,
+    limit: int = 20,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: the document's revisions, newest first, each with the fields
+    that changed. Pass next_before_version back as before_version for
+    the next page.
+    """
+    try:
+        if not ObjectId.is_valid(doc_id):
+            return fail("Document not found")
+        limit = max(1, min(limit, 100))
+        items, next_before = await revisions_repo.list_history(db, doc_id, before_version, limit)
+        return ok({"items": items, "next_before_version": next_before})
+    except Exception as e:
+        print("Error loading document history:", e)
+        return fail("Could not load document history")
+
+
+@router.get("/{doc_id}/versions/{version}", response_model=ApiEnvelope)
+async def get_document_version(
+    doc_id: str,
+    version: int,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: title, description, status, attachments and review as they
+    were at `version`.
+    """
+    try:
+        if not ObjectId.is_valid(doc_id):
+            return fail("Document not found")
+        state = await revisions_repo.get_version(db, doc_id, version)
+        if state is None:
+            # a document that never changed has no revisions yet
+            doc = await docs_repo.get_document(db, doc_id)
+            if doc and doc.version == version:
+                state = {"version": version, **doc.model_dump(include=set(revisions_repo.TRACKED))}
+        if state is None:
+            return fail("Version not found")
+        return ok(state)
+    except Exception as e:
+        print("Error loading document version:", e)
+        return fail("Could not load document version")
+
+
 @router.patch("/{doc_id}", response_model=ApiEnvelope)
-async def update_draft(
+async def update_document(
     doc_id: str,
     body: DocUpdateBody,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
-    Public: caller provides user_id; repo enforces "owner can update" logic.
+    Public: caller provides user_id; only the owner can edit, and only
+    while the document is PENDING_REVIEW or REJECTED. Send `version` to
+    refuse the edit if someone changed the document since you loaded it.
     """
     try:
-        print("here 2")
-        updated = await docs_repo.update_draft(
+        result = await transitions.edit(
             db,
             doc_id,
             body.user_id,
             body.title,
             body.description,
+            expected_version=body.version,
         )
-        if not updated:
-            return fail("Only the owner can update while status is DRAFT")
+        if not result.ok:
+            return fail(_transition_error(result, "updated"))
 
         await logs_repo.log_event(
             db,
@@ -169,7 +446,7 @@ async def update_draft(
             doc_id,
             {"title": body.title, "description": body.description},
         )
-        return ok(updated)
+        return ok(result.doc)
     except Exception as e:
         print("Error updating document:", e)
         return fail("Could not update document")
@@ -182,21 +459,13 @@ async def submit_for_review(
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
-    Public: caller provides user_id; repo enforces owner + status logic.
+    Public: caller provides user_id; sends a REJECTED document back to
+    PENDING_REVIEW. Owner and status are checked in the same write.
     """
     try:
-        doc_status = await docs_repo.get_document(db, doc_id)
-        if not doc_status:
-            return fail("Document not found")
-
-        if doc_status.status == DocStatus.PENDING_REVIEW:
-            return fail("Document is already in PENDING REVIEW status")
-        elif doc_status.status == DocStatus.APPROVED:
-            return fail("Document has already been APPROVED")
-
-        ok_flag = await docs_repo.submit_for_review(db, doc_id, body.user_id)
-        if not ok_flag:
-            return fail("Only DRAFT documents owned by you can be submitted")
+        result = await transitions.submit(db, doc_id, body.user_id, expected_version=body.version)
+        if not result.ok:
+            return fail(_transition_error(result, "submitted"))
 
         await logs_repo.log_event(
             db,
@@ -205,7 +474,7 @@ async def submit_for_review(
             "DOCUMENT",
             doc_id,
         )
-        return ok()
+        return ok(result.doc)
     except Exception as e:
         print("Error submitting document:", e)
         return fail("Could not submit document")
@@ -227,7 +496,7 @@ async def add_attachment(
         content = await file.read()
         fake_file_id = str(uuid4())
 
-        updated = await docs_repo.add_attachment(
+        result = await transitions.attach(
             db,
             doc_id,
             user_id,
@@ -236,8 +505,8 @@ async def add_attachment(
             size=len(content),
             content_type=file.content_type or "application/octet-stream",
         )
-        if not updated:
-            return fail("Only the owner can add attachments while status is DRAFT")
+        if not result.ok:
+            return fail(_transition_error(result, "given attachments"))
 
         await logs_repo.log_event(
             db,
@@ -247,7 +516,7 @@ async def add_attachment(
             doc_id,
             {"added_attachment": file.filename},
         )
-        return ok(updated)
+        return ok(result.doc)
     except Exception as e:
         print("Error adding attachment:", e)
         return fail("Could not add attachment")
@@ -256,7 +525,9 @@ async def add_attachment(
 # ---------- Review queue & decisions (Manager-only by body, no auth) ----------
 
 @router.post("/view-docs", response_model=ApiEnvelope)
+@negotiable
 async def list_docs_in_scope(
+    request: Request,
     body: PendingScopeBody,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
@@ -295,7 +566,9 @@ async def list_docs_in_scope(
         return fail("Could not list documents")
 
 @router.post("/view-docs/pending", response_model=ApiEnvelope)
+@negotiable
 async def list_pending_in_scope(
+    request: Request,
     body: PendingScopeBody,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
@@ -327,6 +600,119 @@ async def list_pending_in_scope(
         return fail("Could not list pending reviews")
 
 
+@router.post("/reviews/claim", response_model=ApiEnvelope)
+async def claim_reviews(
+    body: ClaimBody,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: lease the oldest pending documents in the reviewer's scope so
+    no other reviewer gets them until the lease expires or is released.
+    """
+    try:
+        if not (1 <= body.count <= 50):
+            return fail("count must be between 1 and 50")
+
+        reviewer = await users_repo.get_user(db, body.reviewer_id)
+        if not reviewer or reviewer.role not in (Role.MANAGER, Role.ADMIN):
+            return fail("Only managers and admins can claim reviews")
+
+        owner_ids = None
+        if reviewer.role == Role.MANAGER:
+            owner_ids = await users_repo.employee_ids_for_manager(db, body.reviewer_id)
+            if not owner_ids:
+                return ok({"items": [], "lease_seconds": settings.REVIEW_LEASE_SECONDS})
+
+        items = await docs_repo.claim_reviews(
+            db, body.reviewer_id, owner_ids, body.count, settings.REVIEW_LEASE_SECONDS,
+        )
+        return ok({"items": items, "lease_seconds": settings.REVIEW_LEASE_SECONDS})
+    except Exception as e:
+        print("Error claiming reviews:", e)
+        return fail("Could not claim reviews")
+
+
+@router.post("/reviews/leases/renew", response_model=ApiEnvelope)
+async def renew_review_leases(
+    body: LeaseBody,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: extend the caller's leases. Ids missing from the result were
+    lost (expired and claimed by someone else, or already decided).
+    """
+    try:
+        renewed = await docs_repo.renew_leases(db, body.reviewer_id, body.doc_ids, settings.REVIEW_LEASE_SECONDS)
+        return ok({"renewed": renewed, "lease_seconds": settings.REVIEW_LEASE_SECONDS})
+    except Exception as e:
+        print("Error renewing review leases:", e)
+        return fail("Could not renew review leases")
+
+
+@router.post("/reviews/leases/release", response_model=ApiEnvelope)
+async def release_review_leases(
+    body: LeaseBody,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: give claimed documents back to the queue.
+    """
+    try:
+        return ok({"released": await docs_repo.release_leases(db, body.reviewer_id, body.doc_ids)})
+    except Exception as e:
+        print("Error releasing review leases:", e)
+        return fail("Could not release review leases")
+
+
+@router.post("/reviews/bulk", response_model=ApiEnvelope)
+async def decide_reviews_bulk(
+    body: BulkReviewBody,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+):
+    """
+    Public: approve/reject many documents at once. Each item succeeds or
+    fails on its own; the response lists the outcome per item. A reject
+    without a comment fails with "comment_required", as in the single
+    reject route.
+    """
+    try:
+        if not body.items:
+            return fail("No review items given")
+        if len(body.items) > 500:
+            return fail("At most 500 review items per request")
+
+        outcomes = await transitions.decide_many(
+            db,
+            body.reviewer_id,
+            [(item.doc_id, item.decision, item.comment) for item in body.items],
+        )
+
+        actions = {DocStatus.APPROVED.value: "DOC_APPROVE", DocStatus.REJECTED.value: "DOC_REJECT"}
+        comments = {item.doc_id: item.comment for item in body.items}
+        now = datetime.utcnow()
+        events = [
+            logs_repo.build_event(
+                body.reviewer_id,
+                actions[o["status"]],
+                "DOCUMENT",
+                o["doc_id"],
+                {"comment": comments.get(o["doc_id"]), "bulk": True},
+                now=now,
+            )
+            for o in outcomes if o["ok"]
+        ]
+        await logs_repo.log_events(db, events)
+
+        return ok({
+            "items": outcomes,
+            "succeeded": len(events),
+            "failed": len(outcomes) - len(events),
+        })
+    except Exception as e:
+        print("Error deciding reviews in bulk:", e)
+        return fail("Could not decide reviews")
+
+
 @router.post("/reviews/{doc_id}/approve", response_model=ApiEnvelope)
 async def approve_document(
     doc_id: str,
@@ -337,15 +723,16 @@ async def approve_document(
     Public: caller provides reviewer_id. No role checks.
     """
     try:
-        decided = await docs_repo.decide_review(
+        result = await transitions.decide(
             db,
             doc_id,
             body.reviewer_id,
             DocStatus.APPROVED,
             body.comment,
+            expected_version=body.version,
         )
-        if not decided:
-            return fail("Only PENDING_REVIEW documents can be approved")
+        if not result.ok:
+            return fail(_transition_error(result, "approved"))
 
         await logs_repo.log_event(
             db,
@@ -355,7 +742,7 @@ async def approve_document(
             doc_id,
             {"comment": body.comment},
         )
-        return ok(decided)
+        return ok(result.doc)
     except Exception as e:
         print("Error approving document:", e)
         return fail("Could not approve document")
@@ -374,15 +761,16 @@ async def reject_document(
         if not (body.comment and body.comment.strip()):
             return fail("Reject requires a non-empty comment")
 
-        decided = await docs_repo.decide_review(
+        result = await transitions.decide(
             db,
             doc_id,
             body.reviewer_id,
             DocStatus.REJECTED,
             body.comment,
+            expected_version=body.version,
         )
-        if not decided:
-            return fail("Only PENDING_REVIEW documents can be rejected")
+        if not result.ok:
+            return fail(_transition_error(result, "rejected"))
 
         await logs_repo.log_event(
             db,
@@ -392,7 +780,7 @@ async def reject_document(
             doc_id,
             {"comment": body.comment},
         )
-        return ok(decided)
+        return ok(result.doc)
     except Exception as e:
         print("Error rejecting document:", e)
         return fail("Could not reject document")
@@ -411,6 +799,7 @@ async def delete_document(
         is_deleted = await docs_repo.delete_document(db, doc_id)
         if not is_deleted:
             return fail("Only the owner can delete attachments")
+        cleanup.nudge()
 
         await logs_repo.log_event(
             db,
@@ -426,11 +815,14 @@ async def delete_document(
 
 
 @router.get("/", response_model=ApiEnvelope)
+@negotiable
 async def list_all_documents(
-    db: AsyncIOMotorDatabase = Depends(get_db),
+    request: Request,
+    db: AsyncIOMotorDatabase = Depends(reads.using("reports")),
 ):
     """
-    Public: list all documents, sorted by created_at desc.
+    Public: list all documents, sorted by created_at desc. May be served
+    by a secondary (SECONDARY_READS).
     """
     try:
         items = await docs_repo.list_all_documents(db)
@@ -448,15 +840,24 @@ async def list_all_documents(
 
 # ---------- Employee routes ----------
 @router.get("/employee/{employee_id}", response_model=ApiEnvelope)
+@negotiable
 async def list_employee_documents(
+    request: Request,
+    response: Response,
     employee_id: str,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     """
     Public: list all documents for a specific employee.
+    Supports If-None-Match (304 when nothing changed).
     """
     try:
+        etag = await etags.list_etag(db[docs_repo.COLL], {"owner_id": ObjectId(employee_id)}, "employee", request)
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
+
         items = await docs_repo.get_documents(db, employee_id)
+        etags.tag(response, etag)
         return ok(items)
     except Exception as e:
         print("Could not list employee documents:", e)
@@ -0,0 +1,79 @@
+# backend/app/etags.py
+"""
+Weak ETags for read endpoints that clients poll.
+
+A list's tag is built from how many rows match and the newest
+updated_at among them, fetched with one $match/$group aggregation that
+an index on (filter fields, updated_at) answers without loading any
+documents. When the client's If-None-Match matches, the route returns
+304 before running its real query.
+
+Every write to users and documents sets updated_at; that is what keeps
+these tags honest. @negotiable routes pass their request so the JSON and
+MessagePack bodies get different tags.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+from .api import wants_msgpack
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def _stamp(ts: Optional[datetime]) -> str:
+    return ts.strftime("%Y%m%d%H%M%S%f") if ts else "0"
+
+
+def _weak(parts: str, request: Optional[Request]) -> str:
+    if request is not None and wants_msgpack(request):
+        parts += "-msgpack"
+    return f'W/"{parts}"'
+
+
+async def list_etag(
+    coll: AsyncIOMotorCollection, query: dict[str, Any], name: str, request: Optional[Request] = None,
+) -> str:
+    rows = await coll.aggregate([
+        {"$match": query},
+        {"$group": {"_id": None, "n": {"$sum": 1}, "latest": {"$max": "$updated_at"}}},
+    ]).to_list(length=1)
+    count, latest = (rows[0]["n"], rows[0]["latest"]) if rows else (0, None)
+    return _weak(f"{name}-{count}-{_stamp(latest)}", request)
+
+
+async def doc_etag(
+    coll: AsyncIOMotorCollection, query: dict[str, Any], name: str, request: Optional[Request] = None,
+) -> Optional[str]:
+    """None when nothing matches (the route then answers as usual)."""
+    doc = await coll.find_one(query, {"_id": 0, "updated_at": 1})
+    if doc is None:
+        return None
+    return _weak(f"{name}-{_stamp(doc.get('updated_at'))}", request)
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def matches(request: Request, etag: Optional[str]) -> bool:
+    """Weak comparison against If-None-Match (handles lists and *)."""
+    header = request.headers.get("if-none-match")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(t) for t in header.split(",")}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept"})
+
+
+def tag(response: Response, etag: Optional[str]) -> None:
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        response.headers["Vary"] = "Accept"
@@ -0,0 +1,210 @@
+# backend/app/events.py
+"""
+In-process bus for document change events, served to browsers by
+GET /documents/events (Server-Sent Events).
+
+By default the write functions in repos/documents.py publish straight
+to the bus, so each worker only sees its own writes. With
+DOC_EVENTS_CHANGE_STREAM=true (needs a replica set) the bus is fed by a
+change stream on the documents collection instead, which covers every
+worker; the repo publishes are then ignored to avoid duplicates. Updates
+that touch none of status/title/version (lease heartbeats, manager_id
+stamps) are filtered out on the server. If the stream breaks after it
+has opened it is reopened from the last resume token, so nothing is
+missed or published twice; only a stream that never opens (no replica
+set) falls back to the repo publishes.
+
+Subscribers are indexed by owner id, so publishing costs one dict
+lookup per event no matter how many connections are open, and an idle
+connection is just a parked coroutine with a small queue.
+"""
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Iterable, Optional
+
+from pymongo.errors import OperationFailure
+
+from .config import settings
+
+QUEUE_SIZE = 100        # per connection; a slow client loses events and gets a "resync"
+REPLAY_SIZE = 1000      # recent events kept for Last-Event-ID reconnects
+
+# status the document moved to -> event type
+_STATUS_EVENTS = {"APPROVED": "approved", "REJECTED": "rejected", "PENDING_REVIEW": "submitted"}
+
+
+class Subscription:
+    __slots__ = ("owner_ids", "queue", "lagged")
+
+    def __init__(self, owner_ids: Optional[frozenset[str]]):
+        self.owner_ids = owner_ids          # None = everything (admins)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.lagged = False
+
+    def wants(self, event: dict[str, Any]) -> bool:
+        return self.owner_ids is None or event.get("owner_id") in self.owner_ids
+
+    def offer(self, seq: int, event: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait((seq, event))
+        except asyncio.QueueFull:
+            # drop the backlog; the client is told to refetch instead
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+
+class EventBus:
+    def __init__(self):
+        self._by_owner: dict[str, set[Subscription]] = {}
+        self._everything: set[Subscription] = set()
+        self._recent: deque[tuple[int, dict[str, Any]]] = deque(maxlen=REPLAY_SIZE)
+        self._seq = itertools.count(1)
+        self.source = "repos"
+
+    def subscribe(self, owner_ids: Optional[Iterable[str]]) -> Subscription:
+        sub = Subscription(None if owner_ids is None else frozenset(owner_ids))
+        if sub.owner_ids is None:
+            self._everything.add(sub)
+        else:
+            for owner_id in sub.owner_ids:
+                self._by_owner.setdefault(owner_id, set()).add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        if sub.owner_ids is None:
+            self._everything.discard(sub)
+            return
+        for owner_id in sub.owner_ids:
+            subs = self._by_owner.get(owner_id)
+            if subs is not None:
+                subs.discard(sub)
+                if not subs:
+                    del self._by_owner[owner_id]
+
+    def replay(self, sub: Subscription, after_seq: int) -> list[tuple[int, dict[str, Any]]]:
+        """Buffered events newer than after_seq that this subscriber may see."""
+        return [(seq, e) for seq, e in self._recent if seq > after_seq and sub.wants(e)]
+
+    def publish(self, event: dict[str, Any]) -> None:
+        seq = next(self._seq)
+        self._recent.append((seq, event))
+        for sub in self._everything:
+            sub.offer(seq, event)
+        for sub in self._by_owner.get(event.get("owner_id"), ()):
+            sub.offer(seq, event)
+
+    def stats(self) -> dict[str, int]:
+        scoped = {id(s) for subs in self._by_owner.values() for s in subs}
+        return {"connections": len(scoped) + len(self._everything), "owners_watched": len(self._by_owner)}
+
+
+bus = EventBus()
+
+
+def doc_event(kind: str, doc: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "type": kind,
+        "doc_id": str(doc["_id"]),
+        "owner_id": str(doc["owner_id"]) if doc.get("owner_id") else None,
+        "status": doc.get("status"),
+        "title": doc.get("title"),
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def publish_doc(kind: str, doc: dict[str, Any]) -> None:
+    """Called by the document write paths; a no-op when the change stream feeds the bus."""
+    if bus.source == "repos":
+        bus.publish(doc_event(kind, doc))
+
+
+def status_event_type(status: Optional[str]) -> str:
+    return _STATUS_EVENTS.get(status or "", "updated")
+
+
+# ---------- optional change stream feed ----------
+
+# an update is only an event if it touched one of these (every transition bumps version)
+WATCHED_FIELDS = ("status", "title", "version")
+RETRY_MAX_SECONDS = 30
+CHANGE_STREAM_HISTORY_LOST = 286
+
+_watch_task: asyncio.Task | None = None
+_resume_token: Optional[dict] = None
+
+
+async def watch_documents(db) -> None:
+    """
+    Feed the bus from a change stream on documents (replica set / Atlas
+    only), starting after _resume_token when there is one.
+    """
+    global _resume_token
+    pipeline = [{"$match": {"$or": [
+        {"operationType": {"$in": ["insert", "replace", "delete"]}},
+        *({"operationType": "update", f"updateDescription.updatedFields.{f}": {"$exists": True}} for f in WATCHED_FIELDS),
+    ]}}]
+    async with db["documents"].watch(
+        pipeline,
+        full_document="updateLookup",
+        full_document_before_change="whenAvailable",
+        resume_after=_resume_token,
+    ) as stream:
+        _resume_token = stream.resume_token or _resume_token     # resume from here even if no change arrives
+        if bus.source != "change_stream":
+            bus.source = "change_stream"
+            print("Document events: following the change stream")
+        async for change in stream:
+            _resume_token = stream.resume_token
+            op = change["operationType"]
+            if op == "delete":
+                # owner is only known when pre-images are enabled on the collection;
+                # without it the event reaches admin-scope subscribers only
+                doc = change.get("fullDocumentBeforeChange") or {"_id": change["documentKey"]["_id"]}
+                bus.publish(doc_event("deleted", doc))
+                continue
+            doc = change.get("fullDocument")
+            if not doc:
+                continue
+            if op == "insert":
+                kind = "created"
+            elif "status" in ((change.get("updateDescription") or {}).get("updatedFields") or {}):
+                kind = status_event_type(doc.get("status"))
+            else:
+                kind = "updated"
+            bus.publish(doc_event(kind, doc))
+
+
+def start_change_stream(db) -> Optional[asyncio.Task]:
+    global _watch_task
+    if not settings.DOC_EVENTS_CHANGE_STREAM:
+        return None
+
+    async def run():
+        global _resume_token
+        delay = 1
+        try:
+            while True:
+                seen = _resume_token
+                try:
+                    await watch_documents(db)
+                    return      # closed by the server (collection dropped or renamed)
+                except Exception as e:
+                    if bus.source != "change_stream":
+                        print("Document change stream unavailable, using in-process events:", e)
+                        return
+                    if isinstance(e, OperationFailure) and e.code == CHANGE_STREAM_HISTORY_LOST:
+                        _resume_token = None    # fell off the oplog; events in the gap are lost
+                    if _resume_token != seen:
+                        delay = 1
+                    print(f"Document change stream interrupted, resuming in {delay}s:", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RETRY_MAX_SECONDS)
+        finally:
+            bus.source = "repos"
+
+    if _watch_task is None or _watch_task.done():
+        _watch_task = asyncio.create_task(run())
+    return _watch_task
@@ -0,0 +1,181 @@
+# backend/app/imports.py
+"""
+Streaming parsers for bulk-import request bodies (CSV with a header row,
+or NDJSON: one JSON object per line).
+
+The body is consumed chunk by chunk from request.stream(), so an upload
+is never held in memory as a whole; records come out one at a time and
+callers work through them in fixed-size batches.
+"""
+import csv
+import json
+from typing import Any, AsyncIterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+FORMATS = ("csv", "ndjson")
+
+# longest single line we accept; anything bigger is not a sane record
+MAX_LINE_BYTES = 64 * 1024
+LINE_TOO_LONG = f"line longer than {MAX_LINE_BYTES} bytes"
+
+# (row number, record or None, error or None); row numbers are 1-based
+# data rows, so a CSV header does not count
+Record = tuple[int, Optional[dict[str, Any]], Optional[str]]
+
+
+def detect_format(content_type: str | None, explicit: str | None = None) -> str | None:
+    """?format= wins, then the Content-Type; None means unsupported."""
+    if explicit:
+        return explicit.lower() if explicit.lower() in FORMATS else None
+    ct = (content_type or "").split(";")[0].strip().lower()
+    if ct in ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/json-seq"):
+        return "ndjson"
+    if ct in ("text/csv", "application/csv", "text/plain", ""):
+        return "csv"
+    return None
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Optional[str]]:
+    """
+    Split a byte stream into decoded lines without buffering more than one
+    line. A line longer than MAX_LINE_BYTES comes out as None and the rest
+    of it is dropped, so the caller can report it and carry on.
+    """
+    buf = b""
+    first = True
+    skipping = False
+    async for chunk in chunks:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for raw in lines:
+            if skipping:
+                skipping = False    # the tail of an overlong line
+                continue
+            first_line, first = first, False
+            if len(raw) > MAX_LINE_BYTES:
+                yield None
+                continue
+            line = raw.decode("utf-8", errors="replace").rstrip("\r")
+            yield line.lstrip("\ufeff") if first_line else line
+        if len(buf) > MAX_LINE_BYTES:
+            if not skipping:
+                first = False
+                yield None
+            buf, skipping = b"", True
+    if buf and not skipping:
+        line = buf.decode("utf-8", errors="replace").rstrip("\r")
+        yield line.lstrip("\ufeff") if first else line
+
+
+class _Feed:
+    """The lines csv.reader pulls from, handed over one whole record at a time."""
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.lines:
+            raise StopIteration
+        return self.lines.pop(0)
+
+
+async def _csv_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Record]:
+    # One reader for the whole body. A quoted field can hold newlines, so
+    # lines are collected until their quotes balance (escaped quotes come
+    # in pairs) and only then fed to it as one record.
+    feed = _Feed()
+    reader = csv.reader(feed)
+    header: list[str] | None = None
+    row = 0
+    pending: list[str] = []
+    size = quotes = 0
+
+    async for line in lines:
+        if line is None:
+            # drops whatever record it was part of
+            row += 1
+            yield row, None, LINE_TOO_LONG
+            pending, size, quotes = [], 0, 0
+            continue
+        if not pending and not line.strip():
+            continue
+        pending.append(line + "\n")
+        size += len(line)
+        quotes += line.count('"')
+        if quotes % 2:
+            if size <= MAX_LINE_BYTES:
+                continue        # still inside a quoted field
+            row += 1
+            yield row, None, "unterminated quoted field"
+            pending, size, quotes = [], 0, 0
+            continue
+
+        feed.lines, pending, size, quotes = pending, [], 0, 0
+        try:
+            values = next(reader)
+        except csv.Error as e:
+            feed.lines = []
+            if header is not None:
+                row += 1
+                yield row, None, f"invalid CSV: {e}"
+            continue
+
+        if header is None:
+            header = [h.strip().lower() for h in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, None, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row, dict(zip(header, values)), None
+
+    if pending and header is not None:
+        yield row + 1, None, "unterminated quoted field"
+
+
+async def _ndjson_records(lines: AsyncIterator[Optional[str]]) -> AsyncIterator[Record]:
+    row = 0
+    async for line in lines:
+        if line is None:
+            row += 1
+            yield row, None, LINE_TOO_LONG
+            continue
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row, None, "invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "expected a JSON object"
+            continue
+        yield row, record, None
+
+
+async def iter_records(chunks: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    """
+    Parse a CSV/NDJSON stream into records. Malformed rows (overlong
+    lines included) are yielded with an error instead of stopping the
+    import; blank lines are skipped
+    (except inside a quoted CSV field, which may span lines).
+    """
+    parse = _csv_records if fmt == "csv" else _ndjson_records
+    async for record in parse(iter_lines(chunks)):
+        yield record
+
+
+async def batched(items: AsyncIterator[T], size: int) -> AsyncIterator[list[T]]:
+    batch: list[T] = []
+    async for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
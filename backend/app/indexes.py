@@ -0,0 +1,205 @@
+# backend/app/indexes.py
+"""
+Declarative index registry: one spec per collection.
+
+Startup builds everything (one createIndexes per collection, all
+collections concurrently), then drops the single-field indexes the
+compounds below replaced. The CLI compares the specs with what is live
+on the server:
+
+    python -m app.indexes diff     # missing / extra / changed indexes
+    python -m app.indexes sizes    # per-index size in bytes
+    python -m app.indexes create   # build now and wait for it
+"""
+import argparse
+import asyncio
+import sys
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+
+from .repos import users as users_repo
+from .repos import documents as docs_repo
+from .repos import audit_logs as logs_repo
+from .repos import revisions as revisions_repo
+from .repos import tombstones
+from .repos import job_runs
+from .config import settings
+
+INDEX_SPECS: dict[str, list[IndexModel]] = {
+    users_repo.COLL: [
+        IndexModel([("email", ASCENDING)], unique=True),
+        # role lists and their ETags: {"role": ...} + max(updated_at), covered
+        IndexModel([("role", ASCENDING), ("updated_at", DESCENDING)]),
+        # manager scope lookups: {"manager_id": ..., "role": "EMPLOYEE"}
+        IndexModel([("manager_id", ASCENDING), ("role", ASCENDING)]),
+    ],
+    docs_repo.COLL: [
+        IndexModel([("owner_id", ASCENDING), ("status", ASCENDING)]),
+        # list_my_documents: {"owner_id": ...} sorted by created_at desc
+        IndexModel([("owner_id", ASCENDING), ("created_at", DESCENDING)]),
+        # ETags for per-owner lists: count + max(updated_at), covered
+        IndexModel([("owner_id", ASCENDING), ("updated_at", DESCENDING)]),
+        # review queue: oldest pending first (claim_reviews), also serves {"status": ...}
+        IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+        IndexModel([("created_at", ASCENDING)]),
+        # orphaned_uploads job: which of these files is still attached somewhere
+        IndexModel([("attachments.file_id", ASCENDING)], partialFilterExpression={"attachments.file_id": {"$exists": True}}),
+        # GET /documents/search
+        IndexModel([("title", TEXT), ("description", TEXT)], weights={"title": 5, "description": 1}),
+    ],
+    revisions_repo.COLL: [
+        # history pages and version rebuilds are ranges on version within one document
+        IndexModel([("doc_id", ASCENDING), ("version", ASCENDING)], unique=True),
+    ],
+    tombstones.COLL: [
+        # collector queue: oldest pending first
+        IndexModel([("state", ASCENDING), ("created_at", ASCENDING)]),
+        # finished tombstones are kept a week for GET /maintenance/cleanup
+        IndexModel([("finished_at", ASCENDING)], expireAfterSeconds=tombstones.KEEP_DONE_SECONDS),
+    ],
+    job_runs.COLL: [
+        IndexModel([("job", ASCENDING), ("started_at", DESCENDING)]),
+        IndexModel([("started_at", ASCENDING)], expireAfterSeconds=job_runs.KEEP_DAYS * 24 * 3600),
+    ],
+    logs_repo.PLAIN_COLL: [
+        IndexModel([("created_at", DESCENDING)]),
+        IndexModel([("action", ASCENDING)]),
+        IndexModel([("resource_type", ASCENDING)]),
+        IndexModel([("actor_id", ASCENDING)]),
+    ],
+}
+
+if settings.AUDIT_LOGS_TIMESERIES:
+    # time-series collections index (meta, created_at) already; these serve per-action and per-actor ranges
+    INDEX_SPECS[logs_repo.TS_COLL] = [
+        IndexModel([("meta.action", ASCENDING), ("created_at", DESCENDING)]),
+        IndexModel([("meta.actor_id", ASCENDING), ("created_at", DESCENDING)]),
+    ]
+
+# indexes earlier releases created that a compound above now serves;
+# dropped once the compound has built so no query is left without one
+SUPERSEDED: dict[str, list[str]] = {
+    users_repo.COLL: ["role_1"],        # -> role_1_updated_at_-1
+    docs_repo.COLL: ["status_1"],       # -> status_1_created_at_1
+}
+
+# options that make two indexes with the same name different
+_COMPARED_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression", "weights")
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    if settings.AUDIT_LOGS_TIMESERIES:
+        # must exist before an index build would create it as a plain collection
+        try:
+            await logs_repo.ensure_timeseries(db)
+        except Exception as e:
+            print(f"Could not create {logs_repo.TS_COLL}: {e}")
+    try:
+        await logs_repo.ensure_recent(db)
+    except Exception as e:
+        print(f"Could not create {logs_repo.RECENT_COLL}: {e}")
+
+    async def build(coll: str, models: list[IndexModel]):
+        try:
+            await db[coll].create_indexes(models)
+        except Exception as e:
+            print(f"Index build failed on {coll}: {e}")
+            return
+        await drop_superseded(db, coll)
+
+    await asyncio.gather(*(build(coll, models) for coll, models in INDEX_SPECS.items()))
+
+
+async def drop_superseded(db: AsyncIOMotorDatabase, coll: str) -> None:
+    live = await db[coll].index_information()
+    for name in SUPERSEDED.get(coll, []):
+        if name not in live:
+            continue
+        try:
+            await db[coll].drop_index(name)
+            print(f"Dropped superseded index {coll}.{name}")
+        except Exception as e:
+            print(f"Could not drop {coll}.{name}: {e}")
+
+
+def _normalize(spec: dict[str, Any]) -> dict[str, Any]:
+    key = [(field, direction) for field, direction in dict(spec["key"]).items()]
+    out: dict[str, Any] = {}
+    for opt in _COMPARED_OPTIONS:
+        if spec.get(opt) is not None:
+            out[opt] = spec[opt]
+
+    text_fields = [field for field, direction in key if direction == TEXT]
+    if text_fields:
+        # the server stores text indexes as {_fts: "text", _ftsx: 1} plus
+        # an explicit weight (default 1) for every text field
+        key = [(f, d) for f, d in key if d != TEXT and f not in ("_fts", "_ftsx")] + [("_fts", TEXT), ("_ftsx", 1)]
+        if "_fts" not in dict(spec["key"]):
+            out["weights"] = {f: dict(spec.get("weights") or {}).get(f, 1) for f in text_fields}
+
+    out["key"] = key
+    return out
+
+
+async def diff(db: AsyncIOMotorDatabase) -> dict[str, dict[str, list[str]]]:
+    report: dict[str, dict[str, list[str]]] = {}
+    for coll, models in INDEX_SPECS.items():
+        live = await db[coll].index_information()
+        live.pop("_id_", None)
+        declared = {m.document["name"]: m.document for m in models}
+
+        report[coll] = {
+            "missing": sorted(name for name in declared if name not in live),
+            "extra": sorted(name for name in live if name not in declared),
+            "changed": sorted(
+                name for name in declared
+                if name in live and _normalize(declared[name]) != _normalize(live[name])
+            ),
+        }
+    return report
+
+
+async def sizes(db: AsyncIOMotorDatabase) -> dict[str, dict[str, int]]:
+    out: dict[str, dict[str, int]] = {}
+    for coll in INDEX_SPECS:
+        stats = await db[coll].aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=None)
+        out[coll] = stats[0]["storageStats"].get("indexSizes", {}) if stats else {}
+    return out
+
+
+async def _main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.indexes")
+    parser.add_argument("command", choices=["diff", "sizes", "create"])
+    args = parser.parse_args(argv)
+
+    from .db import get_db
+    db = get_db()
+
+    if args.command == "create":
+        await ensure_indexes(db)
+        print("Indexes ensured")
+        return 0
+
+    if args.command == "sizes":
+        for coll, by_index in (await sizes(db)).items():
+            print(coll)
+            for name, size in sorted(by_index.items(), key=lambda kv: -kv[1]):
+                print(f"  {name:<40} {size:>12,} bytes")
+        return 0
+
+    drift = False
+    for coll, changes in (await diff(db)).items():
+        print(coll)
+        for kind in ("missing", "extra", "changed"):
+            for name in changes[kind]:
+                drift = True
+                print(f"  {kind:<8} {name}")
+        if not any(changes.values()):
+            print("  in sync")
+    return 1 if drift else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(_main(sys.argv[1:])))
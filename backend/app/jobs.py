@@ -0,0 +1,99 @@
+# backend/app/jobs.py
+"""
+Recurring maintenance, run by app/scheduler.py (times are UTC):
+
+  cleanup              every CLEANUP_INTERVAL_SECONDS   tombstone cascade (app/cleanup.py)
+  expire_lockouts      every minute                     clear login / reset locks that ran out
+  rebuild_typeahead    every 30 minutes                 rescan, so each worker sees the others' writes
+  reconcile_counters   daily 03:17                      rebuild doc_counters from documents
+  audit_retention      daily 02:30                      drop audit logs older than AUDIT_RETENTION_DAYS (0 = keep;
+                                                        the time-series layout expires them itself)
+  orphaned_uploads     daily 04:45                      GridFS files no document points at
+
+cleanup and rebuild_typeahead run on every worker; the rest only on the
+scheduler leader.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .config import settings
+from .scheduler import Job, Scheduler
+from .repos import users as users_repo
+from .repos import documents as docs_repo
+from .repos import audit_logs as logs_repo
+from .repos import doc_counters
+from . import cleanup
+from . import typeahead
+
+ORPHAN_MIN_AGE = timedelta(days=1)     # an upload has this long to be attached to a document
+ORPHAN_BATCH = 500
+
+
+async def run_cleanup(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    return await cleanup.collect_once(db)
+
+
+async def expire_lockouts(db: AsyncIOMotorDatabase) -> dict[str, int]:
+    now = datetime.now(timezone.utc)
+    out = {}
+    for field in ("login_lock_until", "reset_lock_until"):
+        res = await db[users_repo.COLL].update_many(
+            {field: {"$ne": None, "$lte": now}},
+            {"$set": {field: None, "updated_at": now}},
+        )
+        out[field] = res.modified_count
+    return out
+
+
+async def rebuild_typeahead(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    await typeahead.rebuild(db)
+    return {"entries": typeahead.index.stats()["entries"]}
+
+
+async def reconcile_counters(db: AsyncIOMotorDatabase) -> dict[str, int]:
+    return await doc_counters.reconcile(db)
+
+
+async def audit_retention(db: AsyncIOMotorDatabase) -> dict[str, int]:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.AUDIT_RETENTION_DAYS)
+    res = await db[logs_repo.COLL].delete_many({"created_at": {"$lt": cutoff}})
+    return {"deleted": res.deleted_count}
+
+
+async def orphaned_uploads(db: AsyncIOMotorDatabase) -> dict[str, int]:
+    """Delete old GridFS files that no document lists as an attachment."""
+    cutoff = datetime.now(timezone.utc) - ORPHAN_MIN_AGE
+    checked = deleted = 0
+    after: ObjectId | None = None
+    while True:
+        query: dict = {"uploadDate": {"$lt": cutoff}}
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        batch = [f["_id"] async for f in db[cleanup.FILES_COLL].find(query, {"_id": 1}).sort("_id", 1).limit(ORPHAN_BATCH)]
+        if not batch:
+            break
+        after = batch[-1]
+        checked += len(batch)
+
+        cursor = db[docs_repo.COLL].find({"attachments.file_id": {"$in": batch}}, {"attachments.file_id": 1})
+        used = {a.get("file_id") async for d in cursor for a in d.get("attachments") or []}
+        orphans = [f for f in batch if f not in used]
+        if orphans:
+            deleted += await cleanup.delete_files(db, orphans)
+    return {"checked": checked, "deleted": deleted}
+
+
+def register(scheduler: Scheduler) -> None:
+    # tombstones are claimed one at a time, so every worker can help
+    scheduler.add(Job("cleanup", run_cleanup, interval=settings.CLEANUP_INTERVAL_SECONDS, jitter=5, timeout=1800, run_at_start=True, singleton=False))
+    scheduler.add(Job("expire_lockouts", expire_lockouts, interval=60, jitter=10, timeout=60))
+    # the index lives in each worker's memory
+    scheduler.add(Job("rebuild_typeahead", rebuild_typeahead, cron="*/30 * * * *", jitter=120, timeout=600, singleton=False))
+    scheduler.add(Job("reconcile_counters", reconcile_counters, cron="17 3 * * *", jitter=60, timeout=1800))
+    # a time-series audit collection expires rows itself (audit_logs.ensure_timeseries)
+    if settings.AUDIT_RETENTION_DAYS > 0 and not settings.AUDIT_LOGS_TIMESERIES:
+        scheduler.add(Job("audit_retention", audit_retention, cron="30 2 * * *", jitter=60, timeout=1800))
+    scheduler.add(Job("orphaned_uploads", orphaned_uploads, cron="45 4 * * *", jitter=60, timeout=1800))
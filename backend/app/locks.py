@@ -0,0 +1,226 @@
+# backend/app/locks.py
+"""
+Mongo-backed lease locks, so exactly one worker (across processes and
+hosts) runs a piece of singleton work.
+
+One document per lock in `locks`:
+
+    {"_id": <name>, "owner": "<host>:<pid>:<random>", "expires_at": <date>,
+     "token": <int>, "acquired_at": <date>, "renewed_at": <date>}
+
+Acquiring is a single upsert that only matches when the lock is free,
+expired or already ours; if someone else holds it the upsert collides
+on _id and we lose. Expiry is computed from the server clock ($$NOW),
+so hosts with skewed clocks still agree on who holds what. `token`
+goes up every time the lock changes hands and can be used as a fencing
+token.
+
+While held, a heartbeat renews the lease every ttl/3. If renewals stop
+(crash, partition) the lease runs out and another worker takes over,
+so failover takes at most `ttl` plus the other side's retry interval.
+A holder that can't renew before its own deadline sets `lost` and stops
+claiming to hold the lock: `held` is also false once the local deadline
+has passed, and each renewal is cut off at that deadline, so a renew
+hanging on an unreachable server never outlives the lease.
+
+    async with Lease(db, "startup") as lease:
+        if lease.held:
+            ...singleton work...
+"""
+import asyncio
+import os
+import random
+import socket
+import time
+from datetime import datetime
+from typing import Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from .config import settings
+
+COLL = "locks"
+
+_NOW = "$$NOW"      # server clock
+
+# fixed for the life of the process, so a restarted worker is a new owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{random.getrandbits(24):06x}"
+
+
+class Lease:
+    def __init__(self, db: AsyncIOMotorDatabase, name: str, ttl: Optional[float] = None, owner: Optional[str] = None):
+        self.db = db
+        self.name = name
+        self.ttl = ttl or settings.LOCK_TTL_SECONDS
+        self.owner = owner or WORKER_ID
+        self.token: Optional[int] = None
+        self._held = False
+        self.lost = asyncio.Event()
+        self._deadline = 0.0            # local monotonic time our lease surely lasts until
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @property
+    def held(self) -> bool:
+        """Ours, and the lease we last wrote has not run out yet by our own clock."""
+        return self._held and time.monotonic() < self._deadline
+
+    @property
+    def _ttl_ms(self) -> int:
+        return int(self.ttl * 1000)
+
+    async def acquire(self) -> bool:
+        """One attempt; True if we hold the lock now (re-acquiring our own lease also counts)."""
+        started = time.monotonic()
+        free_or_ours = {"$or": [
+            {"$lte": [{"$ifNull": ["$expires_at", datetime.min]}, _NOW]},
+            {"$eq": ["$owner", self.owner]},
+        ]}
+        try:
+            doc = await self.db[COLL].find_one_and_update(
+                {"_id": self.name, "$expr": free_or_ours},
+                [{"$set": {
+                    "token": {"$cond": [
+                        {"$eq": ["$owner", self.owner]},
+                        "$token",
+                        {"$add": [{"$ifNull": ["$token", 0]}, 1]},
+                    ]},
+                    "acquired_at": {"$cond": [{"$eq": ["$owner", self.owner]}, "$acquired_at", _NOW]},
+                    "owner": self.owner,
+                    "expires_at": {"$add": [_NOW, self._ttl_ms]},
+                    "renewed_at": _NOW,
+                }}],
+                upsert=True,
+                return_document=True,
+            )
+        except DuplicateKeyError:
+            # held by someone else: our upsert tried to insert a second <name>
+            return False
+        self._held = doc is not None and doc.get("owner") == self.owner
+        if self._held:
+            self.token = doc.get("token")
+            self._deadline = started + self.ttl
+            self.lost.clear()
+        return self._held
+
+    async def wait(self, timeout: Optional[float] = None, poll: Optional[float] = None) -> bool:
+        """Keep trying until we hold the lock or `timeout` seconds pass (None = forever)."""
+        poll = poll or max(0.5, self.ttl / 3)
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while not await self.acquire():
+            if give_up is not None and time.monotonic() >= give_up:
+                return False
+            await asyncio.sleep(poll * random.uniform(0.8, 1.2))
+        return True
+
+    async def renew(self) -> bool:
+        """False only when the lease is definitely someone else's now."""
+        started = time.monotonic()
+        res = await self.db[COLL].update_one(
+            {"_id": self.name, "owner": self.owner},
+            [{"$set": {"expires_at": {"$add": [_NOW, self._ttl_ms]}, "renewed_at": _NOW}}],
+        )
+        if res.matched_count == 1:
+            self._deadline = started + self.ttl
+            return True
+        return False
+
+    async def release(self) -> None:
+        """Hand the lock back right away (the document stays, so the token keeps counting)."""
+        self._stop_heartbeat()
+        if not self._held:
+            return
+        self._held = False
+        try:
+            await self.db[COLL].update_one(
+                {"_id": self.name, "owner": self.owner},
+                {"$set": {"expires_at": datetime.min, "owner": None}},
+            )
+        except Exception as e:
+            print(f"Could not release lock {self.name} (it will expire):", e)
+
+    def _mark_lost(self) -> None:
+        self._held = False
+        self.lost.set()
+        print(f"Lost lock {self.name}")
+
+    async def _beat(self) -> None:
+        interval = self.ttl / 3
+        while self._held:
+            await asyncio.sleep(interval)
+            left = self._deadline - time.monotonic()
+            try:
+                if left <= 0 or not await asyncio.wait_for(self.renew(), timeout=left):
+                    self._mark_lost()
+                    return
+            except asyncio.TimeoutError:
+                # still waiting on the server when the lease ran out: someone else may have it now
+                print(f"Lock {self.name} renewal did not finish before the lease ran out")
+                self._mark_lost()
+                return
+            except Exception as e:
+                # transient error: keep trying until our lease would have run out anyway
+                print(f"Lock {self.name} renewal failed:", e)
+                if time.monotonic() >= self._deadline:
+                    self._mark_lost()
+                    return
+
+    def start_heartbeat(self) -> None:
+        if self.held and (self._heartbeat is None or self._heartbeat.done()):
+            self._heartbeat = asyncio.create_task(self._beat())
+
+    def _stop_heartbeat(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+
+    async def __aenter__(self) -> "Lease":
+        if await self.acquire():
+            self.start_heartbeat()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.release()
+
+
+class Leader:
+    """
+    Standing election for one role (e.g. "scheduler"): a background task
+    keeps trying to take the lease and holds it until the process stops
+    or the lease is lost, then goes back to trying.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, name: str, ttl: Optional[float] = None):
+        self.lease = Lease(db, name, ttl)
+        self.on_lost: list = []         # callbacks, run when leadership goes away
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lease.held
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.lease.wait()
+            except Exception as e:
+                print(f"Leader election for {self.lease.name} failed:", e)
+                await asyncio.sleep(self.lease.ttl / 3)
+                continue
+            print(f"Leader for {self.lease.name}: {self.lease.owner} (token {self.lease.token})")
+            self.lease.start_heartbeat()
+            await self.lease.lost.wait()
+            for callback in self.on_lost:
+                callback()
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.lease.release()
@@ -1,9 +1,10 @@
 # backend/app/main.py
+import asyncio
+
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from fastapi.exceptions import RequestValidationError
-from pymongo.errors import DuplicateKeyError
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings 
 
@@ -14,11 +15,23 @@ from .repos import documents as docs_repo
 from .repos import audit_logs as logs_repo
 from .models import UserCreate, Role, DocumentCreate, Attachment, AuditAction, ResourceType
 from .config import settings
+from . import slow_queries
+from . import indexes
+from . import seed
+from . import typeahead
+from . import events
+from . import jobs
+from .scheduler import scheduler
+from . import locks
+from .cache import cache
+from . import reads
 
 from .users.routes import router as users_router
 from .documents.routes import router as documents_router
 from .auth.routes import router as auth_router
 from .audit.routes import router as audit_router
+from .search.routes import router as search_router
+from .maintenance.routes import router as maintenance_router
 
 app = FastAPI(title="Simple DMS (RBAC Demo)")
 
@@ -34,204 +47,68 @@ app.add_middleware(
     allow_headers=["*"],        # allow all headers
 )
 
+if slow_queries.enabled():
+    app.middleware("http")(slow_queries.tag_request)
+
+# Causally consistent sessions so listings can be served by secondaries (see app/reads.py)
+if settings.SECONDARY_READS:
+    app.middleware("http")(reads.causal_session)
 
 app.include_router(users_router, prefix="/users", tags=["users"])
 app.include_router(documents_router, prefix="/documents", tags=["documents"])
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
 app.include_router(audit_router, prefix="/logs", tags=["audit logs"])
+app.include_router(search_router, prefix="/search", tags=["search"])
+app.include_router(maintenance_router, prefix="/maintenance", tags=["maintenance"])
+
+_startup_task: asyncio.Task | None = None
+_leader: locks.Leader | None = None
+
+
+async def singleton_startup(db) -> None:
+    """Index builds and demo seeding: the worker that gets the "startup" lease does them, the rest skip."""
+    async with locks.Lease(db, "startup") as lease:
+        if not lease.held:
+            print("Startup tasks are running on another worker")
+            return
+        work = [indexes.ensure_indexes(db)]
+        # Demo accounts are seeded once per database (see app/seed.py)
+        if settings.SEED_ON_STARTUP:
+            work.append(seed.run_in_background(db))
+        await asyncio.gather(*work)
+
 
 @app.on_event("startup")
 async def startup():
     db = get_db()  # if get_db is async, make this: db = await get_db()
 
-    # Ensure indexes
-    await users_repo.ensure_indexes(db)
-    await docs_repo.ensure_indexes(db)
-    await logs_repo.ensure_indexes(db)
-
-    user_count = await db["users"].count_documents({})
-    if user_count == 0:
-        seed_admins = [
-            {
-                "email": "admin1@example.com",
-                "password": "admin1!",
-                "first_name": "Admin",
-                "last_name": "One",
-                "security_answer": "admin1",
-            },
-            {
-                "email": "admin2@example.com",
-                "password": "admin2!",
-                "first_name": "Admin",
-                "last_name": "Two",
-                "security_answer": "admin2",
-            }
-        ]
-
-        for adm in seed_admins:
-            payload = UserCreate(
-                email=adm["email"],
-                password=adm["password"],
-                role=Role.ADMIN,
-                profile={
-                    "first_name": adm["first_name"],
-                    "last_name": adm["last_name"],
-                },
-                security_answer=adm["security_answer"],
-                reset_attempts=0,
-                reset_lock_until=None,
-                password_history=[],
-                last_use_at=None,
-                last_use_success=None,
-                last_use_ip=None,
-                manager_id=None,
-                last_password_change_at=None,
-            )
-
-            try:
-                user = await users_repo.create_user(db, payload)
-                await logs_repo.log_event(
-                    db,
-                    actor_id=user.id,
-                    action="USER_CREATE",
-                    resource_type="USER",
-                    resource_id=user.id,
-                    details={"seed_admin": True, "email": adm["email"]},
-                )
-                print(f"Seeded admin user: {adm['email']}")
-            except DuplicateKeyError:
-                print(f"Admin user already exists: {adm['email']}")
-
-        # ---- Seed 2 manager accounts ----
-        seed_managers = [
-            {
-                "email": "manager1@example.com",
-                "password": "manager1!",
-                "first_name": "Manager",
-                "last_name": "One",
-                "security_answer": "manager1",
-            },
-            {
-                "email": "manager2@example.com",
-                "password": "manager2!",
-                "first_name": "Manager",
-                "last_name": "Two",
-                "security_answer": "manager2",
-            },
-            {
-                "email": "manager3@example.com",
-                "password": "manager3!",
-                "first_name": "Manager",
-                "last_name": "Three",
-                "security_answer": "manager3",
-            }
-        ]
-
-        for mgr in seed_managers:
-            payload = UserCreate(
-                email=mgr["email"],
-                password=mgr["password"],
-                role=Role.MANAGER,
-                profile={
-                    "first_name": mgr["first_name"],
-                    "last_name": mgr["last_name"],
-                },
-                security_answer=mgr["security_answer"],
-                reset_attempts=0,
-                reset_lock_until=None,
-                password_history=[],
-                last_use_at=None,
-                last_use_success=None,
-                last_use_ip=None,
-                manager_id=None,
-                last_password_change_at=None,
-            )
-
-            try:
-                user = await users_repo.create_user(db, payload)
-                print(user)
-                await logs_repo.log_event(
-                    db,
-                    actor_id=user.id,
-                    action="USER_CREATE",
-                    resource_type="USER",
-                    resource_id=user.id,
-                    details={"seed_manager": True, "email": mgr["email"]},
-                )
-                print(f"Seeded manager user: {mgr['email']}")
-            except DuplicateKeyError:
-                print(f"Manager user already exists: {mgr['email']}")
-
-        seed_employees = [
-            {
-                "email": "employee1@example.com",
-                "password": "employee1!",
-                "first_name": "Employee",
-                "last_name": "One",
-                "security_answer": "employee1",
-            },
-            {
-                "email": "employee2@example.com",
-                "password": "employee2!",
-                "first_name": "Employee",
-                "last_name": "Two",
-                "security_answer": "employee2",
-            },
-            {
-                "email": "employee3@example.com",
-                "password": "employee3!",
-                "first_name": "Employee",
-                "last_name": "Three",
-                "security_answer": "employee3",
-            },
-            {
-                "email": "employee4@example.com",
-                "password": "employee4!",
-                "first_name": "Employee",
-                "last_name": "Four",
-                "security_answer": "employee4",
-            },
-            {
-                "email": "employee5@example.com",
-                "password": "employee5!",
-                "first_name": "Employee",
-                "last_name": "Five",
-                "security_answer": "employee5",
-            },
-        ]
-
-        for emp in seed_employees:
-            payload = UserCreate(
-                email=emp["email"],
-                password=emp["password"],
-                role=Role.EMPLOYEE,
-                profile={
-                    "first_name": emp["first_name"],
-                    "last_name": emp["last_name"],
-                },
-                security_answer=emp["security_answer"],
-                reset_attempts=0,
-                reset_lock_until=None,
-                password_history=[],
-                last_use_at=None,
-                last_use_success=None,
-                last_use_ip=None,
-                manager_id=None,             
-                last_password_change_at=None,
-            )
-
-            try:
-                user = await users_repo.create_user(db, payload)
-                await logs_repo.log_event(
-                    db,
-                    actor_id=user.id,
-                    action="USER_CREATE",
-                    resource_type="USER",
-                    resource_id=user.id,
-                    details={"seed_employee": True, "email": emp["email"]},
-                )
-                print(f"Seeded employee user: {emp['email']}")
-            except DuplicateKeyError:
-                print(f"Employee user already exists: {emp['email']}")
-
-
+    # Build declared indexes (see app/indexes.py) and seed, in the background, on one worker only
+    global _startup_task, _leader
+    _startup_task = asyncio.create_task(singleton_startup(db))
+
+    # Cross-worker invalidation for the shared cache (see app/cache.py)
+    await cache.start()
+
+    # In-memory typeahead index, filled by a streaming scan (see app/typeahead.py)
+    typeahead.start_background_build(db)
+
+    # Optional change-stream feed for GET /documents/events (see app/events.py)
+    events.start_change_stream(db)
+
+    # Recurring maintenance: delete cascade, lockouts, counters, retention... (see app/jobs.py)
+    # jobs marked singleton only run on the worker holding the "scheduler" lease (see app/locks.py)
+    if settings.SCHEDULER_ENABLED:
+        if not scheduler.jobs:
+            jobs.register(scheduler)
+        _leader = locks.Leader(db, "scheduler")
+        _leader.start()
+        scheduler.start(db, _leader)
+
+@app.on_event("shutdown")
+async def shutdown():
+    # let running jobs finish (briefly) instead of killing them mid-batch
+    await scheduler.stop()
+    # hand leadership over now rather than after the lease runs out
+    if _leader is not None:
+        await _leader.stop()
+    await cache.close()
@@ -0,0 +1,89 @@
+# backend/app/maintenance/routes.py
+from fastapi import APIRouter, Depends
+from typing import Optional
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..api import ok, fail, ApiEnvelope
+from ..db import get_db
+from ..deps import require_admin
+from ..models import UserDB
+from ..repos import tombstones
+from ..repos import job_runs
+from ..scheduler import scheduler
+from .. import cleanup
+from ..cache import cache
+
+router = APIRouter()
+
+
+@router.get("/cleanup", response_model=ApiEnvelope)
+async def cleanup_status(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """
+    Admin: deletes still waiting for their cascade (documents, attachment
+    files, revisions, manager links) and what the collector has done.
+    """
+    try:
+        return ok({"backlog": await tombstones.backlog(db), "collector": cleanup.collector.stats()})
+    except Exception as e:
+        print("Error loading cleanup status:", e)
+        return fail("Could not load cleanup status")
+
+
+@router.post("/cleanup/run", response_model=ApiEnvelope)
+async def run_cleanup(
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """Admin: work through the backlog now instead of waiting for the next run."""
+    try:
+        return ok(await cleanup.collect_once(db))
+    except Exception as e:
+        print("Error running cleanup:", e)
+        return fail("Could not run cleanup")
+
+
+@router.get("/jobs", response_model=ApiEnvelope)
+async def list_jobs(
+    job: Optional[str] = None,
+    limit: int = 50,
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin: UserDB = Depends(require_admin),
+):
+    """
+    Admin: scheduled jobs on this worker (schedule, next run, last
+    outcome) and the most recent runs from every worker.
+    """
+    try:
+        limit = max(1, min(limit, 500))
+        return ok({
+            "worker": scheduler.worker_id,
+            "started": scheduler.started,
+            "leader": scheduler.is_leader,
+            "jobs": scheduler.describe(),
+            "runs": await job_runs.recent(db, job, limit),
+        })
+    except Exception as e:
+        print("Error loading jobs:", e)
+        return fail("Could not load jobs")
+
+
+@router.post("/jobs/{name}/run", response_model=ApiEnvelope)
+async def run_job(
+    name: str,
+    _admin: UserDB = Depends(require_admin),
+):
+    """Admin: start a job now on this worker; the outcome shows up in GET /maintenance/jobs."""
+    if name not in scheduler.jobs:
+        return fail("Unknown job")
+    if not scheduler.run_soon(name):
+        return fail("Job is already running or the scheduler is stopped")
+    return ok({"job": name, "started": True})
+
+
+@router.get("/cache", response_model=ApiEnvelope)
+async def cache_stats(_admin: UserDB = Depends(require_admin)):
+    """Admin: which cache backend this worker uses and its hit / miss counts."""
+    return ok(cache.stats())
@@ -109,6 +109,10 @@ class DocumentOut(DocumentBase, TsMixin):
     status: DocStatus = DocStatus.PENDING_REVIEW
     attachments: list[Attachment] = []
     review: ReviewInfo | None = None
+    version: int = 1
+
+class DocumentSearchHit(DocumentOut):
+    score: float
 
 class DocumentDB(DocumentBase, TsMixin):
     id: str | None = None
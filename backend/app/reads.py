@@ -0,0 +1,104 @@
+# backend/app/reads.py
+"""
+Read routing for replica sets (SECONDARY_READS=true; off by default, and
+it needs a replica set).
+
+Per-route read profiles, picked with Depends(reads.using(<profile>)):
+
+  primary   default for every route that doesn't ask: primary, "local"
+  reports   listings that can lag a little (GET /documents/, GET /users,
+            GET /logs/): secondaryPreferred, "majority", and secondaries
+            more than READ_MAX_STALENESS_SECONDS behind are skipped
+
+So that a user still reads their own writes from a secondary, every
+request runs in a causally consistent session (see db.get_db). When a
+request moved the session's operation time forward, the signed cluster
+and operation time go back in the CAUSAL_COOKIE cookie; the next request
+starts its session from there, so a read on a secondary waits until that
+secondary has caught up with the write (afterClusterTime). The cookie is
+per browser, so workers don't need to share anything. Strict read-your-
+writes also needs the write acknowledged by a majority, which is the
+server default since MongoDB 5.0.
+"""
+import base64
+import hashlib
+import hmac
+from typing import Optional
+
+import bson
+from fastapi import Depends, Request
+from motor.motor_asyncio import AsyncIOMotorClientSession, AsyncIOMotorDatabase
+from pymongo.read_concern import ReadConcern
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+from .config import settings
+from . import db as db_module
+from .db import get_db
+
+CAUSAL_COOKIE = "causal"
+CAUSAL_COOKIE_MAX_AGE = 300     # seconds; replication lag past this is a bigger problem than stale reads
+
+
+def _profiles() -> dict:
+    staleness = settings.READ_MAX_STALENESS_SECONDS or -1     # -1 = no limit
+    return {
+        "primary": {"read_preference": Primary(), "read_concern": ReadConcern("local")},
+        "reports": {"read_preference": SecondaryPreferred(max_staleness=staleness), "read_concern": ReadConcern("majority")},
+    }
+
+
+def using(profile: str):
+    """Route dependency: the request's database with this profile's read preference and read concern."""
+    options = _profiles()[profile]
+
+    def dependency(db: AsyncIOMotorDatabase = Depends(get_db)) -> AsyncIOMotorDatabase:
+        if not settings.SECONDARY_READS:
+            return db
+        return db.with_options(**options)
+
+    return dependency
+
+
+def _sign(payload: bytes) -> str:
+    return hmac.new(settings.JWT_SECRET.encode(), payload, hashlib.sha256).hexdigest()[:32]
+
+
+def encode_token(session: AsyncIOMotorClientSession) -> Optional[str]:
+    if session.operation_time is None or session.cluster_time is None:
+        return None
+    payload = bson.encode({"c": session.cluster_time, "o": session.operation_time})
+    return f"{base64.urlsafe_b64encode(payload).decode()}.{_sign(payload)}"
+
+
+def advance(session: AsyncIOMotorClientSession, token: str) -> bool:
+    """Start the session from a previous request's cookie; anything malformed or forged is ignored."""
+    try:
+        encoded, signature = token.rsplit(".", 1)
+        payload = base64.urlsafe_b64decode(encoded.encode())
+        if not hmac.compare_digest(signature, _sign(payload)):
+            return False
+        times = bson.decode(payload)
+        session.advance_cluster_time(times["c"])
+        session.advance_operation_time(times["o"])
+        return True
+    except Exception:
+        return False
+
+
+async def causal_session(request: Request, call_next):
+    """HTTP middleware: one causally consistent session per request, carried between requests in CAUSAL_COOKIE."""
+    async with await db_module.get_client().start_session(causal_consistency=True) as session:
+        incoming = request.cookies.get(CAUSAL_COOKIE)
+        if incoming:
+            advance(session, incoming)
+        before = session.operation_time
+        token = db_module._session.set(session)
+        try:
+            response = await call_next(request)
+        finally:
+            db_module._session.reset(token)
+        if session.operation_time is not None and session.operation_time != before:
+            outgoing = encode_token(session)
+            if outgoing:
+                response.set_cookie(CAUSAL_COOKIE, outgoing, max_age=CAUSAL_COOKIE_MAX_AGE, httponly=True, samesite="lax")
+    return response
@@ -1,17 +1,52 @@
 # backend/app/repos/audit_logs.py
+from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import CursorType
+from pymongo.errors import CollectionInvalid
 from datetime import datetime, timezone
 from zoneinfo import ZoneInfo
-from typing import Optional, Any
+from typing import Optional, Any, AsyncIterator
+import asyncio
 
-from ..models import AuditLogDB, AuditLogOut
+from ..models import AuditAction, AuditLogDB, AuditLogOut
+from ..config import settings
+from ..db import collection
+from ..slow_queries import traced
 from .utils import to_obj_id
 from zoneinfo import ZoneInfo
 
 
-COLL = "audit_logs"
+PLAIN_COLL = "audit_logs"
+# AUDIT_LOGS_TIMESERIES=true: a native time-series collection (MongoDB 6.0+),
+# timeField created_at, metaField "meta" = {action, resource_type, actor_id}.
+# python -m app.audit.migrate copies the plain collection over.
+TS_COLL = "audit_logs_ts"
+TS_META_FIELDS = ("action", "resource_type", "actor_id")
+
+COLL = TS_COLL if settings.AUDIT_LOGS_TIMESERIES else PLAIN_COLL
+
+# The newest AUDIT_RECENT_MAX events again, in a capped collection (always
+# the plain layout, same _id as in COLL). GET /logs/ and GET /logs/tail
+# read this; older pages go to COLL.
+RECENT_COLL = "audit_logs_recent"
+RECENT_AVG_BYTES = 4096     # capped collections need a byte size too; generous per event
+TAIL_AWAIT_MS = 1000        # how long each getMore on the tail waits for new events
+
+# input validation failures: high volume, low value, written fire-and-forget (app/db.py, "audit_logs.noise")
+NOISE_ACTIONS = {
+    AuditAction.INC_CHAR_EMAIL.value,
+    AuditAction.INC_NICKNAME.value,
+    AuditAction.OUT_OF_RANGE_NN.value,
+    AuditAction.INC_CHAR_PASS.value,
+    AuditAction.NO_DIGIT_PASS.value,
+    AuditAction.OUT_OF_RANGE_PASS.value,
+    AuditAction.LOGIN_INPUT_ERROR.value,
+    AuditAction.DOCUMENT_INPUT_ERROR.value,
+}
 
 def _doc_to_out(doc) -> AuditLogOut:
+    if "meta" in doc:
+        doc = {**doc["meta"], **doc}
     return AuditLogOut(
         id=str(doc["_id"]),
         actor_id=str(doc["actor_id"]),
@@ -23,22 +58,17 @@ def _doc_to_out(doc) -> AuditLogOut:
         updated_at=doc.get("updated_at"),
     )
 
-async def ensure_indexes(db: AsyncIOMotorDatabase):
-    await db[COLL].create_index([("created_at", -1)])
-    await db[COLL].create_index("action")
-    await db[COLL].create_index("resource_type")
-
 MANILA_TZ = ZoneInfo("Asia/Manila")
 
-async def log_event(
-    db: AsyncIOMotorDatabase,
-    actor_id: str,
+def build_event(
+    actor_id: str | None,
     action: str,
     resource_type: str,
     resource_id: str | None = None,
     details: dict | None = None,
-) -> AuditLogOut:
-    now = datetime.now(timezone.utc)
+    now: datetime | None = None,
+) -> dict:
+    now = now or datetime.now(timezone.utc)
 
     if actor_id is None:
         actor_id = "000000000000000000000000"  # system actor
@@ -53,7 +83,7 @@ async def log_event(
         # in case someone passes a string or other type
         normalized_details = {"raw": details}
 
-    doc = {
+    return {
         "actor_id": to_obj_id(actor_id),
         "action": action,
         "resource_type": resource_type,
@@ -63,10 +93,148 @@ async def log_event(
         "updated_at": now,
     }
 
-    res = await db[COLL].insert_one(doc)
-    doc["_id"] = res.inserted_id
+def to_timeseries(doc: dict) -> dict:
+    """A build_event() row in the time-series layout: the fields we filter on move under meta."""
+    out = {k: v for k, v in doc.items() if k not in TS_META_FIELDS}
+    out["meta"] = {k: doc.get(k) for k in TS_META_FIELDS}
+    return out
+
+def _stored(doc: dict) -> dict:
+    return to_timeseries(doc) if COLL == TS_COLL else doc
+
+async def ensure_timeseries(db: AsyncIOMotorDatabase) -> None:
+    """
+    Create TS_COLL if it isn't there yet (it can't be created implicitly
+    by an insert or an index build) and keep its expiry in line with
+    AUDIT_RETENTION_DAYS.
+    """
+    expire = settings.AUDIT_RETENTION_DAYS * 24 * 3600 if settings.AUDIT_RETENTION_DAYS > 0 else None
+    if not await db.list_collection_names(filter={"name": TS_COLL}):
+        options: dict[str, Any] = {"timeseries": {"timeField": "created_at", "metaField": "meta", "granularity": "seconds"}}
+        if expire:
+            options["expireAfterSeconds"] = expire
+        try:
+            await db.create_collection(TS_COLL, **options)
+            return
+        except CollectionInvalid:
+            pass    # another worker created it first
+    await db.command("collMod", TS_COLL, expireAfterSeconds=expire or "off")
+
+async def ensure_recent(db: AsyncIOMotorDatabase) -> None:
+    """Create RECENT_COLL capped, or fix it up if an insert created it as a plain collection first."""
+    size = settings.AUDIT_RECENT_MAX * RECENT_AVG_BYTES
+    infos = await (await db.list_collections(filter={"name": RECENT_COLL})).to_list(length=1)
+    if not infos:
+        try:
+            await db.create_collection(RECENT_COLL, capped=True, size=size, max=settings.AUDIT_RECENT_MAX)
+        except CollectionInvalid:
+            pass    # another worker created it first
+        return
+    options = infos[0].get("options") or {}
+    if not options.get("capped"):
+        await db.command("convertToCapped", RECENT_COLL, size=size)
+        options = {}
+    if options.get("max") != settings.AUDIT_RECENT_MAX:
+        try:
+            await db.command("collMod", RECENT_COLL, cappedSize=size, cappedMax=settings.AUDIT_RECENT_MAX)
+        except Exception as e:
+            # resizing needs MongoDB 6.0+; the old limits stay
+            print(f"Could not resize {RECENT_COLL}:", e)
+
+async def _remember(db: AsyncIOMotorDatabase, docs: list[dict], operation: str | None = None) -> None:
+    """Best effort: the event is already in COLL."""
+    try:
+        await collection(db, RECENT_COLL, operation).insert_many([dict(d) for d in docs], ordered=False)
+    except Exception as e:
+        print(f"Could not add to {RECENT_COLL}:", e)
+
+@traced
+async def log_event(
+    db: AsyncIOMotorDatabase,
+    actor_id: str,
+    action: str,
+    resource_type: str,
+    resource_id: str | None = None,
+    details: dict | None = None,
+) -> AuditLogOut:
+    doc = build_event(actor_id, action, resource_type, resource_id, details)
+    doc["_id"] = ObjectId()
+    operation = "noise" if doc["action"] in NOISE_ACTIONS else None
+
+    await collection(db, COLL, operation).insert_one(_stored(doc))
+    await _remember(db, [doc], operation)
     return _doc_to_out(doc)
 
-async def list_logs(db: AsyncIOMotorDatabase, limit: int = 50) -> list[AuditLogOut]:
-    cursor = db[COLL].find({}).sort("created_at", -1).limit(limit)
+@traced
+async def log_events(db: AsyncIOMotorDatabase, events: list[dict]) -> int:
+    """
+    Batch version of log_event. `events` are dicts built with build_event;
+    written with a single unordered insert_many.
+    """
+    if not events:
+        return 0
+    for e in events:
+        e.setdefault("_id", ObjectId())
+    res = await db[COLL].insert_many([_stored(e) for e in events], ordered=False)
+    await _remember(db, events)
+    return len(res.inserted_ids)
+
+@traced
+async def list_logs(db: AsyncIOMotorDatabase, limit: int = 50, before: datetime | None = None) -> list[AuditLogOut]:
+    """
+    Newest first. The first AUDIT_RECENT_MAX come from RECENT_COLL in
+    natural (insertion) order, no index involved; pages `before` a time,
+    or a recent collection that hasn't filled up yet, use COLL.
+    """
+    if before is None and limit <= settings.AUDIT_RECENT_MAX:
+        rows = await db[RECENT_COLL].find({}).sort("$natural", -1).limit(limit).to_list(length=limit)
+        if len(rows) == limit:
+            # several workers append concurrently, so insertion order can be off by a few ms
+            rows.sort(key=lambda d: d["created_at"], reverse=True)
+            return [_doc_to_out(d) for d in rows]
+
+    query = {"created_at": {"$lt": before}} if before is not None else {}
+    cursor = db[COLL].find(query).sort("created_at", -1).limit(limit)
     return [_doc_to_out(d) async for d in cursor]
+
+@traced
+async def newest_recent_id(db: AsyncIOMotorDatabase) -> Optional[ObjectId]:
+    rows = await db[RECENT_COLL].find({}, {"_id": 1}).sort("$natural", -1).limit(1).to_list(length=1)
+    return rows[0]["_id"] if rows else None
+
+async def tail(db: AsyncIOMotorDatabase, after: Optional[ObjectId] = None) -> AsyncIterator[Optional[AuditLogOut]]:
+    """
+    Follow RECENT_COLL with a tailable cursor, events after `after` in
+    insertion order. Yields None each time a wait for new events times
+    out (about every TAIL_AWAIT_MS), so callers can send keep-alives.
+
+    Position is kept by insertion ($natural) order, never by _id: ids
+    from different workers don't sort in the order the events landed.
+    Every cursor starts at the oldest event and skips up to `after`; if
+    it reads everything without meeting `after`, that event has been
+    capped away and the skipped events are all newer, so they go out.
+    """
+    while True:
+        skipped: Optional[list[dict]] = [] if after is not None else None
+        cursor = db[RECENT_COLL].find({}, cursor_type=CursorType.TAILABLE_AWAIT, max_await_time_ms=TAIL_AWAIT_MS)
+        try:
+            while cursor.alive:
+                async for doc in cursor:
+                    if skipped is None:
+                        after = doc["_id"]
+                        yield _doc_to_out(doc)
+                    elif doc["_id"] == after:
+                        skipped = None
+                    else:
+                        skipped.append(doc)
+                if skipped:
+                    for doc in skipped:
+                        after = doc["_id"]
+                        yield _doc_to_out(doc)
+                skipped = None
+                yield None
+        finally:
+            await cursor.close()
+        # the cursor dies when the collection is empty or the cap overtook it; start a new one
+        await asyncio.sleep(TAIL_AWAIT_MS / 1000)
+        yield None
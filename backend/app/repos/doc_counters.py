@@ -0,0 +1,249 @@
+# backend/app/repos/doc_counters.py
+"""
+Materialized document status counts, one counter document per owner and
+per manager:
+
+    {"_id": "owner:<id>", "scope": "owner", "ref_id": <id>,
+     "counts": {"PENDING_REVIEW": 3, "APPROVED": 10, "REJECTED": 1}}
+
+The document write paths in repos/documents.py call record_transition()
+(record_transitions() for batches) after a successful write; reads are a
+single _id lookup. The manager comes from the manager_id stamped on the
+document at creation (kept in step by users.assign_manager and the
+cleanup of a deleted manager); only documents written before that field
+existed cost a users lookup. The counter update is a separate write from
+the document change, so a crash between the two (or a manager
+reassignment) can leave counts off until the next reconcile(), which
+rebuilds everything from the documents collection.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne, UpdateOne
+
+from ..models import DocStatus
+from ..slow_queries import traced
+from .utils import to_obj_id
+
+COLL = "doc_counters"
+USERS_COLL = "users"
+
+TRACKED = (DocStatus.PENDING_REVIEW.value, DocStatus.APPROVED.value, DocStatus.REJECTED.value)
+
+# manager_id not known to the caller: looked up from users
+UNKNOWN = object()
+
+
+def _key(scope: str, ref_id) -> str:
+    return f"{scope}:{ref_id}"
+
+
+def _empty() -> dict[str, int]:
+    return {s: 0 for s in TRACKED}
+
+
+def manager_of(doc: dict):
+    """The manager_id stamped on a document (None: no manager), or UNKNOWN for older documents."""
+    return doc.get("manager_id", UNKNOWN)
+
+
+def _bump(inc: dict[str, int], old_status: Optional[str], new_status: Optional[str]) -> None:
+    if old_status in TRACKED:
+        inc[f"counts.{old_status}"] = inc.get(f"counts.{old_status}", 0) - 1
+    if new_status in TRACKED:
+        inc[f"counts.{new_status}"] = inc.get(f"counts.{new_status}", 0) + 1
+
+
+@traced
+async def record_transition(
+    db: AsyncIOMotorDatabase,
+    owner_id: str,
+    old_status: Optional[str],
+    new_status: Optional[str],
+    manager_id=UNKNOWN,
+) -> None:
+    """
+    Move one document from old_status to new_status in its owner's and
+    the owner's manager's counters. None means created / deleted.
+    Pass manager_of(doc) as manager_id.
+    """
+    await record_transitions(db, [(owner_id, old_status, new_status, manager_id)])
+
+
+@traced
+async def record_transitions(
+    db: AsyncIOMotorDatabase,
+    transitions: list[tuple[str, Optional[str], Optional[str], object]],
+) -> None:
+    """
+    Batch version of record_transition, with (owner_id, old_status,
+    new_status, manager_id) items: one bulk_write with a single $inc per
+    touched counter, plus one users lookup if any manager_id is UNKNOWN.
+    Never raises: the document writes already happened, so a failure here
+    is logged and left for reconcile().
+    """
+    per_owner: dict[ObjectId, dict[str, int]] = {}
+    per_manager: dict[ObjectId, dict[str, int]] = {}
+    unknown: dict[ObjectId, dict[str, int]] = {}    # owner -> counts still to attribute to a manager
+    for owner_id, old_status, new_status, manager_id in transitions:
+        owner_oid = to_obj_id(owner_id)
+        _bump(per_owner.setdefault(owner_oid, {}), old_status, new_status)
+        if manager_id is UNKNOWN:
+            _bump(unknown.setdefault(owner_oid, {}), old_status, new_status)
+        elif manager_id:
+            _bump(per_manager.setdefault(to_obj_id(manager_id), {}), old_status, new_status)
+    if not any(v for inc in per_owner.values() for v in inc.values()):
+        return
+
+    try:
+        if any(v for inc in unknown.values() for v in inc.values()):
+            cursor = db[USERS_COLL].find({"_id": {"$in": list(unknown)}}, {"manager_id": 1})
+            async for u in cursor:
+                if u.get("manager_id"):
+                    totals = per_manager.setdefault(u["manager_id"], {})
+                    for k, v in unknown[u["_id"]].items():
+                        totals[k] = totals.get(k, 0) + v
+
+        now = datetime.now(timezone.utc)
+        ops = []
+        for scope, incs in (("owner", per_owner), ("manager", per_manager)):
+            for ref_id, inc in incs.items():
+                inc = {k: v for k, v in inc.items() if v}
+                if inc:
+                    ops.append(UpdateOne(
+                        {"_id": _key(scope, ref_id)},
+                        {"$inc": inc, "$set": {"scope": scope, "ref_id": ref_id, "updated_at": now}},
+                        upsert=True,
+                    ))
+        if ops:
+            await db[COLL].bulk_write(ops, ordered=False)
+    except Exception as e:
+        print(f"Counter update failed for {len(transitions)} transition(s):", e)
+
+
+@traced
+async def get_counts(db: AsyncIOMotorDatabase, scope: str, ref_id: str) -> dict[str, int]:
+    """scope is "owner" or "manager"; missing counters read as zeros."""
+    doc = await db[COLL].find_one({"_id": _key(scope, to_obj_id(ref_id))}, {"counts": 1})
+    counts = _empty()
+    for status, n in ((doc or {}).get("counts") or {}).items():
+        if status in counts:
+            counts[status] = n
+    counts["total"] = sum(counts[s] for s in TRACKED)
+    return counts
+
+
+@traced
+async def forget_owner(db: AsyncIOMotorDatabase, owner_id, manager_id=None) -> None:
+    """
+    A deleted user's documents go with them: take the owner's counts out
+    of their manager's counter, then drop the user's own owner and
+    manager counters. Never raises (reconcile() fixes any drift).
+    """
+    owner_oid = to_obj_id(owner_id)
+    try:
+        doc = await db[COLL].find_one({"_id": _key("owner", owner_oid)}, {"counts": 1})
+        counts = {k: v for k, v in ((doc or {}).get("counts") or {}).items() if k in TRACKED and v}
+        if manager_id and counts:
+            await db[COLL].update_one(
+                {"_id": _key("manager", to_obj_id(manager_id))},
+                {"$inc": {f"counts.{k}": -v for k, v in counts.items()}, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            )
+        await db[COLL].delete_many({"_id": {"$in": [_key("owner", owner_oid), _key("manager", owner_oid)]}})
+    except Exception as e:
+        print(f"Counter cleanup failed for {owner_id}:", e)
+
+
+@traced
+async def reconcile(db: AsyncIOMotorDatabase, docs_coll: str = "documents", batch_size: int = 1000) -> dict[str, int]:
+    """
+    Rebuild every counter from one aggregation over documents.
+    Manager counts follow each document's own manager_id, as the live
+    updates do; documents without one fall back to their owner's manager.
+    Counters that no longer have any documents behind them are removed,
+    unless a write touched them after the run started. Writes that land
+    while this runs can be overwritten; the next run picks them up.
+    """
+    stamp = datetime.now(timezone.utc)
+    stamp = stamp.replace(microsecond=stamp.microsecond // 1000 * 1000)    # BSON dates are milliseconds
+    pipeline = [
+        {"$match": {"status": {"$in": list(TRACKED)}}},
+        {"$group": {
+            "_id": {
+                "owner_id": "$owner_id",
+                "status": "$status",
+                "manager_id": "$manager_id",
+                # manager_id: null (no manager) and a missing field (older document) differ
+                "stamped": {"$ne": [{"$type": "$manager_id"}, "missing"]},
+            },
+            "n": {"$sum": 1},
+        }},
+        {"$group": {"_id": "$_id.owner_id", "parts": {"$push": {
+            "status": "$_id.status", "manager_id": "$_id.manager_id", "stamped": "$_id.stamped", "n": "$n",
+        }}}},
+    ]
+
+    managers: dict = {}
+    unstamped: dict[ObjectId, dict[str, int]] = {}    # owner -> counts still to attribute to a manager
+    ops: list[ReplaceOne] = []
+    owners = 0
+
+    def add(manager_id, status: str, n: int) -> None:
+        totals = managers.setdefault(manager_id, _empty())
+        totals[status] += n
+
+    async def attribute():
+        if unstamped:
+            async for u in db[USERS_COLL].find({"_id": {"$in": list(unstamped)}}, {"manager_id": 1}):
+                if u.get("manager_id"):
+                    for status, n in unstamped[u["_id"]].items():
+                        add(u["manager_id"], status, n)
+            unstamped.clear()
+
+    async def flush():
+        if ops:
+            await db[COLL].bulk_write(ops, ordered=False)
+            ops.clear()
+
+    async for row in db[docs_coll].aggregate(pipeline, allowDiskUse=True):
+        counts = _empty()
+        for part in row["parts"]:
+            counts[part["status"]] += part["n"]
+            if not part["stamped"]:
+                legacy = unstamped.setdefault(row["_id"], _empty())
+                legacy[part["status"]] += part["n"]
+            elif part.get("manager_id"):
+                add(part["manager_id"], part["status"], part["n"])
+
+        key = _key("owner", row["_id"])
+        ops.append(ReplaceOne(
+            {"_id": key},
+            {"_id": key, "scope": "owner", "ref_id": row["_id"], "counts": counts,
+             "updated_at": stamp, "reconciled_at": stamp},
+            upsert=True,
+        ))
+        owners += 1
+
+        if len(unstamped) >= batch_size:
+            await attribute()
+        if len(ops) >= batch_size:
+            await flush()
+    await attribute()
+
+    for manager_id, counts in managers.items():
+        key = _key("manager", manager_id)
+        ops.append(ReplaceOne(
+            {"_id": key},
+            {"_id": key, "scope": "manager", "ref_id": manager_id, "counts": counts,
+             "updated_at": stamp, "reconciled_at": stamp},
+            upsert=True,
+        ))
+        if len(ops) >= batch_size:
+            await flush()
+    await flush()
+
+    # counters first created (or bumped) during the run have updated_at >= stamp: keep them
+    removed = await db[COLL].delete_many({"reconciled_at": {"$ne": stamp}, "updated_at": {"$lt": stamp}})
+    return {"owners": owners, "managers": len(managers), "removed": removed.deleted_count}
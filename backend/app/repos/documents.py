@@ -1,14 +1,26 @@
 # backend/app/repos/documents.py
 from typing import Optional, Iterable
+import base64
+import json
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
-from datetime import datetime, timezone
+from pymongo.errors import BulkWriteError
+from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 
-from ..models import DocumentCreate, DocumentDB, DocumentOut, DocStatus, Attachment, ReviewInfo
+from ..models import DocumentCreate, DocumentOut, DocumentSearchHit, DocStatus, Attachment, ReviewInfo
+from ..slow_queries import traced
+from ..typeahead import index as typeahead_index
+from ..events import publish_doc
 from .utils import to_obj_id, from_obj_id
+from . import doc_counters, tombstones
 
 COLL = "documents"
+USERS_COLL = "users"
+
+# pipeline-update expression for the optimistic version; documents from
+# before versions existed count as version 1 (see repos/transitions.py)
+NEXT_VERSION = {"$add": [{"$ifNull": ["$version", 1]}, 1]}
 
 def _doc_to_out(d: dict) -> DocumentOut:
     review_doc = d.get("review")
@@ -32,37 +44,81 @@ def _doc_to_out(d: dict) -> DocumentOut:
         review=review,
         created_at=d.get("created_at"),
         updated_at=d.get("updated_at"),
+        version=d.get("version", 1),
     )
 
 
-async def ensure_indexes(db: AsyncIOMotorDatabase):
-    await db[COLL].create_index([("owner_id", 1), ("status", 1)])
-    await db[COLL].create_index("status")
-    await db[COLL].create_index("created_at")
-
-async def create_document(db: AsyncIOMotorDatabase, owner_id: str, payload: DocumentCreate) -> DocumentOut:
-    now = datetime.now(ZoneInfo("Asia/Manila"))
+def build_document_doc(
+    owner_id: str,
+    payload: DocumentCreate,
+    status: DocStatus = DocStatus.PENDING_REVIEW,
+    now: datetime | None = None,
+    manager_id=doc_counters.UNKNOWN,
+) -> dict:
+    """manager_id is the owner's manager (None for none), stamped for the status counters."""
+    now = now or datetime.now(ZoneInfo("Asia/Manila"))
     doc = {
         "owner_id": to_obj_id(owner_id),
         "title": payload.title,
         "description": payload.description,
-        "status": DocStatus.PENDING_REVIEW.value,
+        "status": status.value,
         "attachments": [
             {"file_id": to_obj_id(a.file_id), "filename": a.filename, "size": a.size, "content_type": a.content_type}
             for a in payload.attachments
         ],
         "review": None,
+        "version": 1,
         "created_at": now,
         "updated_at": now,
     }
+    if manager_id is not doc_counters.UNKNOWN:
+        doc["manager_id"] = to_obj_id(manager_id) if manager_id else None
+    return doc
+
+@traced
+async def create_document(db: AsyncIOMotorDatabase, owner_id: str, payload: DocumentCreate, manager_id=doc_counters.UNKNOWN) -> DocumentOut:
+    if manager_id is doc_counters.UNKNOWN:
+        owner = await db[USERS_COLL].find_one({"_id": to_obj_id(owner_id)}, {"manager_id": 1})
+        manager_id = (owner or {}).get("manager_id")
+    doc = build_document_doc(owner_id, payload, manager_id=manager_id)
     res = await db[COLL].insert_one(doc)
     doc["_id"] = res.inserted_id
+    typeahead_index.add_document(doc)
+    await doc_counters.record_transition(db, owner_id, None, doc["status"], doc["manager_id"])
+    publish_doc("created", doc)
     return _doc_to_out(doc)
 
+@traced
+async def create_documents(db: AsyncIOMotorDatabase, docs: list[dict]) -> dict[int, str]:
+    """
+    Unordered insert_many of docs built with build_document_doc.
+    Returns {index in docs: error} for the rows that failed.
+    """
+    if not docs:
+        return {}
+
+    failed: dict[int, str] = {}
+    try:
+        await db[COLL].insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get("writeErrors", []):
+            failed[err["index"]] = err.get("errmsg", "write error")
+
+    transitions = []
+    for i, d in enumerate(docs):
+        if i not in failed:
+            typeahead_index.add_document(d)
+            transitions.append((d["owner_id"], None, d["status"], doc_counters.manager_of(d)))
+            publish_doc("created", d)
+    await doc_counters.record_transitions(db, transitions)
+    return failed
+
+@traced
 async def get_document(db: AsyncIOMotorDatabase, doc_id: str) -> Optional[DocumentOut]:
-    doc = await db[COLL].find_one({"owner_id": to_obj_id(doc_id)})
+    doc = await db[COLL].find_one({"_id": to_obj_id(doc_id)})
     return _doc_to_out(doc) if doc else None
 
+@traced
 async def get_documents(
     db: AsyncIOMotorDatabase,
     owner_id: str,
@@ -88,6 +144,7 @@ async def get_documents(
     return docs
 
 
+@traced
 async def get_documents_status(db: AsyncIOMotorDatabase, owner_id: str, status: str) -> list[DocumentOut]:
     cursor = db[COLL].find({"owner_id": to_obj_id(owner_id), "status": status})
 
@@ -97,97 +154,165 @@ async def get_documents_status(db: AsyncIOMotorDatabase, owner_id: str, status:
 
     return docs
 
+@traced
 async def list_my_documents(db: AsyncIOMotorDatabase, owner_id: str) -> list[DocumentOut]:
     cursor = db[COLL].find({"owner_id": to_obj_id(owner_id)}).sort("created_at", -1)
     return [_doc_to_out(d) async for d in cursor]
 
-async def update_draft(db: AsyncIOMotorDatabase, doc_id: str, owner_id: str, title: str | None, description: str | None) -> Optional[DocumentOut]:
-    now = datetime.utcnow()
-    update = {"$set": {"updated_at": now}}
-    if title is not None:
-        update["$set"]["title"] = title
-    if description is not None:
-        update["$set"]["description"] = description
-
-    doc = await db[COLL].find_one_and_update(
-        {"_id": to_obj_id(doc_id), "owner_id": to_obj_id(owner_id), "status": DocStatus.PENDING_REVIEW.value},
-        update,
-        return_document=True,
-    )
-    return _doc_to_out(doc) if doc else None
-
-async def submit_for_review(db: AsyncIOMotorDatabase, doc_id: str, owner_id: str) -> bool:
-    res = await db[COLL].update_one(
-        {"_id": to_obj_id(doc_id), "owner_id": to_obj_id(owner_id), "status": DocStatus.PENDING_REVIEW.value},
-        {"$set": {"status": DocStatus.PENDING_REVIEW.value, "updated_at": datetime.utcnow()}}
-    )
-    return res.modified_count == 1
-
+@traced
 async def list_pending_in_scope(db: AsyncIOMotorDatabase, employee_ids: Iterable[str]) -> list[DocumentOut]:
     cursor = db[COLL].find({
         "status": DocStatus.PENDING_REVIEW.value
     }).sort("created_at", 1)
     return [_doc_to_out(d) async for d in cursor]
 
-async def decide_review(db: AsyncIOMotorDatabase, doc_id: str, reviewer_id: str, decision: DocStatus, comment: str | None) -> Optional[DocumentOut]:
-    assert decision in (DocStatus.APPROVED, DocStatus.REJECTED)
-    now = datetime.utcnow()
-    doc = await db[COLL].find_one_and_update(
-        {"_id": to_obj_id(doc_id), "status": DocStatus.PENDING_REVIEW.value},
-        {"$set": {
-            "status": decision.value,
-            "review": {
-                "reviewer_id": to_obj_id(reviewer_id),
-                "decision": decision.value,
-                "comment": comment,
-                "decided_at": now
-            },
-            "updated_at": now
-        }},
-        return_document=True,
-    )
-    return _doc_to_out(doc) if doc else None
+# ---------- review leases ----------
+#
+# A manager claims pending documents instead of racing other managers on
+# the same list. A claim stamps {"lease": {"holder_id", "expires_at"}} on
+# the document; an expired lease counts as no lease, so abandoned work
+# goes back to the queue without a cleanup job.
+
+def _lease_free(now: datetime) -> dict:
+    return {"$or": [{"lease": None}, {"lease.expires_at": {"$lte": now}}]}
 
-async def add_attachment(db: AsyncIOMotorDatabase, doc_id: str, owner_id: str, file_id: str, filename: str, size: int, content_type: str) -> Optional[DocumentOut]:
-    # Only while DRAFT
+@traced
+async def claim_reviews(
+    db: AsyncIOMotorDatabase,
+    holder_id: str,
+    owner_ids: Iterable[str] | None,
+    count: int,
+    lease_seconds: int,
+) -> list[DocumentOut]:
+    """
+    Lease up to `count` of the oldest unleased PENDING_REVIEW documents.
+    owner_ids=None means every owner. Each claim is a single
+    find_one_and_update, so two reviewers can never get the same document.
+    """
     now = datetime.utcnow()
-    doc = await db[COLL].find_one_and_update(
-        {"_id": to_obj_id(doc_id), "owner_id": to_obj_id(owner_id), "status": DocStatus.PENDING_REVIEW.value},
-        {"$push": {"attachments": {"file_id": to_obj_id(file_id), "filename": filename, "size": size, "content_type": content_type}},
-         "$set": {"updated_at": now}},
-        return_document=True
+    query: dict = {"status": DocStatus.PENDING_REVIEW.value, **_lease_free(now)}
+    if owner_ids is not None:
+        query["owner_id"] = {"$in": [to_obj_id(o) for o in owner_ids]}
+    lease = {"holder_id": to_obj_id(holder_id), "expires_at": now + timedelta(seconds=lease_seconds)}
+
+    claimed: list[DocumentOut] = []
+    for _ in range(count):
+        doc = await db[COLL].find_one_and_update(
+            query,
+            {"$set": {"lease": lease}},
+            sort=[("created_at", 1)],
+            return_document=True,
+        )
+        if not doc:
+            break
+        claimed.append(_doc_to_out(doc))
+    return claimed
+
+@traced
+async def renew_leases(db: AsyncIOMotorDatabase, holder_id: str, doc_ids: Iterable[str], lease_seconds: int) -> list[str]:
+    """Extend the caller's live leases; returns the ids that were renewed (lost leases are left out)."""
+    now = datetime.utcnow()
+    ids = [to_obj_id(d) for d in doc_ids]
+    query = {
+        "_id": {"$in": ids},
+        "status": DocStatus.PENDING_REVIEW.value,
+        "lease.holder_id": to_obj_id(holder_id),
+        "lease.expires_at": {"$gt": now},
+    }
+    await db[COLL].update_many(query, {"$set": {"lease.expires_at": now + timedelta(seconds=lease_seconds)}})
+    cursor = db[COLL].find(query, {"_id": 1})
+    return [str(d["_id"]) async for d in cursor]
+
+@traced
+async def release_leases(db: AsyncIOMotorDatabase, holder_id: str, doc_ids: Iterable[str]) -> int:
+    """Hand documents back to the queue right away."""
+    res = await db[COLL].update_many(
+        {"_id": {"$in": [to_obj_id(d) for d in doc_ids]}, "lease.holder_id": to_obj_id(holder_id)},
+        {"$unset": {"lease": ""}},
     )
-    return _doc_to_out(doc) if doc else None
-
+    return res.modified_count
 
+@traced
 async def delete_document(db: AsyncIOMotorDatabase, doc_id: str) -> bool:
-    res = await db[COLL].delete_one({"_id": to_obj_id(doc_id)})
-    return res.deleted_count == 1
-
+    doc = await db[COLL].find_one(
+        {"_id": to_obj_id(doc_id)},
+        projection={"owner_id": 1, "manager_id": 1, "status": 1, "title": 1, "attachments.file_id": 1},
+    )
+    if not doc:
+        return False
+    # attachment files and revisions go later (app/cleanup.py). Tombstone
+    # first: if the delete then fails, the collector finds the document
+    # still there and leaves it alone.
+    await tombstones.add(db, "document", doc["_id"], {
+        "owner_id": doc.get("owner_id"),
+        "file_ids": [a.get("file_id") for a in doc.get("attachments") or []],
+    })
+    res = await db[COLL].delete_one({"_id": doc["_id"]})
+    if not res.deleted_count:
+        return False
+    typeahead_index.remove("document", doc_id)
+    await doc_counters.record_transition(db, str(doc["owner_id"]), doc.get("status"), None, doc_counters.manager_of(doc))
+    publish_doc("deleted", doc)
+    return True
+
+@traced
 async def list_all_documents(db: AsyncIOMotorDatabase) -> list[DocumentOut]:
     cursor = db[COLL].find().sort("created_at", -1)
     return [_doc_to_out(d) async for d in cursor]
 
-async def update_document(db, doc_id: str, fields: dict) -> DocumentDB | None:
-    now = datetime.now(timezone.utc)
+def encode_search_cursor(score: float, doc_id: str) -> str:
+    raw = json.dumps([score, doc_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
 
-    print(now)
+def decode_search_cursor(cursor: str) -> tuple[float, ObjectId]:
+    """Raises ValueError on anything that isn't a cursor we issued."""
+    try:
+        score, doc_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), ObjectId(doc_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
 
-    res = await db["documents"].find_one_and_update(
-        {"_id": to_obj_id(doc_id)},
-        {"$set": {**fields, "updated_at": now}},
-        return_document=True,
-    )
-    if not res:
-        return None
-
-    if "_id" in res and isinstance(res["_id"], ObjectId):
-        res["_id"] = str(res["_id"])
-
-    if "owner_id" in res and isinstance(res["owner_id"], ObjectId):
-        res["owner_id"] = str(res["owner_id"])
-
-    if "manager_id" in res and isinstance(res["manager_id"], ObjectId):
-        res["manager_id"] = str(res["manager_id"])
-
-    return DocumentDB(**res)
+@traced
+async def search_documents(
+    db: AsyncIOMotorDatabase,
+    q: str,
+    owner_ids: Iterable[str] | None = None,
+    status: str | None = None,
+    limit: int = 20,
+    cursor: str | None = None,
+) -> tuple[list[DocumentSearchHit], str | None]:
+    """
+    $text search over title/description, best matches first.
+    owner_ids=None means every owner; an empty list matches nothing.
+    Pages are keyed on (score, _id) rather than skip, so they stay stable
+    while documents change, but every page still scores and sorts all the
+    matches before the cursor filter: a page costs O(total matches).
+    """
+    match: dict = {"$text": {"$search": q}}
+    if owner_ids is not None:
+        match["owner_id"] = {"$in": [to_obj_id(o) for o in owner_ids]}
+    if status:
+        match["status"] = status
+
+    pipeline: list[dict] = [
+        {"$match": match},
+        {"$addFields": {"_score": {"$meta": "textScore"}}},
+    ]
+    if cursor:
+        after_score, after_id = decode_search_cursor(cursor)
+        pipeline.append({"$match": {"$or": [
+            {"_score": {"$lt": after_score}},
+            {"_score": after_score, "_id": {"$lt": after_id}},
+        ]}})
+    pipeline += [
+        {"$sort": {"_score": -1, "_id": -1}},
+        {"$limit": limit + 1},
+    ]
+
+    rows = await db[COLL].aggregate(pipeline).to_list(length=limit + 1)
+    hits = [
+        DocumentSearchHit(**_doc_to_out(d).model_dump(), score=d["_score"])
+        for d in rows[:limit]
+    ]
+    next_cursor = encode_search_cursor(hits[-1].score, hits[-1].id) if len(rows) > limit else None
+    return hits, next_cursor
@@ -0,0 +1,77 @@
+# backend/app/repos/import_jobs.py
+"""
+Progress records for long-running imports, so a client can poll
+GET /documents/import/{job_id} while its upload is still being processed.
+"""
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from ..slow_queries import traced
+from .utils import to_obj_id
+
+COLL = "import_jobs"
+
+# per-row errors kept on the job; the rest are only counted
+MAX_STORED_ERRORS = 1000
+
+
+def _job_out(doc: dict) -> dict:
+    out = {k: v for k, v in doc.items() if k != "_id"}
+    out["id"] = doc["_id"]
+    out["actor_id"] = str(doc["actor_id"]) if doc.get("actor_id") else None
+    return out
+
+
+@traced
+async def start_job(db: AsyncIOMotorDatabase, job_id: str, kind: str, actor_id: str) -> bool:
+    """False if a job with this id already exists."""
+    now = datetime.now(timezone.utc)
+    try:
+        await db[COLL].insert_one({
+            "_id": job_id,
+            "kind": kind,
+            "actor_id": to_obj_id(actor_id),
+            "status": "running",
+            "rows": 0,
+            "created": 0,
+            "failed": 0,
+            "errors": [],
+            "started_at": now,
+            "updated_at": now,
+            "finished_at": None,
+        })
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+@traced
+async def record_progress(db: AsyncIOMotorDatabase, job_id: str, created: int, errors: list[dict[str, Any]]) -> None:
+    """Add one chunk's results to the job."""
+    update: dict[str, Any] = {
+        "$inc": {"rows": created + len(errors), "created": created, "failed": len(errors)},
+        "$set": {"updated_at": datetime.now(timezone.utc)},
+    }
+    if errors:
+        update["$push"] = {"errors": {"$each": errors, "$slice": MAX_STORED_ERRORS}}
+    await db[COLL].update_one({"_id": job_id}, update)
+
+
+@traced
+async def finish_job(db: AsyncIOMotorDatabase, job_id: str, status: str, message: Optional[str] = None) -> Optional[dict]:
+    now = datetime.now(timezone.utc)
+    doc = await db[COLL].find_one_and_update(
+        {"_id": job_id},
+        {"$set": {"status": status, "message": message, "updated_at": now, "finished_at": now}},
+        return_document=True,
+    )
+    return _job_out(doc) if doc else None
+
+
+@traced
+async def get_job(db: AsyncIOMotorDatabase, job_id: str) -> Optional[dict]:
+    doc = await db[COLL].find_one({"_id": job_id})
+    return _job_out(doc) if doc else None
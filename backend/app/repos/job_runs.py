@@ -0,0 +1,52 @@
+# backend/app/repos/job_runs.py
+"""
+History of scheduled job runs (app/scheduler.py), one row per run:
+job name, worker, status, start time, duration and the job's result or
+error. Rows expire after KEEP_DAYS (TTL index on started_at).
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..slow_queries import traced
+
+COLL = "job_runs"
+
+KEEP_DAYS = 30
+
+
+def build_run(
+    job: str,
+    worker: str,
+    status: str,
+    started_at: datetime,
+    duration_ms: float,
+    result: Any = None,
+    error: Optional[str] = None,
+) -> dict:
+    return {
+        "job": job,
+        "worker": worker,
+        "status": status,
+        "started_at": started_at,
+        "duration_ms": duration_ms,
+        "result": result if isinstance(result, (dict, int, float, str, type(None))) else str(result),
+        "error": error,
+    }
+
+
+@traced
+async def record(db: AsyncIOMotorDatabase, row: dict) -> None:
+    """Never raises; history is nice to have, the job already ran."""
+    try:
+        await db[COLL].insert_one(dict(row))
+    except Exception as e:
+        print(f"Could not record run of {row.get('job')}:", e)
+
+
+@traced
+async def recent(db: AsyncIOMotorDatabase, job: Optional[str] = None, limit: int = 50) -> list[dict]:
+    query = {"job": job} if job else {}
+    cursor = db[COLL].find(query, {"_id": 0}).sort("started_at", -1).limit(limit)
+    return await cursor.to_list(length=limit)
@@ -0,0 +1,155 @@
+# backend/app/repos/revisions.py
+"""
+Document history as forward deltas, one row per version in
+document_revisions, keyed by (doc_id, version).
+
+A row holds only the tracked fields that changed in that version.
+Versions 1, N+1, 2N+1, ... (N = REVISION_SNAPSHOT_EVERY) also carry a
+full snapshot, so rebuilding any version reads at most N rows in one
+indexed range query: the nearest snapshot at or below it, then the
+deltas after it.
+
+Version 1 (the document as created) is recorded lazily from the
+pre-image of the first change, so creating or importing documents costs
+nothing extra and documents that never change have no rows at all.
+
+Rows are written right after the document update (there is no
+transaction); a failed write is logged and the document change stands.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
+
+from ..config import settings
+from ..slow_queries import traced
+from .utils import to_obj_id
+
+COLL = "document_revisions"
+
+TRACKED = ("title", "description", "status", "attachments", "review")
+
+
+def tracked(doc: dict[str, Any]) -> dict[str, Any]:
+    return {f: doc.get(f) for f in TRACKED}
+
+
+def changed_fields(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    return {f: after.get(f) for f in TRACKED if after.get(f) != before.get(f)}
+
+
+def is_snapshot_version(version: int) -> bool:
+    return (version - 1) % settings.REVISION_SNAPSHOT_EVERY == 0
+
+
+def _row(doc_id: ObjectId, version: int, state: dict, changes: dict, action: str, actor_id: Any, at: Optional[datetime]) -> dict:
+    row = {
+        "doc_id": doc_id,
+        "version": version,
+        "action": action,
+        "actor_id": to_obj_id(actor_id) if actor_id else None,
+        "at": at or datetime.utcnow(),
+        "changes": changes,
+    }
+    if is_snapshot_version(version):
+        row["snapshot"] = state
+    return row
+
+
+def revision_rows(
+    after: dict[str, Any],
+    changes: dict[str, Any],
+    action: str,
+    actor_id: Optional[str],
+    before: Optional[dict[str, Any]] = None,
+) -> list[dict]:
+    """
+    Rows for one successful change. `after` is the document as written
+    (with its new version); `before` is only needed on the first change,
+    to record version 1.
+    """
+    version = after.get("version", 1)
+    rows = []
+    if version == 2 and before is not None:
+        initial = tracked(before)
+        rows.append(_row(after["_id"], 1, initial, initial, "create", before.get("owner_id"), before.get("created_at")))
+    rows.append(_row(after["_id"], version, tracked(after), changes, action, actor_id, after.get("updated_at")))
+    return rows
+
+
+@traced
+async def save(db: AsyncIOMotorDatabase, rows: list[dict]) -> None:
+    """Never raises; a duplicate (doc_id, version) just means it was recorded already."""
+    if not rows:
+        return
+    try:
+        await db[COLL].insert_many(rows, ordered=False)
+    except BulkWriteError as e:
+        errors = [err for err in e.details.get("writeErrors", []) if err.get("code") != 11000]
+        if errors:
+            print("Revision write failed:", errors[0].get("errmsg"))
+    except Exception as e:
+        print("Revision write failed:", e)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_plain(v) for v in value]
+    return value
+
+
+@traced
+async def list_history(
+    db: AsyncIOMotorDatabase,
+    doc_id: str,
+    before_version: Optional[int] = None,
+    limit: int = 20,
+) -> tuple[list[dict], Optional[int]]:
+    """Newest first. Pass the returned cursor back as before_version for the next page."""
+    query: dict[str, Any] = {"doc_id": to_obj_id(doc_id)}
+    if before_version is not None:
+        query["version"] = {"$lt": before_version}
+    cursor = db[COLL].find(query, {"snapshot": 0}).sort("version", -1).limit(limit + 1)
+    rows = await cursor.to_list(length=limit + 1)
+    items = [
+        {
+            "version": r["version"],
+            "action": r.get("action"),
+            "actor_id": _plain(r.get("actor_id")),
+            "at": r.get("at"),
+            "changes": _plain(r.get("changes") or {}),
+        }
+        for r in rows[:limit]
+    ]
+    next_before = items[-1]["version"] if len(rows) > limit else None
+    return items, next_before
+
+
+@traced
+async def get_version(db: AsyncIOMotorDatabase, doc_id: str, version: int) -> Optional[dict[str, Any]]:
+    """The tracked fields as they were at `version`, or None if that version isn't recorded."""
+    window = settings.REVISION_SNAPSHOT_EVERY
+    rows = await db[COLL].find(
+        {"doc_id": to_obj_id(doc_id), "version": {"$gte": max(1, version - window + 1), "$lte": version}},
+    ).sort("version", 1).to_list(length=window)
+    if not rows or rows[-1]["version"] != version:
+        return None
+
+    base = max((i for i, r in enumerate(rows) if "snapshot" in r), default=None)
+    if base is None:
+        return None
+    for prev, row in zip(rows[base:], rows[base + 1:]):
+        if row["version"] != prev["version"] + 1:
+            return None     # a gap: some change wasn't recorded
+
+    state = dict(rows[base]["snapshot"])
+    for row in rows[base + 1:]:
+        state.update(row["changes"])
+    return {"version": version, **_plain(state)}
+
@@ -0,0 +1,120 @@
+# backend/app/repos/tombstones.py
+"""
+Deleted users and documents waiting for their cascade.
+
+A delete writes one of these, then removes the record itself right away
+(so every existing query stops seeing it):
+
+    {"kind": "user" | "document", "ref_id": <id>, "state": "pending",
+     "payload": {...what the collector needs...}, "progress": {...},
+     "created_at", "claimed_until", "finished_at"}
+
+app/cleanup.py claims pending tombstones (a short lease, so two workers
+never work the same one), cascades in batches and marks them done. A
+tombstone whose record is still there (the delete failed) is dropped
+without a cascade.
+Finished tombstones expire after a week (TTL index on finished_at).
+"""
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..slow_queries import traced
+
+COLL = "tombstones"
+
+PENDING = "pending"
+DONE = "done"
+
+KEEP_DONE_SECONDS = 7 * 24 * 3600
+
+
+def build_tombstone(kind: str, ref_id: ObjectId, payload: dict[str, Any] | None = None) -> dict:
+    return {
+        "kind": kind,
+        "ref_id": ref_id,
+        "state": PENDING,
+        "payload": payload or {},
+        "progress": {},
+        "steps_done": [],
+        "created_at": datetime.utcnow(),
+        "claimed_until": None,
+        "finished_at": None,
+    }
+
+
+@traced
+async def add(db: AsyncIOMotorDatabase, kind: str, ref_id: ObjectId, payload: dict[str, Any] | None = None) -> None:
+    await db[COLL].insert_one(build_tombstone(kind, ref_id, payload))
+
+
+@traced
+async def claim(db: AsyncIOMotorDatabase, lease_seconds: int) -> Optional[dict]:
+    """Oldest pending tombstone nobody else is working on, leased to the caller."""
+    now = datetime.utcnow()
+    return await db[COLL].find_one_and_update(
+        {"state": PENDING, "$or": [{"claimed_until": None}, {"claimed_until": {"$lte": now}}]},
+        {"$set": {"claimed_until": now + timedelta(seconds=lease_seconds)}},
+        sort=[("created_at", 1)],
+        return_document=True,
+    )
+
+
+@traced
+async def record_progress(
+    db: AsyncIOMotorDatabase,
+    tombstone_id: ObjectId,
+    counts: dict[str, int],
+    lease_seconds: int,
+    step_done: Optional[str] = None,
+) -> None:
+    """Add to the progress counters and extend the lease; optionally mark a one-off step done."""
+    update: dict[str, Any] = {"$set": {"claimed_until": datetime.utcnow() + timedelta(seconds=lease_seconds)}}
+    inc = {f"progress.{k}": v for k, v in counts.items() if v}
+    if inc:
+        update["$inc"] = inc
+    if step_done:
+        update["$addToSet"] = {"steps_done": step_done}
+    await db[COLL].update_one({"_id": tombstone_id}, update)
+
+
+@traced
+async def finish(db: AsyncIOMotorDatabase, tombstone_id: ObjectId) -> None:
+    await db[COLL].update_one(
+        {"_id": tombstone_id},
+        {"$set": {"state": DONE, "finished_at": datetime.utcnow(), "claimed_until": None}},
+    )
+
+
+@traced
+async def backlog(db: AsyncIOMotorDatabase) -> dict[str, Any]:
+    rows = await db[COLL].aggregate([
+        {"$group": {
+            "_id": {"kind": "$kind", "state": "$state"},
+            "n": {"$sum": 1},
+            "oldest": {"$min": "$created_at"},
+        }},
+    ]).to_list(length=None)
+
+    out: dict[str, Any] = {"pending": {}, "done_last_7_days": {}, "oldest_pending_at": None}
+    for r in rows:
+        bucket = "pending" if r["_id"]["state"] == PENDING else "done_last_7_days"
+        out[bucket][r["_id"]["kind"]] = r["n"]
+        if r["_id"]["state"] == PENDING and (out["oldest_pending_at"] is None or r["oldest"] < out["oldest_pending_at"]):
+            out["oldest_pending_at"] = r["oldest"]
+
+    cursor = db[COLL].find({"state": PENDING}).sort("created_at", 1).limit(20)
+    out["pending_items"] = [
+        {
+            "id": str(t["_id"]),
+            "kind": t["kind"],
+            "ref_id": str(t["ref_id"]),
+            "created_at": t.get("created_at"),
+            "in_progress": bool(t.get("claimed_until") and t["claimed_until"] > datetime.utcnow()),
+            "progress": t.get("progress") or {},
+        }
+        async for t in cursor
+    ]
+    return out
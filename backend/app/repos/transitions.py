@@ -0,0 +1,359 @@
+# backend/app/repos/transitions.py
+"""
+Every DocStatus change (and owner edits, which are only allowed in some
+states) goes through here as ONE find_one_and_update on _id.
+
+The guards (owner, allowed from-states, expected version, nobody else's
+live review lease) are evaluated inside an update pipeline: each field
+is set with $cond, so a failed guard leaves the document untouched. The
+call returns the pre-image, and the same guards evaluated on it in
+Python tell us exactly which one failed. Because the pre-image is the
+document as the update saw it, that answer never races another writer,
+and no second read is needed.
+
+Documents carry a `version` that every successful change bumps; callers
+may pass the version they last saw to refuse lost updates. Documents
+written before versions existed count as version 1.
+
+    submit   REJECTED        -> PENDING_REVIEW   owner
+    approve  PENDING_REVIEW  -> APPROVED         reviewer (lease-aware)
+    reject   PENDING_REVIEW  -> REJECTED         reviewer (lease-aware)
+    edit     PENDING_REVIEW | REJECTED (no status change)   owner
+    attach   PENDING_REVIEW (no status change)              owner
+
+Bulk decisions (decide_many) can't use find_one_and_update; they put the
+same guard expressions in each UpdateOne's filter (guard_filter) and
+report the same failure reasons.
+"""
+from datetime import datetime
+from typing import Any, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument, UpdateOne
+
+from ..models import DocStatus, DocumentOut
+from ..slow_queries import traced
+from ..typeahead import index as typeahead_index
+from ..events import publish_doc, status_event_type
+from .utils import to_obj_id
+from . import doc_counters, revisions
+from .documents import COLL, NEXT_VERSION, _doc_to_out
+
+# failure reasons
+NOT_FOUND = "not_found"
+NOT_OWNER = "not_owner"
+WRONG_STATE = "wrong_state"
+STALE_VERSION = "stale_version"
+CLAIMED = "claimed_by_other"
+
+PENDING = DocStatus.PENDING_REVIEW.value
+APPROVED = DocStatus.APPROVED.value
+REJECTED = DocStatus.REJECTED.value
+
+# action -> (allowed from-states, resulting status or None for "unchanged")
+TRANSITIONS: dict[str, tuple[tuple[str, ...], Optional[str]]] = {
+    "submit": ((REJECTED,), PENDING),
+    "approve": ((PENDING,), APPROVED),
+    "reject": ((PENDING,), REJECTED),
+    "edit": ((PENDING, REJECTED), None),
+    "attach": ((PENDING,), None),
+}
+
+DECISIONS = {DocStatus.APPROVED: "approve", DocStatus.REJECTED: "reject"}
+
+
+class TransitionResult:
+    __slots__ = ("doc", "reason", "status", "version")
+
+    def __init__(self, doc: Optional[DocumentOut], reason: Optional[str], status: Optional[str] = None, version: Optional[int] = None):
+        self.doc = doc              # the updated document on success
+        self.reason = reason        # None on success, else one of the constants above
+        self.status = status        # status the document had when the update ran
+        self.version = version      # version the document had when the update ran
+
+    @property
+    def ok(self) -> bool:
+        return self.reason is None
+
+
+def _guards(
+    from_states: tuple[str, ...],
+    owner_id: Optional[str],
+    expected_version: Optional[int],
+    reviewer_id: Optional[str],
+    now: datetime,
+) -> list[dict]:
+    """The aggregation-expression form of _failed_guard."""
+    conds: list[dict] = [{"$in": ["$status", list(from_states)]}]
+    if owner_id is not None:
+        conds.append({"$eq": ["$owner_id", to_obj_id(owner_id)]})
+    if expected_version is not None:
+        conds.append({"$eq": [{"$ifNull": ["$version", 1]}, expected_version]})
+    if reviewer_id is not None:
+        conds.append({"$or": [
+            {"$eq": [{"$ifNull": ["$lease", None]}, None]},
+            {"$lte": ["$lease.expires_at", now]},
+            {"$eq": ["$lease.holder_id", to_obj_id(reviewer_id)]},
+        ]})
+    return conds
+
+
+def guard_filter(
+    action: str,
+    now: datetime,
+    *,
+    owner_id: Optional[str] = None,
+    reviewer_id: Optional[str] = None,
+    expected_version: Optional[int] = None,
+) -> dict:
+    """The guards of `action` as a query filter, for writes that can't go through apply()."""
+    from_states, _ = TRANSITIONS[action]
+    return {"$expr": {"$and": _guards(from_states, owner_id, expected_version, reviewer_id, now)}}
+
+
+def _stage(changes: dict[str, Any], appends: dict[str, list], allowed: Optional[dict], drop_lease: bool) -> dict[str, Any]:
+    """
+    The $set stage of a transition. With `allowed`, every field keeps its
+    current value unless the guards pass; without, the filter has already
+    checked them.
+    """
+    def guarded(value: Any, name: str) -> Any:
+        return {"$cond": [allowed, value, f"${name}"]} if allowed is not None else value
+
+    # $literal so user text like "$title" is never read as a field path
+    stage = {name: guarded({"$literal": value}, name) for name, value in changes.items()}
+    for name, items in appends.items():
+        stage[name] = guarded({"$concatArrays": [{"$ifNull": [f"${name}", []]}, {"$literal": items}]}, name)
+    stage["version"] = guarded(NEXT_VERSION, "version")
+    if drop_lease:
+        stage["lease"] = guarded("$$REMOVE", "lease")
+    return stage
+
+
+def _failed_guard(
+    before: dict,
+    from_states: tuple[str, ...],
+    owner_id: Optional[str],
+    expected_version: Optional[int],
+    reviewer_id: Optional[str],
+    now: datetime,
+) -> Optional[str]:
+    """Same checks as _guards, on the pre-image; keep the two in step."""
+    if owner_id is not None and before.get("owner_id") != to_obj_id(owner_id):
+        return NOT_OWNER
+    if before.get("status") not in from_states:
+        return WRONG_STATE
+    if expected_version is not None and before.get("version", 1) != expected_version:
+        return STALE_VERSION
+    if reviewer_id is not None:
+        lease = before.get("lease")
+        if lease and lease.get("expires_at") and lease["expires_at"] > now and lease.get("holder_id") != to_obj_id(reviewer_id):
+            return CLAIMED
+    return None
+
+
+@traced
+async def apply(
+    db: AsyncIOMotorDatabase,
+    action: str,
+    doc_id: str,
+    *,
+    owner_id: Optional[str] = None,
+    reviewer_id: Optional[str] = None,
+    expected_version: Optional[int] = None,
+    fields: Optional[dict[str, Any]] = None,
+    appends: Optional[dict[str, list]] = None,
+) -> TransitionResult:
+    """
+    Run one entry of TRANSITIONS as a single conditional write.
+    `fields` are extra values to set along with the status (title,
+    review, ...), `appends` items to add to array fields (attachments).
+    Reviewer actions drop the review lease.
+    """
+    from_states, to_status = TRANSITIONS[action]
+    try:
+        oid = to_obj_id(doc_id)
+    except Exception:
+        return TransitionResult(None, NOT_FOUND)
+
+    now = datetime.utcnow()
+    changes: dict[str, Any] = {**(fields or {}), "updated_at": now}
+    if to_status is not None:
+        changes["status"] = to_status
+
+    appends = appends or {}
+    allowed = {"$and": _guards(from_states, owner_id, expected_version, reviewer_id, now)}
+    before = await db[COLL].find_one_and_update(
+        {"_id": oid},
+        [{"$set": _stage(changes, appends, allowed, reviewer_id is not None)}],
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        return TransitionResult(None, NOT_FOUND)
+
+    reason = _failed_guard(before, from_states, owner_id, expected_version, reviewer_id, now)
+    if reason:
+        return TransitionResult(None, reason, before.get("status"), before.get("version", 1))
+
+    after = {**before, **changes, "version": before.get("version", 1) + 1}
+    for name, items in appends.items():
+        after[name] = [*(before.get(name) or []), *items]
+    if reviewer_id is not None:
+        after.pop("lease", None)
+    await revisions.save(db, revisions.revision_rows(
+        after, revisions.changed_fields(before, after), action, owner_id or reviewer_id, before,
+    ))
+
+    if to_status is None:
+        typeahead_index.add_document(after)
+        publish_doc("updated", after)
+    else:
+        typeahead_index.update("document", str(oid), status=to_status)
+        await doc_counters.record_transition(
+            db, str(after["owner_id"]), before.get("status"), to_status, doc_counters.manager_of(after),
+        )
+        publish_doc(status_event_type(to_status), after)
+    return TransitionResult(_doc_to_out(after), None, to_status or after.get("status"), after["version"])
+
+
+async def submit(db: AsyncIOMotorDatabase, doc_id: str, owner_id: str, expected_version: Optional[int] = None) -> TransitionResult:
+    return await apply(db, "submit", doc_id, owner_id=owner_id, expected_version=expected_version)
+
+
+async def edit(
+    db: AsyncIOMotorDatabase,
+    doc_id: str,
+    owner_id: str,
+    title: Optional[str],
+    description: Optional[str],
+    expected_version: Optional[int] = None,
+) -> TransitionResult:
+    fields = {}
+    if title is not None:
+        fields["title"] = title
+    if description is not None:
+        fields["description"] = description
+    return await apply(db, "edit", doc_id, owner_id=owner_id, expected_version=expected_version, fields=fields)
+
+
+async def decide(
+    db: AsyncIOMotorDatabase,
+    doc_id: str,
+    reviewer_id: str,
+    decision: DocStatus,
+    comment: Optional[str],
+    expected_version: Optional[int] = None,
+) -> TransitionResult:
+    action = DECISIONS[decision]
+    review = {
+        "reviewer_id": to_obj_id(reviewer_id),
+        "decision": decision.value,
+        "comment": comment,
+        "decided_at": datetime.utcnow(),
+    }
+    return await apply(db, action, doc_id, reviewer_id=reviewer_id, expected_version=expected_version, fields={"review": review})
+
+
+async def attach(
+    db: AsyncIOMotorDatabase,
+    doc_id: str,
+    owner_id: str,
+    file_id: str,
+    filename: str,
+    size: int,
+    content_type: str,
+) -> TransitionResult:
+    attachment = {"file_id": to_obj_id(file_id), "filename": filename, "size": size, "content_type": content_type}
+    return await apply(db, "attach", doc_id, owner_id=owner_id, appends={"attachments": [attachment]})
+
+
+@traced
+async def decide_many(
+    db: AsyncIOMotorDatabase,
+    reviewer_id: str,
+    items: list[tuple[str, DocStatus, Optional[str]]],
+) -> list[dict]:
+    """
+    decide() for many documents in one bulk_write. Each UpdateOne is
+    filtered on the approve/reject guards and tags the review with a
+    batch id, so one follow-up find tells which updates won; the rest
+    are given the reason apply() would have. Returns one
+    {"doc_id", "ok", "status" | "error"} per item, in order.
+    """
+    now = datetime.utcnow()
+    batch_id = ObjectId()
+    reviewer_oid = to_obj_id(reviewer_id)
+
+    outcomes: list[dict] = []
+    ops: list[UpdateOne] = []
+    seen: set[ObjectId] = set()
+    for doc_id, decision, comment in items:
+        outcome = {"doc_id": doc_id, "ok": False}
+        outcomes.append(outcome)
+        if decision not in DECISIONS:
+            outcome["error"] = "invalid_decision"
+            continue
+        if decision == DocStatus.REJECTED and not (comment and comment.strip()):
+            outcome["error"] = "comment_required"     # same rule as the single reject route
+            continue
+        try:
+            oid = to_obj_id(doc_id)
+        except Exception:
+            outcome["error"] = "invalid_id"
+            continue
+        if oid in seen:
+            outcome["error"] = "duplicate"
+            continue
+        seen.add(oid)
+        action = DECISIONS[decision]
+        outcome["_oid"], outcome["_action"] = oid, action
+        changes = {
+            "status": TRANSITIONS[action][1],
+            "review": {
+                "reviewer_id": reviewer_oid,
+                "decision": decision.value,
+                "comment": comment,
+                "decided_at": now,
+                "batch_id": batch_id,
+            },
+            "updated_at": now,
+        }
+        ops.append(UpdateOne(
+            {"_id": oid, **guard_filter(action, now, reviewer_id=reviewer_id)},
+            [{"$set": _stage(changes, {}, None, drop_lease=True)}],
+        ))
+
+    if ops:
+        await db[COLL].bulk_write(ops, ordered=False)
+
+    cursor = db[COLL].find({"_id": {"$in": list(seen)}})
+    current = {d["_id"]: d async for d in cursor}
+
+    counted = []
+    history: list[dict] = []
+    for outcome in outcomes:
+        oid, action = outcome.pop("_oid", None), outcome.pop("_action", None)
+        if oid is None:
+            continue
+        doc = current.get(oid)
+        if doc is None:
+            outcome["error"] = NOT_FOUND
+        elif (doc.get("review") or {}).get("batch_id") == batch_id:
+            outcome["ok"] = True
+            outcome["status"] = doc["status"]
+            typeahead_index.update("document", outcome["doc_id"], status=doc["status"])
+            counted.append((doc["owner_id"], PENDING, doc["status"], doc_counters.manager_of(doc)))
+            publish_doc(status_event_type(doc["status"]), doc)
+            # only needed on a document's first change, when it is exactly this
+            first = {**doc, "status": PENDING, "review": None}
+            history += revisions.revision_rows(
+                doc, {"status": doc["status"], "review": doc["review"]}, action, reviewer_id, first,
+            )
+        else:
+            from_states, _ = TRANSITIONS[action]
+            outcome["error"] = _failed_guard(doc, from_states, None, None, reviewer_id, now) or WRONG_STATE
+
+    await doc_counters.record_transitions(db, counted)
+    await revisions.save(db, history)
+    return outcomes
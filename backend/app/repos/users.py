@@ -1,14 +1,34 @@
 # backend/app/repos/users.py
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import os
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import BulkWriteError
 from datetime import datetime, timezone
 import bcrypt
 
 from ..models import UserCreate, UserDB, UserOut, Role
+from ..slow_queries import traced
+from ..typeahead import index as typeahead_index
+from ..cache import cache, invalidate
 from .utils import to_obj_id, from_obj_id
+from . import tombstones
 
 COLL = "users"
+DOCS_COLL = "documents"
+
+EMPLOYEES_TTL = 300     # seconds; cached team lists, dropped on every manager_id / role change
+
+def employees_key(manager_id) -> str:
+    return f"employees:{manager_id}"
+
+async def forget_employees(*manager_ids) -> None:
+    """Call after changing who reports to these managers."""
+    keys = [employees_key(m) for m in manager_ids if m]
+    if keys:
+        await invalidate(*keys)
 
 def _doc_to_out(doc) -> UserOut:
     return UserOut(
@@ -20,33 +40,73 @@ def _doc_to_out(doc) -> UserOut:
         updated_at=doc.get("updated_at"),
     )
 
-async def ensure_indexes(db: AsyncIOMotorDatabase):
-    await db[COLL].create_index("email", unique=True)
-    await db[COLL].create_index("role")
-
 def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
-async def create_user(db: AsyncIOMotorDatabase, payload: UserCreate, role_override: Optional[Role] = None) -> UserOut:
-    now = datetime.utcnow()
-    doc = {
+_hash_pool: ThreadPoolExecutor | None = None
+
+async def hash_passwords(passwords: list[str]) -> list[str]:
+    """bcrypt-hash a batch of passwords on a shared thread pool (bcrypt releases the GIL)."""
+    global _hash_pool
+    if not passwords:
+        return []
+    if _hash_pool is None:
+        _hash_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="bcrypt")
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(*(loop.run_in_executor(_hash_pool, hash_password, pw) for pw in passwords))
+
+def build_user_doc(payload: UserCreate, password_hash: str, role_override: Optional[Role] = None, now: datetime | None = None) -> dict:
+    now = now or datetime.utcnow()
+    role = role_override or payload.role
+    return {
         "email": payload.email.lower().strip(),
-        "password_hash": hash_password(payload.password),
-        "role": (role_override or payload.role).value if isinstance((role_override or payload.role), Role) else (role_override or payload.role),
+        "password_hash": password_hash,
+        "role": role.value if isinstance(role, Role) else role,
         "profile": payload.profile or {},
         "created_at": now,
         "updated_at": now,
         "security_answer": payload.security_answer,
     }
+
+@traced
+async def create_user(db: AsyncIOMotorDatabase, payload: UserCreate, role_override: Optional[Role] = None) -> UserOut:
+    doc = build_user_doc(payload, hash_password(payload.password), role_override)
     res = await db[COLL].insert_one(doc)
     doc["_id"] = res.inserted_id
+    typeahead_index.add_user(doc)
     return _doc_to_out(doc)
 
+@traced
+async def create_users(db: AsyncIOMotorDatabase, docs: list[dict]) -> tuple[list[UserOut], dict[int, str]]:
+    """
+    Unordered insert_many of docs built with build_user_doc.
+    Returns the created users and {index in docs: error} for the rows that
+    failed (duplicate emails come back as "duplicate").
+    """
+    if not docs:
+        return [], {}
+
+    failed: dict[int, str] = {}
+    try:
+        await db[COLL].insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get("writeErrors", []):
+            failed[err["index"]] = "duplicate" if err.get("code") == 11000 else err.get("errmsg", "write error")
+
+    created = []
+    for i, d in enumerate(docs):
+        if i not in failed:
+            typeahead_index.add_user(d)
+            created.append(_doc_to_out(d))
+    return created, failed
+
+@traced
 async def get_user_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[UserDB]:
     doc = await db[COLL].find_one({"email": email.lower().strip()})
     if not doc: return None
     return str(doc["_id"])
 
+@traced
 async def find_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[UserDB]:
     doc = await db[COLL].find_one({"email": email.lower().strip()})
     if not doc:
@@ -61,6 +121,7 @@ async def find_by_email(db: AsyncIOMotorDatabase, email: str) -> Optional[UserDB
         updated_at=doc.get("updated_at"),
     )
 
+@traced
 async def find_by_security_answer(db: AsyncIOMotorDatabase, email: str, security_answer: str) -> Optional[UserDB]:
     doc = await db[COLL].find_one({"email": email.lower().strip(), "security_answer": security_answer})
     if not doc: return False
@@ -68,6 +129,7 @@ async def find_by_security_answer(db: AsyncIOMotorDatabase, email: str, security
 
 MAX_HISTORY = 5  # keep last 5 hashes
 
+@traced
 async def update_password(
     db: AsyncIOMotorDatabase,
     user_id: str,
@@ -115,20 +177,67 @@ async def update_password(
                 "password_hash": new_hash,
                 "password_history": history,
                 "last_password_change_at": now,
+                "updated_at": now,
             }
         }
     )
 
     return True, None
 
+@traced
 async def get_user(db: AsyncIOMotorDatabase, user_id: str) -> Optional[UserOut]:
     doc = await db[COLL].find_one({"_id": to_obj_id(user_id)})
     return _doc_to_out(doc) if doc else None
 
+@traced
+async def employee_ids_for_manager(db: AsyncIOMotorDatabase, manager_id: str) -> list[str]:
+    """Cached (see app/cache.py): every manager listing and review scope check needs it."""
+    async def load() -> list[str]:
+        cursor = db[COLL].find({"role": Role.EMPLOYEE.value, "manager_id": to_obj_id(manager_id)}, {"_id": 1})
+        return [str(d["_id"]) async for d in cursor]
+
+    return await cache.get_or_load(employees_key(manager_id), load, EMPLOYEES_TTL)
+
+@traced
+async def assign_manager(db: AsyncIOMotorDatabase, employee_id: str, manager_id: str) -> bool:
+    before = await db[COLL].find_one_and_update(
+        {"_id": to_obj_id(employee_id)},
+        {"$set": {"manager_id": to_obj_id(manager_id), "updated_at": datetime.utcnow()}},
+        projection={"manager_id": 1},
+    )
+    if not before:
+        return False
+    # the status counters read the manager off each document
+    await db[DOCS_COLL].update_many({"owner_id": to_obj_id(employee_id)}, {"$set": {"manager_id": to_obj_id(manager_id)}})
+    await forget_employees(before.get("manager_id"), manager_id)
+    return True
+
+@traced
 async def delete_user(db: AsyncIOMotorDatabase, user_id: str) -> bool:
-    res = await db[COLL].delete_one({"_id": to_obj_id(user_id)})
-    return res.deleted_count == 1
+    """
+    Removes the account now; their documents, attachments, counters and
+    employees' manager links are cleaned up later by app/cleanup.py.
+    """
+    user = await db[COLL].find_one(
+        {"_id": to_obj_id(user_id)},
+        projection={"manager_id": 1, "role": 1, "email": 1},
+    )
+    if not user:
+        return False
+    # tombstone first, so a failed delete can't leave the cascade undone
+    await tombstones.add(db, "user", user["_id"], {
+        "manager_id": user.get("manager_id"),
+        "role": user.get("role"),
+        "email": user.get("email"),
+    })
+    res = await db[COLL].delete_one({"_id": user["_id"]})
+    if not res.deleted_count:
+        return False
+    typeahead_index.remove("user", user_id)
+    await forget_employees(user.get("manager_id"), user_id)
+    return True
 
+@traced
 async def get_all_users(db):
     try:
         cursor = db.users.find({})
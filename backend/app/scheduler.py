@@ -0,0 +1,287 @@
+# backend/app/scheduler.py
+"""
+Asyncio scheduler for recurring maintenance (the jobs live in app/jobs.py).
+
+A job runs either every `interval` seconds or on a 5-field cron schedule
+("minute hour day-of-month month day-of-week", UTC; supports *, */n,
+a-b, a-b/n and comma lists). Each job gets:
+
+  jitter           random 0..jitter seconds added to every start, so
+                   workers started together don't hit Mongo together
+  max_concurrency  runs allowed at once; a tick that finds the job at
+                   its limit is recorded as "skipped"
+  timeout          a run taking longer is cancelled and recorded as
+                   "timeout"
+  singleton        only run on the worker holding the "scheduler" leader
+                   lease (app/locks.py); other workers skip it silently,
+                   and a leader that loses the lease cancels its runs
+
+Every run (ok / error / timeout / skipped) is written to job_runs with
+its duration. Each job is one coroutine that sleeps until it is due, so
+an idle scheduler costs nothing; stop() cancels the loops and gives
+in-flight runs a grace period before cancelling them too.
+"""
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from .locks import Leader
+from .repos import job_runs
+
+JobFunc = Callable[[AsyncIOMotorDatabase], Awaitable[Any]]
+
+
+# ---------- cron ----------
+
+class CronSpec:
+    _RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron needs 5 fields: {expr!r}")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse(f, lo, hi) for f, (lo, hi) in zip(fields, self._RANGES)
+        )
+        self.weekdays = frozenset(d % 7 for d in weekdays)     # 0 and 7 are both Sunday
+        # like cron: when both day fields are restricted, either may match
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse(field: str, lo: int, hi: int) -> frozenset[int]:
+        values: set[int] = set()
+        for part in field.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                start, end = lo, hi
+            elif "-" in rng:
+                start, end = (int(x) for x in rng.split("-", 1))
+            else:
+                start = int(rng)
+                end = hi if step else start
+            n = int(step) if step else 1
+            if not (lo <= start <= end <= hi) or n < 1:
+                raise ValueError(f"bad cron field {field!r}")
+            values.update(range(start, end + 1, n))
+        return frozenset(values)
+
+    def _day_matches(self, dt: datetime) -> bool:
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.weekdays     # cron: 0 = Sunday
+        if self._any_day:
+            return dow
+        if self._any_weekday:
+            return dom
+        return dom or dow
+
+    def next_after(self, after: datetime) -> datetime:
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"cron {self.expr!r} never fires")
+
+
+# ---------- jobs ----------
+
+class Job:
+    def __init__(
+        self,
+        name: str,
+        func: JobFunc,
+        *,
+        interval: Optional[float] = None,
+        cron: Optional[str] = None,
+        jitter: float = 0,
+        max_concurrency: int = 1,
+        timeout: Optional[float] = None,
+        run_at_start: bool = False,
+        singleton: bool = True,
+    ):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"job {name}: give exactly one of interval or cron")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSpec(cron) if cron else None
+        self.jitter = jitter
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.run_at_start = run_at_start
+        self.singleton = singleton
+
+        self.running = 0
+        self.next_run_at: Optional[datetime] = None
+        self.last: Optional[dict[str, Any]] = None
+        self._wake = asyncio.Event()
+        self._runs: set[asyncio.Task] = set()
+
+    def next_due(self, now: datetime) -> datetime:
+        base = now + timedelta(seconds=self.interval) if self.interval is not None else self.cron.next_after(now)
+        return base + timedelta(seconds=random.uniform(0, self.jitter)) if self.jitter else base
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "schedule": f"every {self.interval:g}s" if self.interval is not None else f"cron {self.cron.expr}",
+            "jitter_s": self.jitter,
+            "max_concurrency": self.max_concurrency,
+            "timeout_s": self.timeout,
+            "singleton": self.singleton,
+            "running": self.running,
+            "next_run_at": self.next_run_at,
+            "last": self.last,
+        }
+
+
+class Scheduler:
+    def __init__(self):
+        self.jobs: dict[str, Job] = {}
+        self.worker_id = f"{random.getrandbits(32):08x}"
+        self._db: Optional[AsyncIOMotorDatabase] = None
+        self._loops: list[asyncio.Task] = []
+        self._records: set[asyncio.Task] = set()   # "skipped" rows still being written
+        self.leader: Optional[Leader] = None
+
+    def add(self, job: Job) -> Job:
+        if job.name in self.jobs:
+            raise ValueError(f"job {job.name} already registered")
+        self.jobs[job.name] = job
+        if self._db is not None:
+            self._loops.append(asyncio.create_task(self._loop(job)))
+        return job
+
+    @property
+    def started(self) -> bool:
+        return self._db is not None
+
+    def start(self, db: AsyncIOMotorDatabase, leader: Optional[Leader] = None) -> None:
+        """Without a leader every job runs on this worker."""
+        if self._db is not None:
+            return
+        self._db = db
+        self.leader = leader
+        if leader is not None:
+            leader.on_lost.append(self._cancel_singletons)
+        self._loops = [asyncio.create_task(self._loop(job)) for job in self.jobs.values()]
+
+    def run_soon(self, name: str) -> bool:
+        """
+        Start a job now instead of at its next slot. False if it is
+        unknown, the scheduler isn't running, the job is a singleton and
+        another worker leads, or it is already at its concurrency limit
+        (the run in progress will do the work).
+        """
+        job = self.jobs.get(name)
+        if job is None or self._db is None or job.running >= job.max_concurrency or not self._may_run(job):
+            return False
+        job._wake.set()
+        return True
+
+    async def _loop(self, job: Job) -> None:
+        first = True
+        while True:
+            now = datetime.now(timezone.utc)
+            job.next_run_at = now if (first and job.run_at_start) else job.next_due(now)
+            first = False
+            delay = (job.next_run_at - now).total_seconds()
+            try:
+                await asyncio.wait_for(job._wake.wait(), timeout=max(0.0, delay))
+            except asyncio.TimeoutError:
+                pass
+            job._wake.clear()
+            self._launch(job)
+
+    def _may_run(self, job: Job) -> bool:
+        return not job.singleton or self.leader is None or self.leader.is_leader
+
+    def _cancel_singletons(self) -> None:
+        for job in self.jobs.values():
+            if job.singleton:
+                for task in job._runs:
+                    task.cancel()
+
+    def _launch(self, job: Job) -> None:
+        if not self._may_run(job):
+            return
+        if job.running >= job.max_concurrency:
+            record = asyncio.create_task(self._record(self._db, job, "skipped", datetime.now(timezone.utc), 0.0, error="already running"))
+            # the loop only keeps weak references to tasks
+            self._records.add(record)
+            record.add_done_callback(self._records.discard)
+            return
+        job.running += 1
+        task = asyncio.create_task(self._run(job))
+        job._runs.add(task)
+        # a done callback, not _run's finally: a task cancelled before its first step never runs that
+        task.add_done_callback(lambda t: self._finished(job, t))
+
+    @staticmethod
+    def _finished(job: Job, task: asyncio.Task) -> None:
+        job._runs.discard(task)
+        job.running -= 1
+
+    async def _run(self, job: Job) -> None:
+        db = self._db
+        started = datetime.now(timezone.utc)
+        t0 = time.perf_counter()
+        status, result, error = "ok", None, None
+        try:
+            result = await asyncio.wait_for(job.func(db), timeout=job.timeout)
+        except asyncio.TimeoutError:
+            status, error = "timeout", f"cancelled after {job.timeout}s"
+        except asyncio.CancelledError:
+            status, error = "cancelled", "scheduler stopped or leadership lost"
+            raise
+        except Exception as e:
+            status, error = "error", str(e)
+            print(f"Job {job.name} failed:", e)
+        finally:
+            duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+            # shielded so a run cancelled at shutdown still leaves its record
+            await asyncio.shield(self._record(db, job, status, started, duration_ms, result, error))
+
+    async def _record(self, db: AsyncIOMotorDatabase, job: Job, status: str, started: datetime, duration_ms: float, result: Any = None, error: Optional[str] = None) -> None:
+        row = job_runs.build_run(job.name, self.worker_id, status, started, duration_ms, result, error)
+        job.last = {k: row[k] for k in ("status", "started_at", "duration_ms", "error")}
+        await job_runs.record(db, row)
+
+    async def stop(self, grace_seconds: float = 10) -> None:
+        """Cancel the loops, let in-flight runs finish for up to grace_seconds, then cancel them."""
+        for task in self._loops:
+            task.cancel()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+
+        running = [t for job in self.jobs.values() for t in job._runs] + list(self._records)
+        if running:
+            done, pending = await asyncio.wait(running, timeout=grace_seconds)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._db = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self.leader is None or self.leader.is_leader
+
+    def describe(self) -> list[dict[str, Any]]:
+        return [job.describe() for job in self.jobs.values()]
+
+
+scheduler = Scheduler()
@@ -0,0 +1,37 @@
+# backend/app/search/routes.py
+from fastapi import APIRouter, Depends
+from typing import Optional
+
+from ..api import ok, fail, ApiEnvelope
+from ..deps import require_manager_or_admin
+from ..models import Role, UserDB
+from ..typeahead import index
+
+router = APIRouter()
+
+
+@router.get("/typeahead", response_model=ApiEnvelope)
+async def typeahead(
+    q: str,
+    kind: Optional[str] = None,     # "user" | "document"
+    role: Optional[Role] = None,    # only users with this role
+    limit: int = 10,
+    _user: UserDB = Depends(require_manager_or_admin),
+):
+    """
+    Manager/Admin: instant prefix/substring matches on user emails and names and
+    document titles, served from this worker's in-memory index.
+    """
+    if kind not in (None, "user", "document"):
+        return fail("kind must be 'user' or 'document'")
+    if not (1 <= limit <= 50):
+        return fail("limit must be between 1 and 50")
+    if not index.ready:
+        return fail("Search index is still loading")
+
+    return ok(index.search(q, kind=kind, role=role.value if role else None, limit=limit))
+
+
+@router.get("/typeahead/stats", response_model=ApiEnvelope)
+async def typeahead_stats(_user: UserDB = Depends(require_manager_or_admin)):
+    return ok(index.stats())
@@ -0,0 +1,110 @@
+# backend/app/seed.py
+"""
+Demo account seeding.
+
+Runs once per database: the first worker to claim the marker in
+`app_meta` does the work, every other worker (or a re-run) skips it.
+Passwords are hashed in parallel (bcrypt releases the GIL) and users plus
+their USER_CREATE audit events go in with one insert_many each.
+
+    python -m app.seed
+"""
+import asyncio
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import DuplicateKeyError
+
+from .models import UserCreate, Role
+from .repos import users as users_repo
+from .repos import audit_logs as logs_repo
+
+META_COLL = "app_meta"
+SEED_MARKER = "seed:users"
+
+SEED_USERS = [
+    # (role, email, password, first_name, last_name, security_answer)
+    (Role.ADMIN, "admin1@example.com", "admin1!", "Admin", "One", "admin1"),
+    (Role.ADMIN, "admin2@example.com", "admin2!", "Admin", "Two", "admin2"),
+    (Role.MANAGER, "manager1@example.com", "manager1!", "Manager", "One", "manager1"),
+    (Role.MANAGER, "manager2@example.com", "manager2!", "Manager", "Two", "manager2"),
+    (Role.MANAGER, "manager3@example.com", "manager3!", "Manager", "Three", "manager3"),
+    (Role.EMPLOYEE, "employee1@example.com", "employee1!", "Employee", "One", "employee1"),
+    (Role.EMPLOYEE, "employee2@example.com", "employee2!", "Employee", "Two", "employee2"),
+    (Role.EMPLOYEE, "employee3@example.com", "employee3!", "Employee", "Three", "employee3"),
+    (Role.EMPLOYEE, "employee4@example.com", "employee4!", "Employee", "Four", "employee4"),
+    (Role.EMPLOYEE, "employee5@example.com", "employee5!", "Employee", "Five", "employee5"),
+]
+
+
+async def _claim(db: AsyncIOMotorDatabase) -> bool:
+    try:
+        await db[META_COLL].insert_one({"_id": SEED_MARKER, "started_at": datetime.now(timezone.utc)})
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def seed_users(db: AsyncIOMotorDatabase) -> int:
+    """Seed the demo accounts into an empty users collection. Returns how many were created."""
+    if await db[users_repo.COLL].count_documents({}, limit=1):
+        return 0
+    if not await _claim(db):
+        return 0
+
+    try:
+        payloads = [
+            UserCreate(
+                email=email,
+                password=password,
+                role=role,
+                profile={"first_name": first_name, "last_name": last_name},
+                security_answer=answer,
+            )
+            for role, email, password, first_name, last_name, answer in SEED_USERS
+        ]
+        hashes = await users_repo.hash_passwords([p.password for p in payloads])
+
+        now = datetime.utcnow()
+        docs = [users_repo.build_user_doc(p, h, now=now) for p, h in zip(payloads, hashes)]
+        created, failed = await users_repo.create_users(db, docs)
+
+        for i in failed:
+            print(f"Seed user already exists: {docs[i]['email']}")
+
+        await logs_repo.log_events(db, [
+            logs_repo.build_event(
+                user.id,
+                "USER_CREATE",
+                "USER",
+                user.id,
+                {f"seed_{user.role.value.lower()}": True, "email": user.email},
+            )
+            for user in created
+        ])
+        for user in created:
+            print(f"Seeded {user.role.value.lower()} user: {user.email}")
+
+        await db[META_COLL].update_one(
+            {"_id": SEED_MARKER},
+            {"$set": {"finished_at": datetime.now(timezone.utc), "created": len(created)}},
+        )
+        return len(created)
+    except Exception:
+        # release the marker so the next start can retry
+        await db[META_COLL].delete_one({"_id": SEED_MARKER})
+        raise
+
+
+async def run_in_background(db: AsyncIOMotorDatabase) -> None:
+    try:
+        await seed_users(db)
+    except Exception as e:
+        print("Seeding failed:", e)
+
+
+if __name__ == "__main__":
+    from .db import get_db
+
+    created = asyncio.run(seed_users(get_db()))
+    print(f"Seeded {created} users")
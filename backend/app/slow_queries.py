@@ -0,0 +1,231 @@
+# backend/app/slow_queries.py
+"""
+Opt-in slow-operation recorder built on pymongo command monitoring.
+
+Enable with SLOW_QUERY_MS=<threshold>. Every find / aggregate / update
+(including findAndModify) slower than the threshold is recorded with its
+collection, redacted filter shape, duration and the repo function that
+issued it. The first time a shape is seen we run explain("executionStats")
+on a side thread and flag plans that fall back to a COLLSCAN.
+"""
+import contextvars
+import functools
+import json
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+from pymongo import MongoClient, monitoring
+
+from .config import settings
+
+WATCHED_COMMANDS = {"find", "aggregate", "update", "findAndModify"}
+# session / routing fields that explain() does not accept
+_EXPLAIN_DROP_KEYS = {"lsid", "txnNumber", "$clusterTime", "$db", "$readPreference", "readConcern", "writeConcern"}
+
+MAX_RECORDS = 500
+
+_caller: contextvars.ContextVar[str | None] = contextvars.ContextVar("slow_query_caller", default=None)
+
+_records: deque[dict[str, Any]] = deque(maxlen=MAX_RECORDS)
+_seen_shapes: set[str] = set()
+_lock = threading.Lock()
+
+_explain_pool: ThreadPoolExecutor | None = None
+_explain_client: MongoClient | None = None
+
+
+def enabled() -> bool:
+    return settings.SLOW_QUERY_MS > 0
+
+
+def traced(fn):
+    """
+    Marks a repo coroutine as the caller of the Mongo commands it issues.
+    Motor copies contextvars into its executor threads, so the listener can
+    read the name back. Returns fn untouched when the recorder is off.
+    """
+    if not enabled():
+        return fn
+
+    name = f"{fn.__module__.removeprefix('app.')}.{fn.__qualname__}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        token = _caller.set(name)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _caller.reset(token)
+
+    return wrapper
+
+
+async def tag_request(request, call_next):
+    """
+    HTTP middleware: commands issued straight from a route handler (not via
+    a @traced repo function) are attributed to the request path instead.
+    """
+    token = _caller.set(f"{request.method} {request.url.path}")
+    try:
+        return await call_next(request)
+    finally:
+        _caller.reset(token)
+
+
+def redact(value: Any) -> Any:
+    """Keep keys and operators, replace every literal with '?'."""
+    if isinstance(value, dict):
+        return {k: redact(v) for k, v in value.items()}
+    if isinstance(value, list) and value and all(isinstance(v, dict) for v in value):
+        return [redact(v) for v in value]
+    return "?"
+
+
+def command_shape(command_name: str, command: dict) -> dict[str, Any]:
+    if command_name == "find":
+        shape = {"filter": redact(command.get("filter", {}))}
+        if command.get("sort"):
+            shape["sort"] = dict(command["sort"])
+        return shape
+    if command_name == "aggregate":
+        return {"pipeline": [redact(stage) for stage in command.get("pipeline", [])]}
+    if command_name == "update":
+        return {"filter": [redact(u.get("q", {})) for u in command.get("updates", [])]}
+    if command_name == "findAndModify":
+        shape = {"filter": redact(command.get("query", {}))}
+        if command.get("sort"):
+            shape["sort"] = dict(command["sort"])
+        return shape
+    return {}
+
+
+def recent() -> list[dict[str, Any]]:
+    with _lock:
+        return list(_records)
+
+
+def _find_collscan(node: Any) -> bool:
+    if isinstance(node, dict):
+        if node.get("stage") == "COLLSCAN":
+            return True
+        return any(_find_collscan(v) for v in node.values())
+    if isinstance(node, list):
+        return any(_find_collscan(v) for v in node)
+    return False
+
+
+def _find_key(node: Any, key: str) -> Any:
+    if isinstance(node, dict):
+        if key in node:
+            return node[key]
+        for v in node.values():
+            found = _find_key(v, key)
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for v in node:
+            found = _find_key(v, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _explain(database: str, command: dict, record: dict[str, Any]) -> None:
+    global _explain_client
+    try:
+        if _explain_client is None:
+            # separate sync client without listeners so explains are never recorded themselves
+            _explain_client = MongoClient(settings.MONGO_URI)
+        cmd = {k: v for k, v in command.items() if k not in _EXPLAIN_DROP_KEYS}
+        plan = _explain_client[database].command({"explain": cmd, "verbosity": "executionStats"})
+
+        winning = _find_key(plan, "winningPlan") or _find_key(plan, "queryPlan")
+        stats = _find_key(plan, "executionStats") or {}
+        with _lock:
+            record["collscan"] = _find_collscan(winning)
+            record["docs_examined"] = stats.get("totalDocsExamined")
+            record["keys_examined"] = stats.get("totalKeysExamined")
+            record["n_returned"] = stats.get("nReturned")
+
+        if record["collscan"]:
+            print(
+                f"[slow-query] COLLSCAN {record['collection']}.{record['command']} "
+                f"{json.dumps(record['shape'], default=str)} "
+                f"docs_examined={record['docs_examined']} caller={record['caller']}"
+            )
+    except Exception as e:
+        print("[slow-query] explain failed:", e)
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    def __init__(self, threshold_ms: int, explain: bool = True):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self._pending: dict[tuple[Any, int], tuple[dict, str | None]] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in WATCHED_COMMANDS:
+            return
+        with _lock:
+            self._pending[(event.connection_id, event.request_id)] = (event.command, _caller.get())
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        if event.command_name not in WATCHED_COMMANDS:
+            return
+        with _lock:
+            entry = self._pending.pop((event.connection_id, event.request_id), None)
+        if entry is None:
+            return
+
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        command, caller = entry
+        collection = command.get(event.command_name)
+        shape = command_shape(event.command_name, command)
+        shape_key = json.dumps([event.database_name, collection, event.command_name, shape], sort_keys=True, default=str)
+
+        record = {
+            "at": datetime.now(timezone.utc),
+            "collection": collection,
+            "command": event.command_name,
+            "shape": shape,
+            "duration_ms": round(duration_ms, 2),
+            "caller": caller or "unknown",
+            "collscan": None,
+        }
+        with _lock:
+            _records.append(record)
+            new_shape = shape_key not in _seen_shapes
+            _seen_shapes.add(shape_key)
+
+        print(
+            f"[slow-query] {record['duration_ms']}ms {collection}.{event.command_name} "
+            f"{json.dumps(shape, default=str)} caller={record['caller']}"
+        )
+
+        if self.explain and new_shape:
+            _get_explain_pool().submit(_explain, event.database_name, command, record)
+
+
+def _get_explain_pool() -> ThreadPoolExecutor:
+    global _explain_pool
+    if _explain_pool is None:
+        _explain_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slow-query-explain")
+    return _explain_pool
+
+
+def listeners() -> list[monitoring.CommandListener]:
+    if not enabled():
+        return []
+    return [SlowQueryListener(settings.SLOW_QUERY_MS, explain=settings.SLOW_QUERY_EXPLAIN)]
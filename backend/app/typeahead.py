@@ -0,0 +1,327 @@
+# backend/app/typeahead.py
+"""
+In-process typeahead over user emails/names and document titles.
+
+Matches are collected in rank order and the search stops as soon as it
+has enough: label prefix (sorted label list), then word prefix (sorted
+token list), then substring (trigram postings, 3+ characters). The index is
+filled by a streaming scan at startup and kept current by the write
+paths in repos/users.py and repos/documents.py. Each worker holds its
+own copy; a write on another worker shows up after that worker's next
+rebuild.
+"""
+import asyncio
+import bisect
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# upper bound on entries looked at per phase, keeps rare matches on big indexes cheap
+MAX_CANDIDATES = 2000
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _tokens(text: str) -> set[str]:
+    # words plus whole space-separated chunks, so "employee1@ex" prefix-matches an email
+    return set(_TOKEN_RE.findall(text)) | set(text.split())
+
+
+@dataclass
+class Entry:
+    kind: str                 # "user" | "document"
+    id: str
+    label: str                # what the UI shows (email / title)
+    text: str                 # normalized searchable text
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    def to_out(self) -> dict[str, Any]:
+        return {"kind": self.kind, "id": self.id, "label": self.label, **self.extra}
+
+
+def _entry_bytes(key: str, e: Entry) -> int:
+    size = sys.getsizeof
+    total = size(key) + size(e) + size(e.id) + size(e.label) + size(e.text) + size(e.extra)
+    total += sum(size(v) for v in e.extra.values())
+    return total + size((e.text, key))    # its row in the sorted label list
+
+
+class TypeaheadIndex:
+    def __init__(self):
+        self._entries: dict[str, Entry] = {}
+        self._by_gram: dict[str, set[str]] = {}
+        self._by_token: dict[str, set[str]] = {}
+        self._tokens: list[str] = []      # sorted, for word-prefix lookups
+        self._texts: list[tuple[str, str]] = []  # sorted (text, key), for label-prefix lookups
+        self._journal: list[tuple[str, tuple, dict]] | None = None  # writes seen during a rebuild
+        self._loading = False             # bulk load: sorted lists are built once in finish_load()
+        self._bytes = 0                   # running size of entries, strings and posting sets
+        self.ready = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ---------- writes ----------
+
+    def add(self, kind: str, id: str, label: str, search_text: str, **extra: Any) -> None:
+        if self._journal is not None:
+            self._journal.append(("add", (kind, id, label, search_text), extra))
+        key = f"{kind}:{id}"
+        self._discard(key)
+
+        text = _normalize(search_text)
+        entry = self._entries[key] = Entry(kind, id, label, text, extra)
+        self._bytes += _entry_bytes(key, entry)
+        if not self._loading:
+            bisect.insort(self._texts, (text, key))
+
+        for g in _trigrams(text):
+            self._post(self._by_gram, g, key)
+        for t in _tokens(text):
+            if self._post(self._by_token, t, key) and not self._loading:
+                bisect.insort(self._tokens, t)
+
+    def _post(self, postings: dict[str, set[str]], term: str, key: str) -> bool:
+        """Add key to term's posting set; True if the term is new."""
+        keys = postings.get(term)
+        new = keys is None
+        if new:
+            keys = postings[term] = set()
+        if self._loading:
+            keys.add(key)     # sized once in finish_load()
+            return new
+        before = 0 if new else sys.getsizeof(keys)
+        keys.add(key)
+        self._bytes += sys.getsizeof(keys) - before + (sys.getsizeof(term) if new else 0)
+        return new
+
+    def _unpost(self, postings: dict[str, set[str]], term: str, key: str) -> bool:
+        """Remove key from term's posting set; True if the term is gone."""
+        keys = postings.get(term)
+        if keys is None:
+            return False
+        keys.discard(key)
+        if keys:
+            return False
+        del postings[term]
+        if not self._loading:
+            self._bytes -= sys.getsizeof(term) + sys.getsizeof(keys)
+        return True
+
+    def finish_load(self) -> None:
+        """End a bulk load (see rebuild): sort the lookup lists in one go."""
+        self._texts = sorted((e.text, key) for key, e in self._entries.items())
+        self._tokens = sorted(self._by_token)
+        size = sys.getsizeof
+        for postings in (self._by_gram, self._by_token):
+            self._bytes += sum(size(term) + size(keys) for term, keys in postings.items())
+        self._loading = False
+
+    def remove(self, kind: str, id: str) -> None:
+        if self._journal is not None:
+            self._journal.append(("remove", (kind, id), {}))
+        self._discard(f"{kind}:{id}")
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= _entry_bytes(key, entry)
+        if not self._loading:
+            i = bisect.bisect_left(self._texts, (entry.text, key))
+            if i < len(self._texts) and self._texts[i] == (entry.text, key):
+                self._texts.pop(i)
+        for g in _trigrams(entry.text):
+            self._unpost(self._by_gram, g, key)
+        for t in _tokens(entry.text):
+            if self._unpost(self._by_token, t, key) and not self._loading:
+                i = bisect.bisect_left(self._tokens, t)
+                if i < len(self._tokens) and self._tokens[i] == t:
+                    self._tokens.pop(i)
+
+    def update(self, kind: str, id: str, **extra: Any) -> None:
+        """Change display-only fields (e.g. a user's role) without re-tokenizing."""
+        if self._journal is not None:
+            self._journal.append(("update", (kind, id), extra))
+        key = f"{kind}:{id}"
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._bytes -= _entry_bytes(key, entry)
+            entry.extra.update(extra)
+            self._bytes += _entry_bytes(key, entry)
+
+    def add_user(self, doc: dict) -> None:
+        profile = doc.get("profile") or {}
+        name = " ".join(filter(None, [profile.get("first_name"), profile.get("last_name")]))
+        self.add(
+            "user",
+            str(doc["_id"]),
+            doc.get("email", ""),
+            f"{doc.get('email', '')} {name}",
+            name=name,
+            role=doc.get("role"),
+        )
+
+    def add_document(self, doc: dict) -> None:
+        self.add(
+            "document",
+            str(doc["_id"]),
+            doc.get("title") or "",
+            doc.get("title") or "",
+            owner_id=str(doc["owner_id"]) if doc.get("owner_id") else None,
+            status=doc.get("status"),
+        )
+
+    # ---------- reads ----------
+
+    def search(self, q: str, kind: str | None = None, role: str | None = None, limit: int = 10) -> list[dict[str, Any]]:
+        q = _normalize(q)
+        if not q or limit <= 0:
+            return []
+
+        found: list[Entry] = []
+        seen: set[str] = set()
+
+        def take(key: str) -> bool:
+            """Add key if it passes the filters; True once we have enough."""
+            if key in seen:
+                return False
+            seen.add(key)
+            entry = self._entries[key]
+            if (kind and entry.kind != kind) or (role and entry.extra.get("role") != role):
+                return False
+            found.append(entry)
+            return len(found) >= limit
+
+        # 1) whole text starts with q
+        i = bisect.bisect_left(self._texts, (q, ""))
+        for text, key in self._texts[i:i + MAX_CANDIDATES]:
+            if not text.startswith(q) or take(key):
+                break
+        if len(found) >= limit:
+            return [e.to_out() for e in found]
+
+        # 2) some word starts with q
+        scanned = 0
+        i = bisect.bisect_left(self._tokens, q)
+        while i < len(self._tokens) and self._tokens[i].startswith(q) and scanned < MAX_CANDIDATES:
+            for key in self._by_token[self._tokens[i]]:
+                scanned += 1
+                if take(key):
+                    return [e.to_out() for e in found]
+            i += 1
+
+        # 3) substring anywhere: walk the rarest trigram's postings and verify
+        if len(q) >= 3:
+            postings = [self._by_gram.get(g) for g in _trigrams(q)]
+            if all(postings):
+                scanned = 0
+                for key in min(postings, key=len):
+                    scanned += 1
+                    if scanned > MAX_CANDIDATES:
+                        break
+                    if key not in seen and q in self._entries[key].text and take(key):
+                        break
+
+        return [e.to_out() for e in found]
+
+    # ---------- stats ----------
+
+    def memory_bytes(self) -> int:
+        """
+        Approximate footprint of the index structures: the containers
+        themselves plus a running total kept by the writes. Key strings
+        are shared between the entry map and the posting sets, so they
+        are counted once.
+        """
+        size = sys.getsizeof
+        return (
+            size(self._entries) + size(self._by_gram) + size(self._by_token)
+            + size(self._tokens) + size(self._texts) + self._bytes
+        )
+
+    def stats(self) -> dict[str, Any]:
+        kinds: dict[str, int] = {}
+        for entry in self._entries.values():
+            kinds[entry.kind] = kinds.get(entry.kind, 0) + 1
+        return {
+            "ready": self.ready,
+            "entries": kinds,
+            "trigrams": len(self._by_gram),
+            "tokens": len(self._tokens),
+            "memory_bytes": self.memory_bytes(),
+        }
+
+
+index = TypeaheadIndex()
+
+_build_task: asyncio.Task | None = None
+# the startup build and the rebuild_typeahead job share index._journal: one at a time
+_rebuild_lock = asyncio.Lock()
+
+
+async def rebuild(db, batch_size: int = 1000) -> None:
+    """
+    Streaming scan of users and documents into a fresh index, then swap it
+    in. The sorted lists are built once at the end rather than kept sorted
+    per entry, and the loop yields between batches. A rebuild that starts
+    while another is running waits for it.
+    """
+    async with _rebuild_lock:
+        await _rebuild(db, batch_size)
+
+
+async def _rebuild(db, batch_size: int) -> None:
+    from .repos import users as users_repo
+    from .repos import documents as docs_repo
+
+    fresh = TypeaheadIndex()
+    fresh._loading = True
+    index._journal = []
+    try:
+        scans = [
+            (users_repo.COLL, {"email": 1, "profile": 1, "role": 1}, fresh.add_user),
+            (docs_repo.COLL, {"title": 1, "owner_id": 1, "status": 1}, fresh.add_document),
+        ]
+        for coll, projection, add in scans:
+            n = 0
+            async for doc in db[coll].find({}, projection, batch_size=batch_size):
+                add(doc)
+                n += 1
+                if n % batch_size == 0:
+                    await asyncio.sleep(0)    # let requests in between batches
+        fresh.finish_load()
+
+        # writes that raced the scan are newer than what it read: replay them on top
+        for op, args, kwargs in index._journal:
+            getattr(fresh, op)(*args, **kwargs)
+    finally:
+        index._journal = None
+
+    fresh.ready = True
+    # swap in place so modules holding `index` see the new data
+    index.__dict__.update(fresh.__dict__)
+
+
+def start_background_build(db) -> asyncio.Task:
+    global _build_task
+
+    async def run():
+        try:
+            await rebuild(db)
+            print(f"Typeahead index ready: {index.stats()['entries']}")
+        except Exception as e:
+            print("Typeahead index build failed:", e)
+
+    if _build_task is None or _build_task.done():
+        _build_task = asyncio.create_task(run())
+    return _build_task
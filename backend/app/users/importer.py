@@ -0,0 +1,162 @@
+# backend/app/users/importer.py
+"""
+Employee account validation (shared by POST /users/employee) and the
+bulk import behind POST /users/import.
+
+Rows are validated as they stream in, then handled a chunk at a time:
+passwords hashed in parallel on the users repo's bcrypt pool, one
+unordered insert_many for the accounts and one for their audit events.
+"""
+import re
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..imports import Record, batched
+from ..models import Role, UserCreate
+from ..repos import users as users_repo
+from ..repos import audit_logs as logs_repo
+
+EMAIL_PATTERN = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+CHUNK_SIZE = 500
+MAX_ROWS = 20_000
+
+
+def employee_input_error(
+    email: str,
+    password: str,
+    first_name: str,
+    last_name: str,
+    security_answer: str,
+) -> Optional[str]:
+    """The create_employee rules; returns what is wrong, or None if the input is fine."""
+    if not EMAIL_PATTERN.fullmatch(email):
+        return "invalid email"
+    if not (7 <= len(password) <= 20):
+        return "password must be 7-20 characters"
+    if not any(ch.isdigit() for ch in password):
+        return "password needs a digit"
+    if not re.search(r"[^A-Za-z0-9]", password):
+        return "password needs a special character"
+    if len(first_name) == 0 or len(first_name) > 15:
+        return "first_name must be 1-15 characters"
+    if len(last_name) == 0 or len(last_name) > 15:
+        return "last_name must be 1-15 characters"
+    if len(security_answer) == 0 or len(security_answer) > 15:
+        return "security_answer must be 1-15 characters"
+    return None
+
+
+def _field(record: dict[str, Any], name: str) -> str:
+    value = record.get(name)
+    return "" if value is None else str(value).strip()
+
+
+async def import_employees(
+    db: AsyncIOMotorDatabase,
+    records: AsyncIterator[Record],
+    actor_id: str,
+    chunk_size: int = CHUNK_SIZE,
+    max_rows: int = MAX_ROWS,
+) -> dict[str, Any]:
+    """
+    Create an EMPLOYEE account per record (columns: email, password,
+    first_name, last_name, security_answer, optional manager_id).
+    Returns a per-row report; duplicate emails, in the database or
+    within the upload, are reported as "duplicate email", and a
+    manager_id that is not a MANAGER's as "unknown_manager".
+    """
+    started = time.perf_counter()
+    report: list[dict[str, Any]] = []
+    created = 0
+    truncated = False
+
+    async for batch in batched(records, chunk_size):
+        rows: list[tuple[int, str, UserCreate, Optional[ObjectId]]] = []
+        for row, record, error in batch:
+            if row > max_rows:
+                truncated = True
+                break
+            if error:
+                report.append({"row": row, "ok": False, "error": error})
+                continue
+
+            email = _field(record, "email")
+            password = "" if record.get("password") is None else str(record["password"])
+            first_name = _field(record, "first_name")
+            last_name = _field(record, "last_name")
+            security_answer = _field(record, "security_answer")
+
+            error = employee_input_error(email, password, first_name, last_name, security_answer)
+            manager_oid = None
+            if not error and _field(record, "manager_id"):
+                if not ObjectId.is_valid(_field(record, "manager_id")):
+                    error = "invalid manager_id"
+                else:
+                    manager_oid = ObjectId(_field(record, "manager_id"))
+            if error:
+                report.append({"row": row, "email": email, "ok": False, "error": error})
+                continue
+
+            rows.append((row, email, UserCreate(
+                email=email,
+                password=password,
+                profile={"first_name": first_name, "last_name": last_name},
+                security_answer=security_answer,
+            ), manager_oid))
+
+        # one lookup for every manager the chunk names
+        wanted = list({m for _, _, _, m in rows if m})
+        if wanted:
+            cursor = db[users_repo.COLL].find({"_id": {"$in": wanted}, "role": Role.MANAGER.value}, {"_id": 1})
+            managers = {u["_id"] async for u in cursor}
+            for row, email, _, manager_oid in rows:
+                if manager_oid and manager_oid not in managers:
+                    report.append({"row": row, "email": email, "ok": False, "error": "unknown_manager"})
+            rows = [r for r in rows if not r[3] or r[3] in managers]
+
+        if rows:
+            hashes = await users_repo.hash_passwords([p.password for _, _, p, _ in rows])
+            now = datetime.utcnow()
+            docs = []
+            for (_, _, payload, manager_oid), password_hash in zip(rows, hashes):
+                doc = users_repo.build_user_doc(payload, password_hash, Role.EMPLOYEE, now=now)
+                if manager_oid:
+                    doc["manager_id"] = manager_oid
+                docs.append(doc)
+
+            _, failed = await users_repo.create_users(db, docs)
+
+            events = []
+            for i, (row, email, _, manager_oid) in enumerate(rows):
+                if i in failed:
+                    error = "duplicate email" if failed[i] == "duplicate" else failed[i]
+                    report.append({"row": row, "email": email, "ok": False, "error": error})
+                    continue
+                user_id = str(docs[i]["_id"])
+                report.append({"row": row, "email": email, "ok": True, "id": user_id})
+                events.append(logs_repo.build_event(
+                    actor_id, "USER_CREATE", "USER", user_id,
+                    {"role": Role.EMPLOYEE.value, "manager_id": str(manager_oid) if manager_oid else None, "import": True},
+                ))
+            created += len(events)
+            await logs_repo.log_events(db, events)
+            await users_repo.forget_employees(*{m for _, _, _, m in rows if m})
+
+        if truncated:
+            break
+
+    elapsed = time.perf_counter() - started
+    report.sort(key=lambda r: r["row"])
+    return {
+        "rows": report,
+        "created": created,
+        "failed": len(report) - created,
+        "truncated": truncated,
+        "seconds": round(elapsed, 3),
+        "rows_per_s": round(len(report) / elapsed, 1) if elapsed > 0 else None,
+    }
@@ -1,5 +1,5 @@
 # backend/app/users/routes.py
-from fastapi import APIRouter, Depends, HTTPException, status, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Request, Response
 from pydantic import BaseModel
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo.errors import DuplicateKeyError
@@ -10,6 +10,12 @@ from ..models import Role, UserCreate, UserOut
 from ..repos import users as users_repo
 from ..repos import audit_logs as logs_repo
 from ..api import ok, fail, ApiEnvelope
+from ..typeahead import index as typeahead_index
+from .. import etags
+from .. import cleanup
+from .. import reads
+from ..imports import detect_format, iter_records
+from .importer import employee_input_error, import_employees
 
 from bson import ObjectId
 from datetime import datetime, timedelta, timezone
@@ -106,9 +112,15 @@ def stringify_object_ids(obj: Any) -> Any:
 
 @router.get("/get-managers", response_model=ApiEnvelope)
 async def get_managers(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     try:
+        etag = await etags.list_etag(db["users"], {"role": "MANAGER"}, "managers")
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
+
         cursor = db["users"].find({"role": "MANAGER"})
 
         managers = []
@@ -119,6 +131,7 @@ async def get_managers(
             clean_doc = stringify_object_ids(doc)
             managers.append(clean_doc)
 
+        etags.tag(response, etag)
         return ok(managers)
     except Exception as e:
         print("Error listing managers:", e)
@@ -127,9 +140,15 @@ async def get_managers(
     
 @router.get("/get-employees", response_model=ApiEnvelope)
 async def get_employees(
+    request: Request,
+    response: Response,
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     try:
+        etag = await etags.list_etag(db["users"], {"role": "EMPLOYEE"}, "employees")
+        if etags.matches(request, etag):
+            return etags.not_modified(etag)
+
         cursor = db["users"].find({"role": "EMPLOYEE"})
 
         employees = []
@@ -147,6 +166,7 @@ async def get_employees(
 
             employees.append(doc)
 
+        etags.tag(response, etag)
         return ok(employees)
     except Exception as e:
         print("Error listing employees:", e)
@@ -174,6 +194,9 @@ async def change_role(
         )
         if not res:
             return fail("Role update failed")
+        # team lists only hold employees
+        await users_repo.forget_employees(res.get("manager_id"), user_id)
+        typeahead_index.update("user", user_id, role=body.role.value)
         await logs_repo.log_event(db, _admin.id, "ROLE_ASSIGN", "USER", user_id, {"new_role": body.role.value})
         return ok(await users_repo.get_user(db, user_id))
     except Exception:
@@ -190,10 +213,7 @@ async def assign_manager(
 ):
     try:
         # update employee doc
-        await db["users"].update_one(
-            {"_id": ObjectId(body.employee_id)},
-            {"$set": {"manager_id": ObjectId(body.manager_id)}}
-        )
+        await users_repo.assign_manager(db, body.employee_id, body.manager_id)
         return ok()
     except Exception as e:
         print("Error assigning manager:", e)
@@ -211,6 +231,7 @@ async def delete_user(
         ok_flag = await users_repo.delete_user(db, user_id)
         if not ok_flag:
             return fail("User not found or already deleted")
+        cleanup.nudge()
         await logs_repo.log_event(db, _admin.id, "USER_DELETE", "USER", user_id)
         return ok()
     except Exception:
@@ -222,29 +243,11 @@ async def create_employee(
     db: AsyncIOMotorDatabase = Depends(get_db),
 ):
     try:
-        # 1) Email format
-        email_pattern = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
-        if not re.fullmatch(email_pattern, body.email):
-            return fail("Invalid input")
-        
-        password = body.password
-
-        if not (7 <= len(password) <= 20):
-            return fail("Invalid input")
-        if not any(ch.isdigit() for ch in password):
-            return fail("Invalid input")
-        if not re.search(r"[^A-Za-z0-9]", password):
-            return fail("Invalid input")
-
         first_name = body.first_name or ""
         last_name = body.last_name or ""
         security_answer = body.security_answer or ""
 
-        if len(first_name) == 0 or len(first_name) > 15:
-            return fail("Invalid input")
-        if len(last_name) == 0 or len(last_name) > 15:
-            return fail("Invalid input")
-        if len(security_answer) == 0 or len(security_answer) > 15:
+        if employee_input_error(body.email, body.password, first_name, last_name, security_answer):
             return fail("Invalid input")
 
         payload = UserCreate(
@@ -277,6 +280,31 @@ async def create_employee(
         return fail("Could not create employee")
 
 
+@router.post("/import", response_model=ApiEnvelope)
+async def import_employees_route(
+    request: Request,
+    format: Optional[str] = None,   # csv | ndjson; defaults from Content-Type
+    db: AsyncIOMotorDatabase = Depends(get_db),
+    _admin = Depends(require_admin),
+):
+    """
+    Admin: create EMPLOYEE accounts from a CSV (header row) or NDJSON body
+    with email, password, first_name, last_name, security_answer and an
+    optional manager_id. The body is read as a stream; the response has
+    one entry per row.
+    """
+    fmt = detect_format(request.headers.get("content-type"), format)
+    if fmt is None:
+        return fail("Unsupported import format (use CSV or NDJSON)")
+    try:
+        result = await import_employees(db, iter_records(request.stream(), fmt), _admin.id)
+        print(f"Imported {result['created']} employees ({result['rows_per_s']} rows/s)")
+        return ok(result)
+    except Exception as e:
+        print("Error importing employees:", e)
+        return fail("Could not import employees")
+
+
 def serialize_user(user):
     """Convert MongoDB types into JSON-safe values"""
     safe_user = {}
@@ -298,7 +326,7 @@ def serialize_user(user):
     return safe_user
 
 @router.get("", tags=["users"])
-async def get_all_users(db: AsyncIOMotorDatabase = Depends(get_db)):
+async def get_all_users(db: AsyncIOMotorDatabase = Depends(reads.using("reports"))):
     try:
         users = await users_repo.get_all_users(db)
         serialized_users = [serialize_user(u) for u in users]
@@ -398,7 +426,7 @@ async def find_user_nickname(
             # 4) increment failed attempts
             current_attempts = user_doc.get("reset_attempts", 0) + 1
 
-            update_doc = {"reset_attempts": current_attempts}
+            update_doc = {"reset_attempts": current_attempts, "updated_at": now}
 
             # if 3 or more fail, set lock 1 minute
             if current_attempts >= 3:
@@ -416,7 +444,7 @@ async def find_user_nickname(
         # 5) succes, reset attempts + lock
         await db[COLL].update_one(
             {"_id": user_doc["_id"]},
-            {"$set": {"reset_attempts": 0, "reset_lock_until": None}}
+            {"$set": {"reset_attempts": 0, "reset_lock_until": None, "updated_at": now}}
         )
 
         return ok({"security_answer_valid": True})
@@ -488,7 +516,7 @@ async def reset_user_password(
         # 4) Set last_password_change_at ONLY AFTER a successful change
         await db["users"].update_one(
             {"_id": ObjectId(body.user_id)},
-            {"$set": {"last_password_change_at": now, "login_attempts": 0, "login_lock_until": now}},
+            {"$set": {"last_password_change_at": now, "login_attempts": 0, "login_lock_until": now, "updated_at": now}},
         )
 
         return ok()
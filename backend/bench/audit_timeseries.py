@@ -0,0 +1,144 @@
+# backend/bench/audit_timeseries.py
+"""
+Audit logs as a plain collection (audit_logs) vs. a time-series
+collection (audit_logs_ts, AUDIT_LOGS_TIMESERIES). Both get the same
+--events rows spread over --days, with their own indexes from
+app/indexes.py, then report
+
+  - storage: data and index bytes on disk
+  - p50/p95 of the reads the app does or will do:
+      latest      newest 50 (list_logs / GET /logs/)
+      hour        every event in a random hour
+      day_action  one action over a random day
+      actor_week  one actor over a random week
+
+    python -m bench.audit_timeseries --events 1000000 --days 90
+
+Needs MongoDB 6.0+.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench_audit_ts")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+os.environ["AUDIT_LOGS_TIMESERIES"] = "true"    # so INDEX_SPECS has the time-series indexes
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app import indexes  # noqa: E402
+from app.models import AuditAction  # noqa: E402
+from app.repos import audit_logs as logs_repo  # noqa: E402
+
+# roughly what the app writes: mostly logins and validation noise
+ACTION_WEIGHTS = {
+    AuditAction.USER_LOGIN.value: 30,
+    AuditAction.USER_LOGIN_FAIL.value: 10,
+    AuditAction.INC_CHAR_EMAIL.value: 15,
+    AuditAction.INC_CHAR_PASS.value: 10,
+    AuditAction.USER_LOGOUT.value: 10,
+    AuditAction.DOC_CREATE.value: 8,
+    AuditAction.DOC_UPDATE.value: 8,
+    AuditAction.DOC_SUBMIT.value: 4,
+    AuditAction.DOC_APPROVE.value: 3,
+    AuditAction.DOC_REJECT.value: 2,
+}
+
+
+async def seed(db, args, rng: random.Random) -> tuple[datetime, list[ObjectId]]:
+    await db[logs_repo.PLAIN_COLL].drop()
+    await db[logs_repo.TS_COLL].drop()
+    await logs_repo.ensure_timeseries(db)
+    for coll in (logs_repo.PLAIN_COLL, logs_repo.TS_COLL):
+        await db[coll].create_indexes(indexes.INDEX_SPECS[coll])
+
+    actors = [ObjectId() for _ in range(args.actors)]
+    actions, weights = zip(*ACTION_WEIGHTS.items())
+    end = datetime.now(timezone.utc).replace(microsecond=0)
+    start = end - timedelta(days=args.days)
+    step = (end - start) / args.events
+
+    batch_size = 10_000
+    for lo in range(0, args.events, batch_size):
+        rows = []
+        for i in range(lo, min(lo + batch_size, args.events)):
+            row = logs_repo.build_event(str(rng.choice(actors)), rng.choices(actions, weights)[0], "USER", now=start + step * i)
+            row["_id"] = ObjectId()
+            rows.append(row)
+        await db[logs_repo.PLAIN_COLL].insert_many(rows, ordered=False)
+        await db[logs_repo.TS_COLL].insert_many([logs_repo.to_timeseries(r) for r in rows], ordered=False)
+    return start, actors
+
+
+async def storage(db, coll: str) -> dict:
+    stats = await db[coll].aggregate([{"$collStats": {"storageStats": {}}}]).to_list(length=None)
+    s = stats[0]["storageStats"] if stats else {}
+    return {"storage_bytes": s.get("storageSize"), "index_bytes": s.get("totalIndexSize"), "count": s.get("count")}
+
+
+def queries(layout: str, start: datetime, days: int, actors: list, rng: random.Random):
+    action = "meta.action" if layout == "ts" else "action"
+    actor = "meta.actor_id" if layout == "ts" else "actor_id"
+
+    def window(length: timedelta) -> dict:
+        lo = start + timedelta(seconds=rng.uniform(0, days * 86400 - length.total_seconds()))
+        return {"$gte": lo, "$lt": lo + length}
+
+    return {
+        "latest": lambda: ({}, 50),
+        "hour": lambda: ({"created_at": window(timedelta(hours=1))}, 0),
+        "day_action": lambda: ({action: AuditAction.DOC_APPROVE.value, "created_at": window(timedelta(days=1))}, 0),
+        "actor_week": lambda: ({actor: rng.choice(actors), "created_at": window(timedelta(days=7))}, 0),
+    }
+
+
+async def measure(db, coll: str, layout: str, args, start, actors, rng) -> dict:
+    out = {}
+    for name, make in queries(layout, start, args.days, actors, rng).items():
+        ms, rows = [], 0
+        for _ in range(args.queries):
+            query, limit = make()
+            t = time.perf_counter()
+            found = await db[coll].find(query).sort("created_at", -1).limit(limit).to_list(length=None)
+            ms.append((time.perf_counter() - t) * 1000)
+            rows += len(found)
+        q = statistics.quantiles(ms, n=100)
+        out[name] = {"p50_ms": round(q[49], 2), "p95_ms": round(q[94], 2), "avg_rows": round(rows / args.queries, 1)}
+    return out
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.audit_timeseries")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_audit_ts")
+    p.add_argument("--events", type=int, default=1_000_000)
+    p.add_argument("--days", type=int, default=90)
+    p.add_argument("--actors", type=int, default=2_000)
+    p.add_argument("--queries", type=int, default=200, help="per query shape and layout")
+    args = p.parse_args(argv)
+
+    db = AsyncIOMotorClient(args.mongo_uri)[args.db]
+    rng = random.Random(7)
+    t0 = time.perf_counter()
+    start, actors = await seed(db, args, rng)
+    report = {"events": args.events, "days": args.days, "seed_s": round(time.perf_counter() - t0, 1)}
+
+    for layout, coll in (("plain", logs_repo.PLAIN_COLL), ("ts", logs_repo.TS_COLL)):
+        report[layout] = {
+            "storage": await storage(db, coll),
+            "queries": await measure(db, coll, layout, args, start, actors, random.Random(11)),
+        }
+    print(json.dumps(report, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,111 @@
+# backend/bench/cache.py
+"""
+Cache hit latency per backend (app/cache.py):
+
+  memory        per-process LRU
+  redis         every get is a round trip (CACHE_LOCAL_TTL_SECONDS=0)
+  redis+local   Redis behind the per-worker near cache
+
+Each case fills --keys keys with a list of --value-items ids (about what
+employee_ids_for_manager caches), then times --gets random hits and
+--incrs counter increments. Reports p50/p95/p99 in microseconds and ops/s.
+
+    python -m bench.cache --redis-url redis://localhost:6379/15
+
+The redis cases need a local Redis (or anything speaking the protocol)
+and are reported as skipped when it can't be reached. They flush the
+keys they wrote, nothing else.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from bson import ObjectId  # noqa: E402
+
+from app import cache as cache_mod  # noqa: E402
+
+
+def summarize(samples: list[float], total_s: float) -> dict:
+    us = sorted(s * 1e6 for s in samples)
+    q = statistics.quantiles(us, n=100)
+    return {
+        "p50_us": round(q[49], 1),
+        "p95_us": round(q[94], 1),
+        "p99_us": round(q[98], 1),
+        "ops_per_s": round(len(samples) / total_s),
+    }
+
+
+async def run_case(cache, args, rng: random.Random) -> dict:
+    keys = [f"bench:{i}" for i in range(args.keys)]
+    value = [str(ObjectId()) for _ in range(args.value_items)]
+    for key in keys:
+        await cache.set(key, value, ttl=600)
+
+    samples = []
+    t0 = time.perf_counter()
+    for _ in range(args.gets):
+        key = rng.choice(keys)
+        t = time.perf_counter()
+        hit = await cache.get(key)
+        samples.append(time.perf_counter() - t)
+        assert hit is not None, key
+    gets = summarize(samples, time.perf_counter() - t0)
+
+    samples = []
+    t0 = time.perf_counter()
+    for _ in range(args.incrs):
+        t = time.perf_counter()
+        await cache.incr("bench:counter", ttl=600)
+        samples.append(time.perf_counter() - t)
+    incrs = summarize(samples, time.perf_counter() - t0)
+
+    await cache.delete(*keys, "bench:counter")
+    return {"get_hit": gets, "incr": incrs}
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.cache")
+    p.add_argument("--redis-url", default="redis://localhost:6379/15")
+    p.add_argument("--keys", type=int, default=1_000)
+    p.add_argument("--value-items", type=int, default=25, help="ids per cached list")
+    p.add_argument("--gets", type=int, default=20_000)
+    p.add_argument("--incrs", type=int, default=5_000)
+    p.add_argument("--local-ttl", type=float, default=5.0, help="near cache ttl for redis+local")
+    args = p.parse_args(argv)
+
+    rng = random.Random(7)
+    report = {"keys": args.keys, "value_items": args.value_items, "gets": args.gets, "cases": {}}
+    cases = [
+        ("memory", lambda: cache_mod.MemoryCache(args.keys * 2)),
+        ("redis", lambda: cache_mod.RedisCache(args.redis_url, 0, args.keys * 2)),
+        ("redis+local", lambda: cache_mod.RedisCache(args.redis_url, args.local_ttl, args.keys * 2)),
+    ]
+    for name, make in cases:
+        cache = None
+        try:
+            cache = make()
+            await cache.start()
+            result = await run_case(cache, args, rng)
+            result["stats"] = cache.stats()
+        except Exception as e:
+            result = {"skipped": f"{type(e).__name__}: {e}"}
+        finally:
+            if cache is not None:
+                await cache.close()
+        report["cases"][name] = result
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
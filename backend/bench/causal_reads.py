@@ -0,0 +1,101 @@
+# backend/bench/causal_reads.py
+"""
+Read-your-writes with SECONDARY_READS=true against a replica set: each
+round creates a document (POST /documents/, primary) and immediately
+lists GET /documents/ (a "reports" route, secondaryPreferred). Run once
+carrying the causal cookie between the two requests and once dropping
+it. Reports how often the new document was missing from the listing
+and p50/p95 of the listing.
+
+A local three-member replica set is enough:
+
+    mkdir -p /tmp/rs/{a,b,c}
+    mongod --replSet rs0 --port 27017 --dbpath /tmp/rs/a --fork --logpath /tmp/rs/a.log
+    mongod --replSet rs0 --port 27018 --dbpath /tmp/rs/b --fork --logpath /tmp/rs/b.log
+    mongod --replSet rs0 --port 27019 --dbpath /tmp/rs/c --fork --logpath /tmp/rs/c.log
+    mongosh --port 27017 --eval 'rs.initiate({_id: "rs0", members: [
+        {_id: 0, host: "localhost:27017"}, {_id: 1, host: "localhost:27018"},
+        {_id: 2, host: "localhost:27019"}]})'
+
+    python -m bench.causal_reads --rounds 300
+
+Lag on a local set is usually well under a millisecond, so misses
+without the cookie are rare; --writers adds background inserts to widen
+it. With the cookie the miss count should always be 0.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0")
+os.environ.setdefault("MONGO_DB", "dms_bench_causal")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+os.environ["SECONDARY_READS"] = "true"
+os.environ.setdefault("SCHEDULER_ENABLED", "false")
+
+import httpx  # noqa: E402
+from bson import ObjectId  # noqa: E402
+
+from app import reads  # noqa: E402
+from app.db import get_db  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+
+
+async def noise(stop: asyncio.Event) -> None:
+    """Bulk inserts on the side, so secondaries have something to catch up on."""
+    coll = get_db()["bench_noise"]
+    while not stop.is_set():
+        await coll.insert_many([{"pad": "x" * 512} for _ in range(200)])
+
+
+async def run(client: httpx.AsyncClient, rounds: int, keep_cookie: bool) -> dict:
+    owner = str(ObjectId())
+    missing = 0
+    list_ms = []
+    for i in range(rounds):
+        if not keep_cookie:
+            client.cookies.clear()
+        res = (await client.post("/documents/", json={"user_id": owner, "title": f"causal {i}", "description": ""})).json()
+        doc_id = res["data"]["id"]
+        if not keep_cookie:
+            client.cookies.clear()
+        t = time.perf_counter()
+        listed = (await client.get("/documents/")).json()["data"]
+        list_ms.append((time.perf_counter() - t) * 1000)
+        if not any(d["id"] == doc_id for d in listed):
+            missing += 1
+    q = statistics.quantiles(list_ms, n=100)
+    return {"rounds": rounds, "missing": missing, "list_p50_ms": round(q[49], 2), "list_p95_ms": round(q[94], 2)}
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.causal_reads")
+    p.add_argument("--rounds", type=int, default=300)
+    p.add_argument("--writers", type=int, default=2, help="background bulk-insert loops")
+    args = p.parse_args(argv)
+
+    db = get_db()
+    await db[docs_repo.COLL].drop()
+    await db["bench_noise"].drop()
+
+    stop = asyncio.Event()
+    writers = [asyncio.create_task(noise(stop)) for _ in range(args.writers)]
+    report = {"uri": os.environ["MONGO_URI"], "cookie": reads.CAUSAL_COOKIE}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            report["without_cookie"] = await run(client, args.rounds, keep_cookie=False)
+            report["with_cookie"] = await run(client, args.rounds, keep_cookie=True)
+    finally:
+        stop.set()
+        await asyncio.gather(*writers, return_exceptions=True)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
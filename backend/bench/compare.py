@@ -0,0 +1,37 @@
+# backend/bench/compare.py
+"""
+Diff two load_test.py reports endpoint by endpoint.
+
+    python -m bench.compare before.json after.json
+"""
+import json
+import sys
+
+
+def pct_change(old: float, new: float) -> str:
+    if not old:
+        return "   n/a"
+    return f"{(new - old) / old * 100:+6.1f}%"
+
+
+def main(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{before['meta'].get('commit')} -> {after['meta'].get('commit')}")
+    print(f"{'endpoint':<40} {'rps':>16} {'p50':>16} {'p95':>16} {'p99':>16}")
+    for name in sorted(set(before["endpoints"]) | set(after["endpoints"])):
+        old = before["endpoints"].get(name, {})
+        new = after["endpoints"].get(name, {})
+        cells = []
+        for key in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            cells.append(f"{new.get(key, 0):>8} {pct_change(old.get(key, 0), new.get(key, 0))}")
+        print(f"{name:<40} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        sys.exit("usage: python -m bench.compare before.json after.json")
+    main(sys.argv[1], sys.argv[2])
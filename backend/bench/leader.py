@@ -0,0 +1,161 @@
+# backend/bench/leader.py
+"""
+Leader failover across processes: N workers each run a locks.Leader for
+the same role with a short TTL and report every acquisition and loss.
+The parent SIGKILLs whoever leads, waits for someone else to take over,
+starts a replacement worker and repeats. Reports
+
+  - failover time per round (kill -> next acquisition) vs. the bound
+    of ttl + 1.2 * ttl/3 (lease runs out + one jittered retry interval)
+  - whether fencing tokens only ever went up
+  - overlaps: a new leader while the previous one (not killed) still
+    believed it held the lease
+
+    python -m bench.leader --workers 4 --ttl 3 --rounds 5
+
+Needs a real mongod (the lease is computed from the server clock).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import os
+import queue
+import signal
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench_leader")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app import locks  # noqa: E402
+
+ROLE = "bench"
+
+
+def worker(mongo_uri: str, db_name: str, ttl: float, events) -> None:
+    async def run() -> None:
+        db = AsyncIOMotorClient(mongo_uri)[db_name]
+        leader = locks.Leader(db, ROLE, ttl)
+        pid = os.getpid()
+
+        def lost() -> None:
+            events.put(("lost", pid, leader.lease.token, time.time()))
+
+        leader.on_lost.append(lost)
+        leader.start()
+        reported = None
+        while True:
+            # poll rather than hook into _run, so the bench only uses the public surface
+            if leader.is_leader and leader.lease.token != reported:
+                reported = leader.lease.token
+                events.put(("acquired", pid, reported, time.time()))
+            await asyncio.sleep(0.01)
+
+    asyncio.run(run())
+
+
+def spawn(ctx, args, events):
+    p = ctx.Process(target=worker, args=(args.mongo_uri, args.db, args.ttl, events), daemon=True)
+    p.start()
+    return p
+
+
+def next_acquisition(events, log: list, timeout: float):
+    """Drain events until an acquisition shows up; everything seen goes into `log`."""
+    give_up = time.time() + timeout
+    while time.time() < give_up:
+        try:
+            ev = events.get(timeout=0.05)
+        except queue.Empty:
+            continue
+        log.append(ev)
+        if ev[0] == "acquired":
+            return ev
+    return None
+
+
+def check(log: list, killed: set) -> dict:
+    tokens = [ev[2] for ev in log if ev[0] == "acquired"]
+    monotonic = all(b > a for a, b in zip(tokens, tokens[1:]))
+    overlaps = 0
+    holder = None
+    for kind, pid, token, _t in log:
+        if kind == "acquired":
+            if holder is not None and holder != pid and holder not in killed:
+                overlaps += 1
+            holder = pid
+        elif kind == "lost" and holder == pid:
+            holder = None
+    return {"tokens": tokens, "monotonic": monotonic, "overlaps": overlaps}
+
+
+async def reset(mongo_uri: str, db_name: str) -> None:
+    await AsyncIOMotorClient(mongo_uri)[db_name][locks.COLL].drop()
+
+
+def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.leader")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_leader")
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--ttl", type=float, default=3.0, help="lease length in seconds")
+    p.add_argument("--rounds", type=int, default=5)
+    args = p.parse_args(argv)
+
+    asyncio.run(reset(args.mongo_uri, args.db))
+    ctx = mp.get_context("spawn")
+    events = ctx.Queue()
+    procs = {}
+    for _ in range(args.workers):
+        proc = spawn(ctx, args, events)
+        procs[proc.pid] = proc
+
+    log: list = []
+    killed: set = set()
+    bound = args.ttl + 1.2 * max(0.5, args.ttl / 3)
+    failovers = []
+    try:
+        first = next_acquisition(events, log, timeout=30)
+        if first is None:
+            sys.exit("no worker became leader (is mongod running?)")
+        current = first
+        for _ in range(args.rounds):
+            # let the leader renew a few times first
+            time.sleep(args.ttl)
+            victim = current[1]
+            killed.add(victim)
+            t_kill = time.time()
+            os.kill(victim, signal.SIGKILL)
+            procs.pop(victim).join()
+            replacement = spawn(ctx, args, events)
+            procs[replacement.pid] = replacement
+
+            current = next_acquisition(events, log, timeout=bound * 4)
+            if current is None:
+                sys.exit(f"no failover within {bound * 4:.1f}s")
+            failovers.append(round(current[3] - t_kill, 3))
+    finally:
+        for proc in procs.values():
+            proc.kill()
+
+    report = {
+        "workers": args.workers,
+        "ttl_s": args.ttl,
+        "bound_s": round(bound, 3),
+        "failover_s": failovers,
+        "failover_p50_s": statistics.median(failovers) if failovers else None,
+        "failover_max_s": max(failovers) if failovers else None,
+        "within_bound": all(f <= bound for f in failovers),
+        **check(log, killed),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,363 @@
+# backend/bench/load_test.py
+"""
+End-to-end load test: seeds a local mongod, starts the FastAPI app with
+uvicorn and drives a weighted mix of realistic DMS scenarios against it.
+
+    cd backend
+    python -m bench.load_test --documents 50000 --logs 200000 --duration 60 --out run.json
+
+The JSON report has throughput and p50/p95/p99 per endpoint so two runs
+(e.g. before/after a commit) can be diffed with bench/compare.py.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+BENCH_PASSWORD = "bench123!"
+
+DEFAULT_MIX = {
+    "login": 1,
+    "employee_mine": 6,
+    "manager_pending": 3,
+    "admin_logs": 1,
+}
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    p = argparse.ArgumentParser(prog="python -m bench.load_test")
+    p.add_argument("--mongo-uri", default=os.getenv("MONGO_URI", "mongodb://localhost:27017"))
+    p.add_argument("--db", default="dms_bench")
+    p.add_argument("--managers", type=int, default=20)
+    p.add_argument("--employees", type=int, default=500)
+    p.add_argument("--admins", type=int, default=2)
+    p.add_argument("--documents", type=int, default=20_000)
+    p.add_argument("--logs", type=int, default=100_000)
+    p.add_argument("--pending-ratio", type=float, default=0.4)
+    p.add_argument("--no-seed", action="store_true", help="reuse the data already in --db")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    p.add_argument("--concurrency", type=int, default=50, help="simulated clients")
+    p.add_argument("--duration", type=float, default=30.0, help="seconds of measured load")
+    p.add_argument("--warmup", type=float, default=3.0)
+    p.add_argument("--mix", default=None, help='JSON weights, e.g. \'{"login": 5, "employee_mine": 1}\'')
+    p.add_argument("--out", default=None, help="write the JSON report here (default: stdout)")
+    return p.parse_args(argv)
+
+
+# ---------- seeding ----------
+
+async def seed(args) -> None:
+    import bcrypt
+    from bson import ObjectId
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from app import indexes
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    await client.drop_database(args.db)
+    db = client[args.db]
+    await indexes.ensure_indexes(db)
+
+    # one hash for everybody: seeding 500 bcrypt hashes would dominate the setup
+    pw_hash = bcrypt.hashpw(BENCH_PASSWORD.encode(), bcrypt.gensalt()).decode()
+    now = datetime.utcnow()
+
+    def user(role: str, i: int, manager_id=None) -> dict:
+        return {
+            "_id": ObjectId(),
+            "email": f"{role.lower()}{i}@bench.local",
+            "password_hash": pw_hash,
+            "role": role,
+            "profile": {"first_name": role.title(), "last_name": str(i)},
+            "security_answer": "bench",
+            "manager_id": manager_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    admins = [user("ADMIN", i) for i in range(args.admins)]
+    managers = [user("MANAGER", i) for i in range(args.managers)]
+    employees = [user("EMPLOYEE", i, random.choice(managers)["_id"]) for i in range(args.employees)]
+    await db["users"].insert_many(admins + managers + employees, ordered=False)
+
+    statuses = ["PENDING_REVIEW", "APPROVED", "REJECTED"]
+    weights = [args.pending_ratio, (1 - args.pending_ratio) / 2, (1 - args.pending_ratio) / 2]
+
+    async def bulk(coll: str, make, total: int, chunk: int = 10_000):
+        for start in range(0, total, chunk):
+            await db[coll].insert_many([make(i) for i in range(start, min(total, start + chunk))], ordered=False)
+
+    def document(i: int) -> dict:
+        created = now - timedelta(minutes=random.randint(0, 60 * 24 * 90))
+        return {
+            "owner_id": random.choice(employees)["_id"],
+            "title": f"Document {i}",
+            "description": f"Benchmark document number {i}",
+            "status": random.choices(statuses, weights)[0],
+            "attachments": [],
+            "review": None,
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    def log(i: int) -> dict:
+        created = datetime.now(timezone.utc) - timedelta(seconds=random.randint(0, 86400 * 90))
+        actor = random.choice(employees)["_id"]
+        return {
+            "actor_id": actor,
+            "action": random.choice(["USER_LOGIN", "DOC_CREATE", "DOC_UPDATE", "DOC_APPROVE"]),
+            "resource_type": random.choice(["USER", "DOCUMENT"]),
+            "resource_id": actor,
+            "details": {},
+            "created_at": created,
+            "updated_at": created,
+        }
+
+    await bulk("documents", document, args.documents)
+    await bulk("audit_logs", log, args.logs)
+    client.close()
+
+
+async def load_population(args) -> dict[str, list[dict]]:
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    out: dict[str, list[dict]] = {}
+    for role in ("ADMIN", "MANAGER", "EMPLOYEE"):
+        cursor = client[args.db]["users"].find({"role": role}, {"_id": 1, "email": 1})
+        out[role] = [{"id": str(d["_id"]), "email": d["email"]} async for d in cursor]
+    client.close()
+    return out
+
+
+# ---------- app process ----------
+
+def start_app(args) -> subprocess.Popen:
+    env = dict(os.environ)
+    env.update({
+        "MONGO_URI": args.mongo_uri,
+        "MONGO_DB": args.db,
+        "JWT_SECRET": env.get("JWT_SECRET", "bench-secret"),
+        "JWT_REFRESH_SECRET": env.get("JWT_REFRESH_SECRET", "bench-refresh-secret"),
+        "SEED_ON_STARTUP": "false",
+    })
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        cwd=backend_dir,
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                r = await client.get(f"{base_url}/openapi.json")
+                if r.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError("app did not become ready")
+
+
+# ---------- load ----------
+
+class Recorder:
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.recording = False
+
+    def add(self, name: str, seconds: float, ok: bool) -> None:
+        if not self.recording:
+            return
+        self.samples.setdefault(name, []).append(seconds)
+        if not ok:
+            self.errors[name] = self.errors.get(name, 0) + 1
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest-rank
+    k = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[k]
+
+
+async def timed(rec: Recorder, name: str, coro):
+    t0 = time.perf_counter()
+    ok = False
+    resp = None
+    try:
+        resp = await coro
+        ok = resp.status_code < 400 and resp.json().get("ok", False)
+    except Exception:
+        ok = False
+    rec.add(name, time.perf_counter() - t0, ok)
+    return resp if ok else None
+
+
+async def scenario_login(client, rec, pop, tokens):
+    user = random.choice(pop["EMPLOYEE"] + pop["MANAGER"])
+    await timed(rec, "POST /auth/login", client.post("/auth/login", json={"email": user["email"], "password": BENCH_PASSWORD}))
+
+
+async def scenario_employee_mine(client, rec, pop, tokens):
+    emp = random.choice(pop["EMPLOYEE"])
+    await timed(rec, "GET /documents/mine", client.get("/documents/mine", params={"user_id": emp["id"]}))
+
+
+async def scenario_manager_pending(client, rec, pop, tokens):
+    mgr = random.choice(pop["MANAGER"])
+    resp = await timed(rec, "POST /documents/view-docs/pending",
+                       client.post("/documents/view-docs/pending", json={"manager_id": mgr["id"]}))
+    pending = resp.json()["data"] if resp is not None else []
+    if pending:
+        doc = random.choice(pending)
+        await timed(rec, "POST /documents/reviews/{id}/approve",
+                    client.post(f"/documents/reviews/{doc['id']}/approve",
+                                json={"reviewer_id": mgr["id"], "comment": "bench"}))
+
+
+async def scenario_admin_logs(client, rec, pop, tokens):
+    token = random.choice(tokens["ADMIN"])
+    await timed(rec, "GET /logs/", client.get("/logs/", headers={"Authorization": f"Bearer {token}"}))
+
+
+SCENARIOS = {
+    "login": scenario_login,
+    "employee_mine": scenario_employee_mine,
+    "manager_pending": scenario_manager_pending,
+    "admin_logs": scenario_admin_logs,
+}
+
+
+async def drive(args, base_url: str, pop: dict) -> tuple[Recorder, float]:
+    import httpx
+
+    mix = json.loads(args.mix) if args.mix else DEFAULT_MIX
+    names = [n for n in mix if mix[n] > 0]
+    weights = [mix[n] for n in names]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        raise SystemExit(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    rec = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        tokens: dict[str, list[str]] = {"ADMIN": []}
+        for admin in pop["ADMIN"]:
+            r = await client.post("/auth/login", json={"email": admin["email"], "password": BENCH_PASSWORD})
+            tokens["ADMIN"].append(r.json()["data"]["access"])
+
+        stop_at = time.monotonic() + args.warmup + args.duration
+
+        async def worker():
+            while time.monotonic() < stop_at:
+                name = random.choices(names, weights)[0]
+                await SCENARIOS[name](client, rec, pop, tokens)
+
+        async def start_recording():
+            await asyncio.sleep(args.warmup)
+            rec.recording = True
+
+        t0 = time.monotonic()
+        await asyncio.gather(start_recording(), *(worker() for _ in range(args.concurrency)))
+        elapsed = time.monotonic() - t0 - args.warmup
+    return rec, elapsed
+
+
+def summarize(rec: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    for name, values in sorted(rec.samples.items()):
+        values.sort()
+        endpoints[name] = {
+            "count": len(values),
+            "errors": rec.errors.get(name, 0),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    total = sum(e["count"] for e in endpoints.values())
+    return {
+        "total": {
+            "count": total,
+            "errors": sum(rec.errors.values()),
+            "rps": round(total / elapsed, 2),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return None
+
+
+async def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    os.environ.setdefault("MONGO_URI", args.mongo_uri)
+    os.environ.setdefault("MONGO_DB", args.db)
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+    if not args.no_seed:
+        t0 = time.perf_counter()
+        await seed(args)
+        print(f"seeded in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    pop = await load_population(args)
+    proc = start_app(args)
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        await wait_ready(base_url)
+        rec, elapsed = await drive(args, base_url, pop)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_s": round(elapsed, 2),
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "volumes": {
+                "admins": args.admins,
+                "managers": args.managers,
+                "employees": args.employees,
+                "documents": args.documents,
+                "logs": args.logs,
+            },
+            "mix": json.loads(args.mix) if args.mix else DEFAULT_MIX,
+        },
+        **summarize(rec, elapsed),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
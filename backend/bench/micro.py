@@ -0,0 +1,178 @@
+# backend/bench/micro.py
+"""
+Microbenchmarks for the CPU-side hot paths that don't need a database.
+
+    python -m bench.micro --save            # record a baseline for this machine
+    python -m bench.micro                   # compare against it, exit 1 on regression
+    python -m bench.micro --max-regression 25 -k jwt
+
+Baselines are machine specific, so they are stored locally
+(bench/.baselines/micro.json by default) rather than committed.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from bson import ObjectId  # noqa: E402
+
+from app.api import ok  # noqa: E402
+from app.audit.routes import format_datetime  # noqa: E402
+from app.auth.jwt import make_token, verify_token  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+from app.repos import users as users_repo  # noqa: E402
+from app.users.routes import serialize_user, stringify_object_ids  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".baselines", "micro.json")
+
+# per-case override of --max-regression (percent)
+THRESHOLDS: dict[str, float] = {
+    # token timings are tiny and noisy
+    "jwt.encode": 25.0,
+    "jwt.decode": 25.0,
+}
+
+
+def _raw_document() -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "_id": ObjectId(),
+        "owner_id": ObjectId(),
+        "title": "Quarterly expense report",
+        "description": "Expenses for Q3, including travel and equipment.",
+        "status": "APPROVED",
+        "attachments": [{"file_id": "f1", "filename": "q3.pdf", "size": 12345, "content_type": "application/pdf"}],
+        "review": {"reviewer_id": ObjectId(), "decision": "APPROVED", "comment": "ok", "decided_at": now},
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def _raw_user() -> dict:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "email": "employee1@example.com",
+        "password_hash": "$2b$12$" + "x" * 53,
+        "role": "EMPLOYEE",
+        "profile": {"first_name": "Employee", "last_name": "One"},
+        "security_answer": "employee1",
+        "reset_attempts": 0,
+        "reset_lock_until": None,
+        "password_history": [{"password_hash": "h", "changed_at": now}],
+        "manager_id": ObjectId(),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+def build_cases() -> dict[str, Callable[[], object]]:
+    raw_doc = _raw_document()
+    raw_user = _raw_user()
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    rows_10k = [base + timedelta(seconds=i) for i in range(10_000)]
+    docs_10k = [docs_repo._doc_to_out(_raw_document()) for _ in range(10_000)]
+    token = make_token("6560f0c2a1b2c3d4e5f60718", secret="bench-secret", ttl_minutes=15,
+                       extra={"role": "EMPLOYEE", "email": "employee1@example.com"})
+
+    return {
+        "documents._doc_to_out": lambda: docs_repo._doc_to_out(raw_doc),
+        "users._doc_to_out": lambda: users_repo._doc_to_out(raw_user),
+        "users.serialize_user": lambda: serialize_user(raw_user),
+        "users.stringify_object_ids": lambda: stringify_object_ids(raw_user),
+        "audit.format_datetime[10k]": lambda: [format_datetime(dt) for dt in rows_10k],
+        "api.ok[10k docs]": lambda: ok(docs_10k),
+        "api.ok[10k docs].model_dump_json": lambda: ok(docs_10k).model_dump_json(),
+        "jwt.encode": lambda: make_token("6560f0c2a1b2c3d4e5f60718", secret="bench-secret", ttl_minutes=15,
+                                         extra={"role": "EMPLOYEE", "email": "employee1@example.com"}),
+        "jwt.decode": lambda: verify_token(token, secret="bench-secret"),
+    }
+
+
+def measure(fn: Callable[[], object], rounds: int, round_time: float) -> dict[str, float]:
+    # calibrate so one round takes roughly round_time seconds
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - t0
+        if elapsed >= round_time / 4 or number >= 1_000_000:
+            break
+        number *= 4
+    number = max(1, int(number * round_time / max(elapsed, 1e-9)))
+
+    per_call = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - t0) / number)
+
+    return {
+        "median_us": statistics.median(per_call) * 1e6,
+        "min_us": min(per_call) * 1e6,
+        "stdev_us": (statistics.stdev(per_call) if len(per_call) > 1 else 0.0) * 1e6,
+        "calls_per_round": number,
+    }
+
+
+def main(argv: list[str]) -> int:
+    p = argparse.ArgumentParser(prog="python -m bench.micro")
+    p.add_argument("--baseline", default=DEFAULT_BASELINE)
+    p.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    p.add_argument("--max-regression", type=float, default=15.0, help="allowed slowdown in percent")
+    p.add_argument("--rounds", type=int, default=7)
+    p.add_argument("--round-time", type=float, default=0.2, help="seconds per round")
+    p.add_argument("-k", dest="filter", default=None, help="only run cases containing this text")
+    p.add_argument("--json", action="store_true", help="print results as JSON")
+    args = p.parse_args(argv)
+
+    cases = {name: fn for name, fn in build_cases().items() if not args.filter or args.filter in name}
+    results = {name: measure(fn, args.rounds, args.round_time) for name, fn in cases.items()}
+
+    baseline: dict[str, dict[str, float]] = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+
+    regressions = []
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'case':<38} {'median':>12} {'min':>12} {'baseline':>12} {'change':>9}")
+    for name, r in results.items():
+        old = baseline.get(name)
+        change = (r["median_us"] - old["median_us"]) / old["median_us"] * 100 if old else None
+        limit = THRESHOLDS.get(name, args.max_regression)
+        if change is not None and change > limit:
+            regressions.append((name, change, limit))
+        if not args.json:
+            old_text = f"{old['median_us']:.2f}us" if old else "-"
+            change_text = f"{change:+.1f}%" if change is not None else "-"
+            print(f"{name:<38} {r['median_us']:>10.2f}us {r['min_us']:>10.2f}us {old_text:>12} {change_text:>9}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        merged = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump({"saved_at": datetime.now(timezone.utc).isoformat(), "results": merged}, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    for name, change, limit in regressions:
+        print(f"REGRESSION {name}: {change:+.1f}% (limit {limit:.0f}%)", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,125 @@
+# backend/bench/review_queue.py
+"""
+Concurrent reviewers draining one pending queue, two ways:
+
+  race   every reviewer lists the pending documents and tries to decide
+         the oldest one (what /documents/view-docs/pending + approve do
+         today); losers retry with a fresh list
+  claim  every reviewer leases a batch with claim_reviews() and decides
+         only what it holds
+
+    python -m bench.review_queue --documents 5000 --reviewers 20 --batch 5
+
+Reports decisions/s and how many decide calls were wasted on collisions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench_queue")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app import indexes  # noqa: E402
+from app.models import DocStatus  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+from app.repos import transitions  # noqa: E402
+
+
+async def seed(db, total: int, owners: int) -> None:
+    await db["documents"].drop()
+    owner_ids = [ObjectId() for _ in range(owners)]
+    base = datetime.utcnow() - timedelta(days=1)
+    await db["documents"].insert_many([
+        {
+            "owner_id": owner_ids[i % owners],
+            "title": f"doc {i}",
+            "description": "",
+            "status": DocStatus.PENDING_REVIEW.value,
+            "attachments": [],
+            "review": None,
+            "created_at": base + timedelta(seconds=i),
+            "updated_at": base + timedelta(seconds=i),
+        }
+        for i in range(total)
+    ], ordered=False)
+    await db["documents"].create_indexes(indexes.INDEX_SPECS[docs_repo.COLL])
+
+
+async def race_reviewer(db, reviewer_id: str, stats: dict, page: int) -> None:
+    while True:
+        cursor = db["documents"].find({"status": DocStatus.PENDING_REVIEW.value}, {"_id": 1}).sort("created_at", 1).limit(page)
+        ids = [str(d["_id"]) async for d in cursor]
+        if not ids:
+            return
+        # everyone looks at the same head of the list
+        if (await transitions.decide(db, ids[0], reviewer_id, DocStatus.APPROVED, None)).ok:
+            stats["decided"] += 1
+        else:
+            stats["wasted"] += 1
+
+
+async def claim_reviewer(db, reviewer_id: str, stats: dict, batch: int) -> None:
+    while True:
+        held = await docs_repo.claim_reviews(db, reviewer_id, None, batch, lease_seconds=60)
+        if not held:
+            return
+        for doc in held:
+            if (await transitions.decide(db, doc.id, reviewer_id, DocStatus.APPROVED, None)).ok:
+                stats["decided"] += 1
+            else:
+                stats["wasted"] += 1
+
+
+async def run(db, mode: str, args) -> dict:
+    await seed(db, args.documents, args.owners)
+    stats = {"decided": 0, "wasted": 0}
+    reviewers = [str(ObjectId()) for _ in range(args.reviewers)]
+
+    t0 = time.perf_counter()
+    if mode == "race":
+        await asyncio.gather(*(race_reviewer(db, r, stats, args.batch) for r in reviewers))
+    else:
+        await asyncio.gather(*(claim_reviewer(db, r, stats, args.batch) for r in reviewers))
+    elapsed = time.perf_counter() - t0
+
+    return {
+        **stats,
+        "seconds": round(elapsed, 2),
+        "decisions_per_s": round(stats["decided"] / elapsed, 1),
+        "wasted_ratio": round(stats["wasted"] / max(1, stats["decided"] + stats["wasted"]), 3),
+    }
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.review_queue")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_queue")
+    p.add_argument("--documents", type=int, default=5_000)
+    p.add_argument("--owners", type=int, default=200)
+    p.add_argument("--reviewers", type=int, default=20)
+    p.add_argument("--batch", type=int, default=5, help="documents per claim (and list size in race mode)")
+    p.add_argument("--mode", choices=["race", "claim", "both"], default="both")
+    args = p.parse_args(argv)
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    db = client[args.db]
+    modes = ["race", "claim"] if args.mode == "both" else [args.mode]
+    report = {"documents": args.documents, "reviewers": args.reviewers}
+    for mode in modes:
+        report[mode] = await run(db, mode, args)
+        print(f"{mode}: {report[mode]}", file=sys.stderr)
+    print(json.dumps(report, indent=2))
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
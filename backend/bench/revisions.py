@@ -0,0 +1,113 @@
+# backend/bench/revisions.py
+"""
+Document history cost: every edit goes through transitions.edit, which
+writes a delta row (plus a snapshot every REVISION_SNAPSHOT_EVERY
+versions). Reports
+
+  - bytes stored in document_revisions vs. what one full copy of the
+    tracked fields per version would take
+  - p50/p95 of get_version() for random versions
+
+    python -m bench.revisions --documents 200 --edits 100 --description-kb 4
+
+Edits alternate between small title changes and occasional description
+rewrites, which is roughly what the edit page does.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench_revisions")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+import bson  # noqa: E402
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app import indexes  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.models import DocumentCreate  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+from app.repos import revisions as revisions_repo  # noqa: E402
+from app.repos import transitions  # noqa: E402
+
+
+async def reset(db) -> None:
+    for coll in (docs_repo.COLL, revisions_repo.COLL):
+        await db[coll].drop()
+        await db[coll].create_indexes(indexes.INDEX_SPECS[coll])
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.revisions")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_revisions")
+    p.add_argument("--documents", type=int, default=200)
+    p.add_argument("--edits", type=int, default=100, help="edits per document")
+    p.add_argument("--description-kb", type=int, default=4)
+    p.add_argument("--rewrite-every", type=int, default=10, help="every Nth edit replaces the description")
+    p.add_argument("--lookups", type=int, default=2_000)
+    args = p.parse_args(argv)
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    db = client[args.db]
+    await reset(db)
+    rng = random.Random(7)
+    owner = str(ObjectId())
+    text = "lorem ipsum " * (args.description_kb * 1024 // 12)
+
+    ids = []
+    for i in range(args.documents):
+        doc = await docs_repo.create_document(db, owner, DocumentCreate(title=f"doc {i}", description=text))
+        ids.append(doc.id)
+
+    full_copy_bytes = 0
+    t0 = time.perf_counter()
+    for doc_id in ids:
+        description = text
+        for n in range(1, args.edits + 1):
+            if n % args.rewrite_every == 0:
+                description = text[rng.randrange(len(text)):] + text[:rng.randrange(len(text))]
+                result = await transitions.edit(db, doc_id, owner, None, description)
+            else:
+                result = await transitions.edit(db, doc_id, owner, f"doc {doc_id[-4:]} rev {n}", None)
+            full_copy_bytes += len(bson.encode(revisions_repo.tracked(result.doc.model_dump())))
+    edit_s = time.perf_counter() - t0
+
+    stats = await db.command("collStats", revisions_repo.COLL)
+    versions = args.edits + 1
+    lookups = []
+    for _ in range(args.lookups):
+        doc_id, version = rng.choice(ids), rng.randint(1, versions)
+        t = time.perf_counter()
+        state = await revisions_repo.get_version(db, doc_id, version)
+        lookups.append((time.perf_counter() - t) * 1000)
+        assert state is not None and state["version"] == version
+    lookups.sort()
+
+    report = {
+        "documents": args.documents,
+        "versions_per_document": versions,
+        "snapshot_every": settings.REVISION_SNAPSHOT_EVERY,
+        "edits_per_s": round(args.documents * args.edits / edit_s, 1),
+        "revision_bytes": stats["size"],
+        "full_copy_bytes": full_copy_bytes,
+        "ratio": round(stats["size"] / max(1, full_copy_bytes), 3),
+        "get_version_ms": {
+            "p50": round(statistics.median(lookups), 2),
+            "p95": round(lookups[int(len(lookups) * 0.95) - 1], 2),
+        },
+    }
+    print(json.dumps(report, indent=2))
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+# backend/bench/text_search.py
+"""
+$text search vs. what the frontend does today (load every document from
+GET /documents/ and regex-filter titles/descriptions on the client).
+
+    python -m bench.text_search --documents 1000000 --queries 50
+
+The "client filter" side is timed as list_all_documents() + a Python
+regex pass, i.e. the server work plus the filtering, without the network
+transfer that makes it even slower in a browser.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench_search")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+
+from app import indexes  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+
+VOCAB = (
+    "invoice contract report budget travel expense policy onboarding audit payroll "
+    "vendor quarterly annual proposal approval leave request training security "
+    "incident procurement inventory forecast compliance review memo summary"
+).split()
+
+
+def percentile(values: list[float], pct: float) -> float:
+    values = sorted(values)
+    return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+
+def summary(samples: list[float]) -> dict:
+    return {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 2),
+        "p95_ms": round(percentile(samples, 95) * 1000, 2),
+        "mean_ms": round(statistics.mean(samples) * 1000, 2),
+    }
+
+
+async def seed(db, total: int, owners: int, chunk: int = 10_000) -> None:
+    await db["documents"].drop()
+    owner_ids = [ObjectId() for _ in range(owners)]
+    now = datetime.utcnow()
+    for start in range(0, total, chunk):
+        batch = []
+        for i in range(start, min(total, start + chunk)):
+            created = now - timedelta(minutes=i)
+            batch.append({
+                "owner_id": random.choice(owner_ids),
+                "title": " ".join(random.sample(VOCAB, 3)) + f" {i}",
+                "description": " ".join(random.choices(VOCAB, k=12)),
+                "status": random.choice(["PENDING_REVIEW", "APPROVED", "REJECTED"]),
+                "attachments": [],
+                "review": None,
+                "created_at": created,
+                "updated_at": created,
+            })
+        await db["documents"].insert_many(batch, ordered=False)
+    await db["documents"].create_indexes(indexes.INDEX_SPECS[docs_repo.COLL])
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.text_search")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_search")
+    p.add_argument("--documents", type=int, default=1_000_000)
+    p.add_argument("--owners", type=int, default=2_000)
+    p.add_argument("--queries", type=int, default=50, help="$text searches to time")
+    p.add_argument("--scan-runs", type=int, default=3, help="full-scan + regex runs to time (slow)")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--no-seed", action="store_true")
+    args = p.parse_args(argv)
+
+    client = AsyncIOMotorClient(args.mongo_uri)
+    db = client[args.db]
+    if not args.no_seed:
+        t0 = time.perf_counter()
+        await seed(db, args.documents, args.owners)
+        print(f"seeded {args.documents} documents in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+
+    terms = [" ".join(random.sample(VOCAB, 2)) for _ in range(args.queries)]
+
+    text_samples = []
+    for q in terms:
+        t0 = time.perf_counter()
+        await docs_repo.search_documents(db, q, limit=args.limit)
+        text_samples.append(time.perf_counter() - t0)
+
+    scan_samples = []
+    for q in terms[: args.scan_runs]:
+        pattern = re.compile("|".join(map(re.escape, q.split())), re.IGNORECASE)
+        t0 = time.perf_counter()
+        docs = await docs_repo.list_all_documents(db)
+        [d for d in docs if pattern.search(d.title or "") or pattern.search(d.description or "")]
+        scan_samples.append(time.perf_counter() - t0)
+
+    report = {
+        "documents": await db["documents"].estimated_document_count(),
+        "text_index": summary(text_samples),
+        "load_all_and_regex": summary(scan_samples),
+    }
+    report["speedup_p50"] = round(report["load_all_and_regex"]["p50_ms"] / max(report["text_index"]["p50_ms"], 1e-6), 1)
+    print(json.dumps(report, indent=2))
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))
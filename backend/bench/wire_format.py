@@ -0,0 +1,109 @@
+# backend/bench/wire_format.py
+"""
+JSON vs. MessagePack for large listing responses (CPU only, no database).
+
+    python -m bench.wire_format --rows 10000 --runs 20
+
+For each payload it reports encoded size, encode time and decode time:
+
+  json (fastapi)   what a response_model=ApiEnvelope route does today:
+                   model_dump(mode="json") + json.dumps
+  json (pydantic)  model_dump_json(), the fastest JSON path we have
+  msgpack          app.api.pack() (timestamps + binary ObjectIds)
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB", "dms_bench")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+import msgpack  # noqa: E402
+from bson import ObjectId  # noqa: E402
+
+from app.api import ok, pack  # noqa: E402
+from app.models import AuditLogOut  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+
+
+def documents(n: int):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    out = []
+    for i in range(n):
+        ts = base + timedelta(minutes=i)
+        out.append(docs_repo._doc_to_out({
+            "_id": ObjectId(),
+            "owner_id": ObjectId(),
+            "title": f"Quarterly expense report {i}",
+            "description": "Expenses for Q3, including travel and equipment.",
+            "status": "APPROVED",
+            "attachments": [],
+            "review": {"reviewer_id": ObjectId(), "decision": "APPROVED", "comment": "ok", "decided_at": ts},
+            "created_at": ts,
+            "updated_at": ts,
+        }))
+    return out
+
+
+def audit_logs(n: int):
+    base = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    return [
+        AuditLogOut(
+            id=str(ObjectId()),
+            actor_id=str(ObjectId()),
+            action="DOC_APPROVE",
+            resource_type="DOCUMENT",
+            resource_id=str(ObjectId()),
+            details={"comment": "looks good"},
+            created_at=base + timedelta(seconds=i),
+            updated_at=base + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def timed(fn, runs: int) -> tuple[float, object]:
+    samples, result = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, result
+
+
+def compare(envelope, runs: int) -> dict:
+    encoders = {
+        "json (fastapi)": (lambda: json.dumps(envelope.model_dump(mode="json")).encode(), json.loads),
+        "json (pydantic)": (lambda: envelope.model_dump_json().encode(), json.loads),
+        "msgpack": (lambda: pack(envelope), lambda b: msgpack.unpackb(b, timestamp=3)),
+    }
+    out = {}
+    for name, (encode, decode) in encoders.items():
+        encode_ms, payload = timed(encode, runs)
+        decode_ms, _ = timed(lambda: decode(payload), runs)
+        out[name] = {"bytes": len(payload), "encode_ms": round(encode_ms, 2), "decode_ms": round(decode_ms, 2)}
+    return out
+
+
+def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.wire_format")
+    p.add_argument("--rows", type=int, default=10_000)
+    p.add_argument("--runs", type=int, default=20)
+    args = p.parse_args(argv)
+
+    report = {
+        "rows": args.rows,
+        "documents": compare(ok(documents(args.rows)), args.runs),
+        "audit_logs": compare(ok(audit_logs(args.rows)), args.runs),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,99 @@
+# backend/bench/write_concern.py
+"""
+What each write-concern profile (app/db.py) costs on a replica set:
+--writes audit events per profile (w0, w1, majority, majority + journal),
+one insert_one at a time from --concurrency writers, then the same for
+a document update (find_one_and_update, acknowledged profiles only).
+Reports p50/p95/p99 in milliseconds and writes/s.
+
+    python -m bench.write_concern --writes 2000 --concurrency 8
+
+Use the three-member replica set from bench/causal_reads.py; on a
+standalone mongod "majority" is just w1 and the gap disappears.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017,localhost:27018,localhost:27019/?replicaSet=rs0")
+os.environ.setdefault("MONGO_DB", "dms_bench_write_concern")
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET", "bench-refresh-secret")
+
+from bson import ObjectId  # noqa: E402
+from motor.motor_asyncio import AsyncIOMotorClient  # noqa: E402
+from pymongo.write_concern import WriteConcern  # noqa: E402
+
+from app import db as db_module  # noqa: E402
+from app.models import DocumentCreate  # noqa: E402
+from app.repos import audit_logs as logs_repo  # noqa: E402
+from app.repos import documents as docs_repo  # noqa: E402
+
+PROFILES = {**{k: v for k, v in db_module.WRITE_CONCERNS.items() if v is not None}, "majority+j": WriteConcern(w="majority", j=True)}
+
+
+def summarize(samples: list[float], total_s: float) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    q = statistics.quantiles(ms, n=100)
+    return {"p50_ms": round(q[49], 3), "p95_ms": round(q[94], 3), "p99_ms": round(q[98], 3), "writes_per_s": round(len(ms) / total_s)}
+
+
+async def timed(n: int, concurrency: int, write) -> dict:
+    samples: list[float] = []
+    counter = iter(range(n))
+
+    async def worker() -> None:
+        for i in counter:
+            t = time.perf_counter()
+            await write(i)
+            samples.append(time.perf_counter() - t)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(samples, time.perf_counter() - t0)
+
+
+async def main(argv: list[str]) -> None:
+    p = argparse.ArgumentParser(prog="python -m bench.write_concern")
+    p.add_argument("--mongo-uri", default=os.environ["MONGO_URI"])
+    p.add_argument("--db", default="dms_bench_write_concern")
+    p.add_argument("--writes", type=int, default=2_000)
+    p.add_argument("--concurrency", type=int, default=8)
+    args = p.parse_args(argv)
+
+    db = AsyncIOMotorClient(args.mongo_uri)[args.db]
+    await db[logs_repo.COLL].drop()
+    await db[docs_repo.COLL].drop()
+    actor = str(ObjectId())
+
+    docs = []
+    for i in range(args.writes):
+        docs.append(docs_repo.build_document_doc(actor, DocumentCreate(title=f"wc {i}", description="")))
+    await db[docs_repo.COLL].insert_many(docs)
+    ids = [d["_id"] for d in docs]
+
+    report = {"uri": args.mongo_uri, "writes": args.writes, "concurrency": args.concurrency, "audit_insert": {}, "document_update": {}}
+    for name, wc in PROFILES.items():
+        logs = db.get_collection(logs_repo.COLL, write_concern=wc)
+        report["audit_insert"][name] = await timed(
+            args.writes, args.concurrency,
+            lambda i: logs.insert_one(logs_repo.build_event(actor, "INC_CHAR_EMAIL", "VALIDATION")),
+        )
+        if not wc.acknowledged:
+            continue    # status transitions read the result, so they never run unacknowledged
+        coll = db.get_collection(docs_repo.COLL, write_concern=wc)
+        report["document_update"][name] = await timed(
+            args.writes, args.concurrency,
+            lambda i: coll.find_one_and_update({"_id": ids[i]}, {"$inc": {"version": 1}}),
+        )
+
+    report["profiles_in_use"] = dict(db_module.WRITE_CONCERN_PROFILES)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main(sys.argv[1:]))